@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: cleaner_benchmark.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+"""Compare DataCleaner with FastDataCleaner on a synthetic ruptura sheet.
+
+Usage:
+    python -m benchmarks.cleaner_benchmark --rows 1000000
+"""
+
+import time
+
+import fire
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from benchmarks.synthetic_data import format_brl
+from ruptura_zero.transformer.cleaner import DataCleaner
+from ruptura_zero.transformer.data_cleaning_schemas import DATA_CLEANING_SCHEMAS
+from ruptura_zero.transformer.fast_cleaner import FastDataCleaner
+from ruptura_zero.utilities.configurations import Config as Cfg
+
+
+def build_ruptura_sheet(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a synthetic sheet shaped like the cleaned-column view of 01_BD_Ruptura."""
+
+    rng = np.random.default_rng(seed)
+
+    valor_ruptura = format_brl(rng.integers(0, 5_000_000, rows) / 100)
+    # Algumas linhas sem valor, como na planilha original ("R$ -").
+    valor_ruptura[rng.random(rows) < 0.01] = 'R$  -'
+
+    return pd.DataFrame({
+        'data_base': 202100 + rng.integers(1, 13, rows),
+        'cliente_id': rng.choice(['AA', 'BB', 'CC', 'DD', 'EE'], rows),
+        'descricao_cliente': rng.choice(['ESMERALDA', 'RUBI', 'SAFIRA'], rows),
+        'categoria_material': rng.choice(['CABELOS', 'ACESSÓRIOS', 'CUIDADOS COM A PELE'], rows),
+        'valor_ruptura': valor_ruptura,
+        'valor_pedido': format_brl(rng.integers(0, 50_000_000, rows) / 100),
+        'volume_ruptura_und': rng.integers(0, 1_000, rows),
+        'percent_ruptura': rng.random(rows).round(3),
+    })
+
+
+def time_clean(cleaner: DataCleaner, data: pd.DataFrame, column_types: dict) -> tuple[float, pd.DataFrame]:
+    """Time a full `clean` call on a private copy of the data."""
+
+    data = data.copy()
+    start = time.perf_counter()
+    cleaned = cleaner.clean(data, column_types)
+
+    return time.perf_counter() - start, cleaned
+
+
+def main(rows: int = 1_000_000, seed: int = 42) -> None:
+    """Run the cleaner benchmark.
+
+    Args:
+        rows (int): The number of synthetic rows.
+        seed (int): The seed of the random generator.
+    """
+
+    schema = next(schema for schema in DATA_CLEANING_SCHEMAS if schema['name'] == Cfg.SHEET_RUPTURA.value)
+
+    logger.info(f'Gerando {rows} linhas sintéticas...')
+    data = build_ruptura_sheet(rows, seed)
+
+    baseline_time, baseline = time_clean(DataCleaner(), data, schema['types'])
+    fast_time, fast = time_clean(FastDataCleaner(), data, schema['types'])
+
+    pd.testing.assert_frame_equal(baseline, fast, check_exact=True)
+
+    logger.info(f'DataCleaner.clean: {baseline_time:.3f}s')
+    logger.info(f'FastDataCleaner.clean: {fast_time:.3f}s')
+    logger.success(f'Resultados idênticos. Ganho de velocidade: {baseline_time / fast_time:.2f}x')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
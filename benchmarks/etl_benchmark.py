@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: etl_benchmark.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+"""Time every stage of the ETL on synthetic data, loading into a local DuckDB file.
+
+Each size runs the full pipeline in a temporary directory, measured by the StageProfiler:
+wall time, CPU time, tracemalloc peak, peak RSS and rows per second of each stage. The results
+are saved under data/benchmarks and compared with the saved baseline of the same configuration;
+a stage slower, or using more memory, than the baseline beyond the tolerance is a regression.
+Each configuration keeps its own baseline file, and a run without one fails unless it saves it.
+
+Usage:
+    python -m benchmarks.etl_benchmark --sizes 10k,1m --save_baseline
+    python -m benchmarks.etl_benchmark --sizes 10k,1m,10m --fast_cleaning
+    python -m benchmarks.etl_benchmark --sizes 10k --source workbook
+"""
+
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fire
+import pandas as pd
+from loguru import logger
+
+from benchmarks.synthetic_data import generate_sheets, write_workbook
+from ruptura_zero.extractor.excel_extractor import ExcelExtractor
+from ruptura_zero.factory import create_cleaning_service, create_data_persistence, create_transforming_service
+from ruptura_zero.loader.data_loader import DataLoader
+from ruptura_zero.manager import PipelineManager
+from ruptura_zero.pipeline import Pipeline
+from ruptura_zero.protocols.data_persistence import DataPersistenceProtocol
+from ruptura_zero.protocols.extractor import ExtractorProtocol
+from ruptura_zero.transformer.data_cleaning_schemas import DATA_CLEANING_SCHEMAS
+from ruptura_zero.transformer.pandera_schemas import CONSOLIDATED_SCHEMA
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
+from ruptura_zero.utilities.fingerprint import hash_parts
+from ruptura_zero.utilities.load_target import LoadTarget
+from ruptura_zero.utilities.memory_tracker import format_bytes
+from ruptura_zero.utilities.merge_engine import MergeEngine
+from ruptura_zero.utilities.persistence_format import PersistenceFormat
+from ruptura_zero.utilities.stage_profiler import StageProfiler
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Etapas muito curtas variam mais que a tolerância entre execuções e não são comparadas.
+MIN_COMPARABLE_SECONDS = 0.1
+
+
+class FrameExtractor:
+    """Hands pre-generated sheets to the pipeline, as if they had been read from the workbook."""
+
+    def __init__(self, sheets: dict[str, pd.DataFrame], dtype_backend: DtypeBackend = DtypeBackend.NUMPY) -> None:
+        """Initialize the FrameExtractor.
+
+        Args:
+            sheets (dict[str, pd.DataFrame]): The sheets, keyed by their names in the workbook.
+            dtype_backend (DtypeBackend): The backend of the column dtypes handed to the pipeline.
+        """
+
+        if DtypeBackend(dtype_backend) == DtypeBackend.ARROW:
+            sheets = {name: sheet.convert_dtypes(dtype_backend='pyarrow') for name, sheet in sheets.items()}
+
+        self.sheets = sheets
+
+    def extract(self) -> dict[str, pd.DataFrame]:
+        """Return a copy of each sheet, which the cleaning may modify in place."""
+
+        return {name: sheet.copy() for name, sheet in self.sheets.items()}
+
+
+class RedirectedDataPersistence:
+    """Writes the processed datasets of a benchmark run into its own directory."""
+
+    def __init__(self, data_persistence: DataPersistenceProtocol, directory: Path) -> None:
+        """Initialize the RedirectedDataPersistence.
+
+        Args:
+            data_persistence (DataPersistenceProtocol): The persister that performs the writes.
+            directory (Path): The directory that receives the files.
+        """
+
+        self.data_persistence = data_persistence
+        self.directory = Path(directory)
+
+    def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
+        """Save the DataFrame under the benchmark directory, keeping its file name."""
+
+        self.data_persistence.save_data(data, self.directory / Path(storage_path).name, options)
+
+    def flush(self) -> None:
+        """Wait for the pending writes of the underlying persister."""
+
+        self.data_persistence.flush()
+
+
+def parse_size(size: str | int) -> int:
+    """Convert a size preset (ex: "10k", "1m") or a row count to a number of rows."""
+
+    return SIZES.get(str(size).lower()) or int(size)
+
+
+def build_manager(extractor: ExtractorProtocol,
+                  work_directory: Path,
+                  profiler: StageProfiler,
+                  configuration: dict) -> PipelineManager:
+    """Build a pipeline that writes and loads everything inside the work directory.
+
+    Args:
+        extractor (ExtractorProtocol): The extractor of the synthetic sheets.
+        work_directory (Path): The directory of the processed files and of the DuckDB database.
+        profiler (StageProfiler): Measures the stages.
+        configuration (dict): The benchmarked pipeline options.
+
+    Returns:
+        PipelineManager: The pipeline manager.
+    """
+
+    data_persistence = RedirectedDataPersistence(
+        create_data_persistence(PersistenceFormat(configuration['persistence_format'])), work_directory)
+
+    pipeline = Pipeline(extractor,
+                        create_cleaning_service(DATA_CLEANING_SCHEMAS,
+                                                fast_cleaning=configuration['fast_cleaning'],
+                                                dtype_backend=configuration['dtype_backend'],
+                                                profiler=profiler),
+                        create_transforming_service(data_persistence,
+                                                    CONSOLIDATED_SCHEMA,
+                                                    merge_engine=configuration['merge_engine'],
+                                                    dtype_backend=configuration['dtype_backend']),
+                        DataLoader(target=LoadTarget.LOCAL, database_path=work_directory / 'benchmark.duckdb'))
+
+    return PipelineManager(pipeline, profiler)
+
+
+def summarize(report: dict) -> dict:
+    """Reduce a run report to the compared metrics of each stage, adding its throughput."""
+
+    summary = {}
+    for name, stage in report['stages'].items():
+        wall_seconds = stage['wall_seconds']
+        summary[name] = {'wall_seconds': wall_seconds,
+                         'cpu_seconds': stage['cpu_seconds'],
+                         'traced_peak_bytes': stage['traced_peak_bytes'],
+                         'peak_rss_bytes': stage['peak_rss_bytes'],
+                         'input_rows': stage['input_rows'],
+                         'output_rows': stage['output_rows'],
+                         'rows_per_second': round(max(stage['input_rows'], stage['output_rows']) / wall_seconds, 1)
+                         if wall_seconds else None}
+
+    return summary
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare the time and memory of each stage with the baseline.
+
+    Args:
+        results (dict): The summary of each size, keyed by its row count.
+        baseline (dict): The baseline summary of each size.
+        tolerance (float): The accepted relative increase (ex: 0.25 for 25%).
+
+    Returns:
+        list[str]: A description of each regression found.
+    """
+
+    regressions = []
+    for rows, stages in results.items():
+        for stage, metrics in stages.items():
+            expected = baseline.get(rows, {}).get(stage)
+            if expected is None:
+                continue
+
+            if expected['wall_seconds'] >= MIN_COMPARABLE_SECONDS \
+                    and metrics['wall_seconds'] > expected['wall_seconds'] * (1 + tolerance):
+                regressions.append(f'{stage} com {rows} linhas: {metrics["wall_seconds"]:.3f}s '
+                                   f'contra {expected["wall_seconds"]:.3f}s na linha de base.')
+
+            if expected['traced_peak_bytes'] and metrics['traced_peak_bytes'] \
+                    and metrics['traced_peak_bytes'] > expected['traced_peak_bytes'] * (1 + tolerance):
+                regressions.append(f'{stage} com {rows} linhas: pico de {format_bytes(metrics["traced_peak_bytes"])} '
+                                   f'contra {format_bytes(expected["traced_peak_bytes"])} na linha de base.')
+
+    return regressions
+
+
+def write_json(path: Path, content: dict) -> None:
+    """Write a JSON file, creating its directory."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(content, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+def main(sizes: tuple = ('10k',),
+         seed: int = 42,
+         source: str = 'frames',
+         fast_cleaning: bool = False,
+         merge_engine: str = MergeEngine.PANDAS,
+         dtype_backend: str = DtypeBackend.NUMPY,
+         persistence_format: str = Cfg.PERSISTENCE_FORMAT.value,
+         trace_memory: bool = True,
+         tolerance: float = 0.25,
+         save_baseline: bool = False,
+         results_directory: str = str(Cfg.BENCHMARK_RESULTS.value)) -> None:
+    """Run the ETL benchmark.
+
+    Args:
+        sizes (tuple): The ruptura row counts to benchmark, as numbers or presets ('10k', '1m', '10m').
+        seed (int): The seed of the synthetic data generator.
+        source (str): 'frames' to hand the generated sheets straight to the pipeline, or 'workbook'
+            to write them as an Excel file and benchmark its extraction too (up to the Excel row limit).
+        fast_cleaning (bool): Whether to use the vectorized cleaner.
+        merge_engine (str): The engine used to join the cleaned datasets ('pandas', 'indexed' or 'duckdb').
+        dtype_backend (str): The backend of the column dtypes ('numpy' or 'arrow').
+        persistence_format (str): The file format of the processed data.
+        trace_memory (bool): Whether to trace the memory allocated in each stage with tracemalloc.
+        tolerance (float): The accepted relative increase of time and memory over the baseline.
+        save_baseline (bool): Whether to save these results as the baseline, instead of comparing with it.
+        results_directory (str): The directory of the results and of the baseline.
+    """
+
+    if source not in ('frames', 'workbook'):
+        raise ValueError(f"Origem desconhecida: '{source}'. Use 'frames' ou 'workbook'.")
+
+    # O Fire entrega "10k,1m" como texto, mas "10000,20000" como tupla.
+    sizes = sizes if isinstance(sizes, (tuple, list)) else str(sizes).split(',')
+    results_directory = Path(results_directory)
+    configuration = {'source': source,
+                     'fast_cleaning': fast_cleaning,
+                     'merge_engine': str(MergeEngine(merge_engine)),
+                     'dtype_backend': str(DtypeBackend(dtype_backend)),
+                     'persistence_format': str(PersistenceFormat(persistence_format)),
+                     'trace_memory': trace_memory,
+                     'seed': seed}
+
+    results = {}
+    for rows in map(parse_size, sizes):
+        logger.info(f'Gerando {rows} linhas sintéticas de ruptura...')
+        start = time.perf_counter()
+        sheets = generate_sheets(rows, seed)
+        logger.info(f'Dados sintéticos gerados em {time.perf_counter() - start:.3f}s.')
+
+        with tempfile.TemporaryDirectory(prefix='ruptura_zero_benchmark_') as work_directory:
+            work_directory = Path(work_directory)
+            if source == 'workbook':
+                workbook_path = work_directory / Cfg.RAW_DATA_FILE.value
+                write_workbook(sheets, workbook_path)
+                extractor = ExcelExtractor(workbook_path, dtype_backend=configuration['dtype_backend'])
+            else:
+                extractor = FrameExtractor(sheets, configuration['dtype_backend'])
+            del sheets
+
+            profiler = StageProfiler(trace_memory=trace_memory, report_directory=results_directory / 'runs')
+            try:
+                build_manager(extractor, work_directory, profiler, configuration).run_pipeline()
+            finally:
+                # O arquivo DuckDB só pode ser removido depois de fechadas as conexões reaproveitadas.
+                DataLoader.close_connections()
+
+        results[str(rows)] = summarize(profiler.report())
+        for stage, metrics in results[str(rows)].items():
+            logger.info(f'{rows} linhas, {stage}: {metrics["wall_seconds"]:.3f}s, '
+                        f'{metrics["rows_per_second"]} linhas/s.')
+
+    finished_at = datetime.now(timezone.utc)
+    run = {'finished_at': finished_at.isoformat(), 'configuration': configuration, 'results': results}
+    results_path = results_directory / f'benchmark_{finished_at.strftime("%Y%m%dT%H%M%SZ")}.json'
+    write_json(results_path, run)
+    logger.info(f'Resultados do benchmark salvos em {results_path}.')
+
+    # Cada configuração tem a sua linha de base, para que uma não sobrescreva a outra.
+    configuration_key = hash_parts(json.dumps(configuration, sort_keys=True))
+    baseline_path = results_directory / f'baseline_{configuration_key}.json'
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else None
+
+    if save_baseline:
+        # Os tamanhos não medidos nesta execução são mantidos na linha de base da mesma configuração.
+        if baseline is not None and baseline['configuration'] == configuration:
+            run['results'] = {**baseline['results'], **results}
+        write_json(baseline_path, run)
+        logger.success(f'Linha de base salva em {baseline_path}.')
+        return
+
+    if baseline is None or baseline['configuration'] != configuration:
+        logger.error(f'Nenhuma linha de base encontrada para esta configuração ({baseline_path}). '
+                     f'Use --save_baseline para registrá-la.')
+        raise SystemExit(1)
+
+    regressions = find_regressions(results, baseline['results'], tolerance)
+    if regressions:
+        for regression in regressions:
+            logger.error(f'Regressão: {regression}')
+        raise SystemExit(1)
+
+    logger.success('Nenhuma regressão em relação à linha de base.')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: synthetic_data.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+"""Generate deterministic synthetic sheets shaped like the raw Ruptura Zero workbook.
+
+The ruptura sheet has the requested number of rows. The estoque sheet has one row per
+month code, client and category, and the vendas sheet one row per month and client, so
+every ruptura row joins to exactly one row of each. The number of clients grows with the
+ruptura sheet, up to every two-letter client code.
+
+Usage:
+    python -m benchmarks.synthetic_data --rows 10000 --output data/benchmarks/ruptura_database.xlsx
+"""
+
+from itertools import product
+from pathlib import Path
+from string import ascii_uppercase
+
+import fire
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.utilities.brazilian_states import BrazilianStates
+from ruptura_zero.utilities.client_type import ClientType
+from ruptura_zero.utilities.configurations import Config as Cfg
+
+# Uma planilha do Excel comporta 1.048.576 linhas, incluindo o cabeçalho.
+EXCEL_MAX_ROWS = 1_048_575
+
+CLIENT_CODES = [''.join(letters) for letters in product(ascii_uppercase, repeat=2)]
+CLIENT_NAMES = ['ESMERALDA', 'OURO', 'DIAMANTE', 'RUBI', 'SAFIRA', 'PRATA']
+CLIENT_CONTACTS = ['João', 'Pedro', 'Maria', 'Ricardo', 'Matheus', 'Bianca']
+CATEGORIES = ['ACESSÓRIOS', 'CABELOS', 'CUIDADOS COM A BARBA', 'CUIDADOS COM A PELE', 'CUIDADOS FACIAIS',
+              'DESODORANTES', 'FRAGRÂNCIAS', 'HIGIENE BUCAL', 'INFANTIL', 'MAQUIAGEM', 'MASCULINO',
+              'PRESENTES', 'PROTEÇÃO SOLAR', 'SABONETES', 'CORPO E BANHO', 'UNHAS', 'MAKE PROFISSIONAL']
+STATE_CAPITALS = {'AC': 'RIO BRANCO', 'AL': 'MACEIO', 'AP': 'MACAPA', 'AM': 'MANAUS', 'BA': 'SALVADOR',
+                  'CE': 'FORTALEZA', 'DF': 'BRASILIA', 'ES': 'VITORIA', 'GO': 'GOIANIA', 'MA': 'SAO LUIS',
+                  'MT': 'CUIABA', 'MS': 'CAMPO GRANDE', 'MG': 'BELO HORIZONTE', 'PA': 'BELEM',
+                  'PB': 'JOAO PESSOA', 'PR': 'CURITIBA', 'PE': 'RECIFE', 'PI': 'TERESINA',
+                  'RJ': 'RIO DE JANEIRO', 'RN': 'NATAL', 'RS': 'PORTO ALEGRE', 'RO': 'PORTO VELHO',
+                  'RR': 'BOA VISTA', 'SC': 'FLORIANOPOLIS', 'SP': 'SAO PAULO', 'SE': 'ARACAJU', 'TO': 'PALMAS'}
+
+# A planilha de vendas cobre um único ano, e a de ruptura, os anos aceitos pelo esquema consolidado.
+VENDAS_YEAR = 2021
+RUPTURA_YEARS = (2020, 2025)
+
+
+def format_brl(values: np.ndarray) -> np.ndarray:
+    """Format amounts as Brazilian currency strings (ex: "R$  1.234,56")."""
+
+    return np.array([f'R$  {value:,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+                     for value in values], dtype=object)
+
+
+def client_count(rows: int) -> int:
+    """Return the number of clients of a synthetic dataset with the given ruptura rows."""
+
+    return min(len(CLIENT_CODES), max(15, rows // 1_000))
+
+
+def build_clients(clients: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Build the attributes of each synthetic client.
+
+    Args:
+        clients (int): The number of clients.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        pd.DataFrame: One row per client, with its code, name, type, contact, city and state.
+    """
+
+    states = rng.choice([state.value for state in BrazilianStates], clients)
+
+    return pd.DataFrame({'code': CLIENT_CODES[:clients],
+                         'name': rng.choice(CLIENT_NAMES, clients),
+                         'type': rng.choice([client_type.value for client_type in ClientType], clients),
+                         'contact': rng.choice(CLIENT_CONTACTS, clients),
+                         'city': [STATE_CAPITALS[state] for state in states],
+                         'state': states})
+
+
+def build_ruptura_sheet(rows: int, clients: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Build a synthetic 01_BD_Ruptura sheet, with the raw column names and formats."""
+
+    client = rng.integers(0, len(clients), rows)
+    data_base = rng.integers(RUPTURA_YEARS[0], RUPTURA_YEARS[1] + 1, rows) * 100 + rng.integers(1, 13, rows)
+
+    pedido_cents = rng.integers(100, 50_000_000, rows)
+    ruptura_cents = (pedido_cents * rng.random(rows)).astype(np.int64)
+    percent_ruptura = (ruptura_cents / pedido_cents).round(3)
+
+    valor_ruptura = format_brl(ruptura_cents / 100)
+    # Algumas linhas sem valor ("R$ -") ou sem percentual, como na planilha original.
+    valor_ruptura[rng.random(rows) < 0.01] = 'R$  -'
+    percent_ruptura[rng.random(rows) < 0.01] = np.nan
+
+    return pd.DataFrame({'DT_MES': data_base,
+                         'COD_CLIENTE': clients['code'].to_numpy()[client],
+                         'CLIENTE_DESCRICAO': clients['name'].to_numpy()[client],
+                         'MATERIAL_DESCRICAO_CATEGORIA': np.asarray(CATEGORIES, dtype=object)[
+                             rng.integers(0, len(CATEGORIES), rows)],
+                         'Valor Ruptura_$': valor_ruptura,
+                         'Valor Pedido_$': format_brl(pedido_cents / 100),
+                         'Volume ruptura_und': rng.integers(0, 2_000, rows),
+                         'Ruptura_%': percent_ruptura})
+
+
+def build_estoque_sheet(clients: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Build a synthetic 02_BD_Estoque sheet, with one row per month code, client and category."""
+
+    month, client, category = (grid.ravel() for grid in np.meshgrid(np.arange(1, 13),
+                                                                     np.arange(len(clients)),
+                                                                     np.arange(len(CATEGORIES)),
+                                                                     indexing='ij'))
+    rows = len(month)
+
+    return pd.DataFrame({'MES': np.char.add('M', np.char.zfill(month.astype(str), 2)).astype(object),
+                         'COD_CLIENTE': clients['code'].to_numpy()[client],
+                         'NOME CLIENTE': clients['name'].to_numpy()[client],
+                         'DESCRICAO_CATEGORIA': np.asarray(CATEGORIES, dtype=object)[category],
+                         'ESTOQUE': rng.integers(0, 6_000, rows),
+                         'DDV': rng.uniform(0.5, 150, rows).round(2),
+                         'COBERTURA_DIAS': rng.integers(0, 90, rows),
+                         'TIPO_CLIENTE': clients['type'].to_numpy()[client],
+                         'CONTATO CLIENTE': clients['contact'].to_numpy()[client]})
+
+
+def build_vendas_sheet(clients: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Build a synthetic 03_BD_Vendas sheet, with one row per month and client."""
+
+    month, client = (grid.ravel() for grid in np.meshgrid(np.arange(1, 13),
+                                                           np.arange(len(clients)),
+                                                           indexing='ij'))
+    rows = len(month)
+
+    return pd.DataFrame({'DT_MES': VENDAS_YEAR * 100 + month,
+                         'COD CLIEN': clients['code'].to_numpy()[client],
+                         'VLR_VOLUME_REAL': rng.integers(1_000, 20_000, rows),
+                         'CIDADE': clients['city'].to_numpy()[client],
+                         'UF': clients['state'].to_numpy()[client],
+                         'PAIS': np.full(rows, 'BR', dtype=object)})
+
+
+def generate_sheets(rows: int, seed: int = 42) -> dict[str, pd.DataFrame]:
+    """Generate the three raw sheets of a synthetic workbook.
+
+    Args:
+        rows (int): The number of rows of the ruptura sheet.
+        seed (int): The seed of the random generator; the same seed always yields the same sheets.
+
+    Returns:
+        dict[str, pd.DataFrame]: The sheets, keyed by their names in the workbook.
+    """
+
+    rng = np.random.default_rng(seed)
+    clients = build_clients(client_count(rows), rng)
+
+    return {Cfg.SHEET_RUPTURA.value: build_ruptura_sheet(rows, clients, rng),
+            Cfg.SHEET_ESTOQUE.value: build_estoque_sheet(clients, rng),
+            Cfg.SHEET_VENDAS.value: build_vendas_sheet(clients, rng)}
+
+
+def write_workbook(sheets: dict[str, pd.DataFrame], file_path: Path) -> None:
+    """Write the synthetic sheets as an Excel workbook.
+
+    Args:
+        sheets (dict[str, pd.DataFrame]): The sheets, keyed by their names.
+        file_path (Path): The path of the workbook.
+    """
+
+    oversized = [name for name, sheet in sheets.items() if len(sheet) > EXCEL_MAX_ROWS]
+    if oversized:
+        raise ValueError(f'As planilhas {oversized} excedem o limite de {EXCEL_MAX_ROWS} linhas do Excel.')
+
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+        for name, sheet in sheets.items():
+            sheet.to_excel(writer, sheet_name=name, index=False)
+
+
+def main(rows: int = 10_000,
+         seed: int = 42,
+         output: str = str(Cfg.BENCHMARK_RESULTS.value / Cfg.RAW_DATA_FILE.value)) -> None:
+    """Write a synthetic workbook.
+
+    Args:
+        rows (int): The number of rows of the ruptura sheet.
+        seed (int): The seed of the random generator.
+        output (str): The path of the workbook.
+    """
+
+    logger.info(f'Gerando uma pasta de trabalho sintética com {rows} linhas de ruptura...')
+    write_workbook(generate_sheets(rows, seed), Path(output))
+    logger.success(f'Pasta de trabalho sintética salva em {output}.')
+
+
+if __name__ == '__main__':
+    fire.Fire(main)
@@ -13,21 +13,51 @@
 #  License: MIT
 # ------------------------------------------------------------------------------
 
+import fire
 from loguru import logger
 
 from ruptura_zero.factory import build_application
-
-
-def main() -> None:
-    """Run the main ETL pipeline."""
+from ruptura_zero.utilities.pipeline_stage import PipelineStage
+
+
+def main(resume_from: str | None = None,
+         checkpoints: bool = True,
+         memoization: bool = False,
+         run_report: bool = False,
+         prometheus_metrics: bool = False) -> None:
+    """Run the main ETL pipeline.
+
+    Usage:
+        python main.py
+        python main.py --resume-from load_to_destination
+        python main.py --memoization
+        python main.py --run-report
+        python main.py --prometheus-metrics
+
+    Args:
+        resume_from (str | None): The first stage to run ('clean_and_validate_data',
+            'transform_for_analysis' or 'load_to_destination'), restoring the earlier ones
+            from the checkpoints of a previous run.
+        checkpoints (bool): Whether to save the output of each stage, so this run can be resumed.
+        memoization (bool): Whether to reuse the cleaned sheets and the consolidated data of previous
+            runs whose inputs did not change.
+        run_report (bool): Whether to record the wall time, CPU time, memory and rows of each stage
+            and sheet in a JSON run report.
+        prometheus_metrics (bool): Whether to also write the run report in the Prometheus textfile
+            format (implies `run_report`).
+    """
 
     logger.info('Ruptura Zero: Análise de Vendas e Estoques.')
 
     # Run the ETL pipeline.
-    pipeline_manager = build_application()
+    pipeline_manager = build_application(stage_checkpoints=checkpoints,
+                                         resume_from=PipelineStage(resume_from) if resume_from else None,
+                                         memoization=memoization,
+                                         run_report=run_report,
+                                         prometheus_metrics=prometheus_metrics)
     pipeline_manager.run_pipeline()
 
 
 if __name__ == "__main__":
     # Starting the ETL process.
-    main()
+    fire.Fire(main)
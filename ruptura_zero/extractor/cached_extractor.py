@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: cached_extractor.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from ruptura_zero.extractor.duckdb_extractor import DuckDBExtractor
+from ruptura_zero.extractor.excel_extractor import ExcelExtractor
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
+from ruptura_zero.utilities.fingerprint import code_version, hash_parts
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class CachedExtractor:
+    """Caches the sheets parsed by a file-based extractor as Arrow IPC files.
+
+    Cache entries are keyed by the workbook fingerprint (size, mtime and content hash), the
+    wrapped extractor and the package code, so an unchanged workbook is reloaded from
+    memory-mapped Arrow files instead of being parsed again. Each dtype backend has its own
+    entries; with the `arrow` backend the cached columns are wrapped in `ArrowDtype` without
+    being converted.
+    """
+
+    def __init__(self,
+                 extractor: ExcelExtractor | DuckDBExtractor,
+                 cache_directory: Path = Cfg.CACHE_DATA.value / 'extraction',
+                 max_size_bytes: int = Cfg.EXTRACTION_CACHE_MAX_SIZE.value,
+                 max_age_seconds: int = Cfg.EXTRACTION_CACHE_MAX_AGE.value) -> None:
+        """Initialize the CachedExtractor.
+
+        Args:
+            extractor (ExcelExtractor | DuckDBExtractor): The extractor used on cache misses.
+            cache_directory (Path): The directory where cache entries are stored.
+            max_size_bytes (int): The maximum total size of the cache directory.
+            max_age_seconds (int): The maximum time an entry is kept since its last use.
+        """
+
+        self.extractor = extractor
+        self.cache_directory = cache_directory
+        self.max_size_bytes = max_size_bytes
+        self.max_age_seconds = max_age_seconds
+
+    def _fingerprint(self) -> str:
+        """Compute the fingerprint of the workbook and of the way it is parsed.
+
+        Returns:
+            str: A hex digest of the file size, modification time and content, of the wrapped
+                extractor and its dtype backend, and of the package code.
+
+        Raises:
+            OSError: If the workbook cannot be read.
+        """
+
+        file_path = Path(self.extractor.file_path)
+        stat = file_path.stat()
+
+        with open(file_path, 'rb') as file:
+            digest = hashlib.file_digest(file, 'blake2b')
+        digest.update(f'{stat.st_size}:{stat.st_mtime_ns}'.encode())
+
+        # Extratores, backends e versões do código de leitura diferentes produzem planilhas diferentes.
+        return hash_parts(code_version(),
+                          type(self.extractor).__name__,
+                          str(self.extractor.dtype_backend),
+                          digest.hexdigest())
+
+    @staticmethod
+    def _sheet_file(entry_directory: Path, position: int) -> Path:
+        """Return the Arrow file of the sheet at the given manifest position."""
+
+        return entry_directory / f'sheet_{position:03d}.arrow'
+
+    def _read_entry(self, entry_directory: Path) -> dict[str, pd.DataFrame] | None:
+        """Read a cache entry, if it holds every requested sheet.
+
+        Args:
+            entry_directory (Path): The directory of the cache entry.
+
+        Returns:
+            dict[str, pd.DataFrame] | None: The cached sheets, or None on a cache miss.
+        """
+
+        manifest_path = entry_directory / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+
+        try:
+            cached_sheets = json.loads(manifest_path.read_text(encoding='utf-8'))['sheets']
+            requested_sheets = self.extractor.sheet_names or cached_sheets
+            if not set(requested_sheets).issubset(cached_sheets):
+                return None
+
+            sheets = {}
+            for sheet_name in requested_sheets:
+                sheet_file = self._sheet_file(entry_directory, cached_sheets.index(sheet_name))
+                with pa.memory_map(str(sheet_file), 'r') as source:
+                    table = pa.ipc.open_file(source).read_all()
+                if self.extractor.dtype_backend == DtypeBackend.ARROW:
+                    # As colunas Arrow apontam diretamente para o arquivo mapeado em memória.
+                    sheets[sheet_name] = table.to_pandas(types_mapper=pd.ArrowDtype)
+                else:
+                    # Colunas numéricas sem nulos são convertidas sem cópia a partir do mapeamento.
+                    sheets[sheet_name] = table.to_pandas(split_blocks=True)
+        except (pa.ArrowException, OSError, ValueError, KeyError, TypeError) as error:
+            # Uma entrada danificada ou removida parcialmente é tratada como ausente e regravada.
+            logger.warning(f'Entrada do cache de extração inválida, ignorando: {error}')
+            return None
+
+        # Atualizando o horário de último uso da entrada para a política de remoção.
+        manifest_path.touch()
+
+        return sheets
+
+    def _write_entry(self, entry_directory: Path, sheets: dict[str, pd.DataFrame]) -> None:
+        """Write the parsed sheets to a new cache entry.
+
+        Args:
+            entry_directory (Path): The directory of the cache entry.
+            sheets (dict[str, pd.DataFrame]): The parsed sheets.
+        """
+
+        # Escrevendo em um diretório temporário para que entradas incompletas nunca sejam lidas.
+        staging_directory = entry_directory.with_name(f'{entry_directory.name}.tmp')
+        shutil.rmtree(staging_directory, ignore_errors=True)
+        staging_directory.mkdir(parents=True)
+
+        try:
+            for position, data_frame in enumerate(sheets.values()):
+                table = pa.Table.from_pandas(data_frame, preserve_index=False)
+                with pa.OSFile(str(self._sheet_file(staging_directory, position)), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+
+            manifest = {'source': str(self.extractor.file_path), 'sheets': list(sheets.keys())}
+            (staging_directory / MANIFEST_FILE).write_text(json.dumps(manifest), encoding='utf-8')
+
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            staging_directory.rename(entry_directory)
+        except (pa.ArrowException, OSError) as error:
+            logger.warning(f'Não foi possível armazenar as planilhas no cache: {error}')
+            shutil.rmtree(staging_directory, ignore_errors=True)
+
+    def _evict(self, keep: Path) -> None:
+        """Remove expired entries and, if needed, the least recently used ones.
+
+        Args:
+            keep (Path): The entry that must never be removed (the current one).
+        """
+
+        if not self.cache_directory.exists():
+            return
+
+        entries = []
+        for entry_directory in self.cache_directory.iterdir():
+            manifest_path = entry_directory / MANIFEST_FILE
+            if entry_directory == keep or not manifest_path.exists():
+                continue
+            last_used = manifest_path.stat().st_mtime
+            size = sum(file.stat().st_size for file in entry_directory.iterdir())
+            entries.append((last_used, size, entry_directory))
+
+        now = time.time()
+        total_size = sum(file.stat().st_size for file in keep.iterdir()) if keep.exists() else 0
+        total_size += sum(size for _, size, _ in entries)
+
+        # Removendo primeiro as entradas usadas há mais tempo.
+        for last_used, size, entry_directory in sorted(entries):
+            if now - last_used > self.max_age_seconds or total_size > self.max_size_bytes:
+                logger.info(f'Removendo entrada do cache de extração: {entry_directory.name}')
+                shutil.rmtree(entry_directory, ignore_errors=True)
+                total_size -= size
+
+    def extract(self) -> dict[str, pd.DataFrame]:
+        """Extract data from the cache or, on a miss, from the Excel file."""
+
+        try:
+            fingerprint = self._fingerprint()
+        except OSError as error:
+            # Sem a impressão digital, o extrator original trata (e registra) a falha de leitura.
+            logger.warning(f'Não foi possível identificar o arquivo para o cache de extração: {error}')
+            return self.extractor.extract()
+
+        entry_directory = self.cache_directory / fingerprint
+
+        sheets = self._read_entry(entry_directory)
+        if sheets is not None:
+            logger.info(f'Planilhas carregadas do cache de extração ({fingerprint}): {list(sheets.keys())}')
+            self._evict(keep=entry_directory)
+
+            return sheets
+
+        logger.info(f'Cache de extração sem entrada para o arquivo atual ({fingerprint}).')
+        sheets = self.extractor.extract()
+
+        if sheets:
+            self._write_entry(entry_directory, sheets)
+            self._evict(keep=entry_directory)
+
+        return sheets
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: duckdb_extractor.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from pathlib import Path
+
+import duckdb as db
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
+
+
+class DuckDBExtractor:
+    """Extracts data from Excel files using DuckDB's native reader.
+
+    Workbooks are read with `read_xlsx` from the DuckDB `excel` extension. Every cell is read
+    as text, so the cleaner parses each column as it does for the other extractors, instead of
+    receiving the types guessed by DuckDB (numbers as DOUBLE, unreadable cells as NULL).
+    """
+
+    def __init__(self,
+                 file_path: Path,
+                 sheet_names: list[str],
+                 dtype_backend: DtypeBackend = DtypeBackend.NUMPY) -> None:
+        """Initialize the DuckDBExtractor.
+
+        Args:
+            file_path (Path): The path to the Excel file.
+            sheet_names (list[str]): The sheets to extract.
+            dtype_backend (DtypeBackend): The backend of the column dtypes. With `arrow`, the Arrow
+                tables read by DuckDB are wrapped in `ArrowDtype` columns without conversion.
+        """
+
+        self.file_path = file_path
+        self.sheet_names = sheet_names
+        self.dtype_backend = DtypeBackend(dtype_backend)
+
+    def _read_sheet(self, connection: db.DuckDBPyConnection, sheet_name: str) -> db.DuckDBPyRelation:
+        """Build the DuckDB relation that reads a single sheet.
+
+        Args:
+            connection (db.DuckDBPyConnection): The DuckDB connection.
+            sheet_name (str): The name of the sheet to read.
+
+        Returns:
+            db.DuckDBPyRelation: The lazy relation over the sheet.
+        """
+
+        # Como texto, um número como 202107 não vira "202107.0", e nenhuma célula é descartada em silêncio.
+        return connection.sql('SELECT * FROM read_xlsx($file, sheet = $sheet, header = true, all_varchar = true)',
+                              params={'file': str(self.file_path), 'sheet': sheet_name})
+
+    def _connect(self) -> db.DuckDBPyConnection:
+        """Open an in-memory DuckDB connection with the `excel` extension loaded."""
+
+        connection = db.connect()
+        connection.execute('INSTALL excel')
+        connection.execute('LOAD excel')
+
+        return connection
+
+    def extract_arrow(self) -> dict[str, pa.Table]:
+        """Extract the sheets as Arrow tables, without going through pandas.
+
+        Returns:
+            dict[str, pa.Table]: A dictionary with sheet names as keys and Arrow tables as values.
+        """
+
+        logger.info(f'Extraindo as planilhas com o DuckDB: {self.file_path}')
+
+        with self._connect() as connection:
+            tables = {}
+            for sheet_name in self.sheet_names:
+                result = self._read_sheet(connection, sheet_name).arrow()
+                # Versões recentes do DuckDB retornam um leitor de lotes em vez de uma tabela.
+                if isinstance(result, pa.RecordBatchReader):
+                    result = result.read_all()
+                tables[sheet_name] = result
+
+        logger.info(f'Extração com o DuckDB bem-sucedida: {list(tables.keys())}')
+
+        return tables
+
+    def extract(self) -> dict[str, pd.DataFrame]:
+        """Extract data from the source."""
+
+        types_mapper = pd.ArrowDtype if self.dtype_backend == DtypeBackend.ARROW else None
+
+        try:
+            return {sheet_name: table.to_pandas(types_mapper=types_mapper)
+                    for sheet_name, table in self.extract_arrow().items()}
+        except db.Error as error:
+            logger.error(f'Erro ao extrair as planilhas com o DuckDB: {error}')
+
+            return {}
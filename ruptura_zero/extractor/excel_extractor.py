@@ -13,27 +13,121 @@
 #  License: MIT
 # ------------------------------------------------------------------------------
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
+import openpyxl
 import pandas as pd
+import pyarrow as pa
 from loguru import logger
+from openpyxl.cell.cell import ERROR_CODES
+
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
+
+
+def _parse_sheet(file_path: Path, sheet_name: str, dtype_backend: DtypeBackend = DtypeBackend.NUMPY) -> pd.DataFrame:
+    """Parse a single sheet of an Excel file.
+
+    Defined at module level so it can be pickled and run in a worker process.
+
+    Args:
+        file_path (Path): The path to the Excel file.
+        sheet_name (str): The name of the sheet to parse.
+        dtype_backend (DtypeBackend): The backend of the column dtypes.
+
+    Returns:
+        pd.DataFrame: The parsed sheet.
+    """
+
+    if dtype_backend == DtypeBackend.ARROW:
+        return pd.read_excel(file_path, sheet_name=sheet_name, dtype_backend='pyarrow')
+
+    return pd.read_excel(file_path, sheet_name=sheet_name)
 
 
 class ExcelExtractor:
     """Extracts data from Excel files."""
 
-    def __init__(self, file_path: Path) -> None:
+    def __init__(self,
+                 file_path: Path,
+                 chunk_size: int = Cfg.EXTRACTION_CHUNK_SIZE.value,
+                 sheet_names: list[str] | None = None,
+                 parallel: bool = False,
+                 max_workers: int | None = None,
+                 dtype_backend: DtypeBackend = DtypeBackend.NUMPY,
+                 streaming: bool = False) -> None:
         """Initialize the ExcelExtractor.
 
         Args:
             file_path (str): The path to the Excel file.
+            chunk_size (int): The maximum number of rows converted at a time in streaming mode.
+            sheet_names (list[str] | None): The sheets to extract. Defaults to every sheet in the file.
+            parallel (bool): Whether to parse each sheet in its own worker process.
+            max_workers (int | None): The maximum number of worker processes. Defaults to one per sheet.
+            dtype_backend (DtypeBackend): The backend of the column dtypes. With `arrow`, every column
+                is read as a pyarrow-backed `ArrowDtype` instead of NumPy object and float arrays.
+            streaming (bool): Whether to read each sheet row by row, converting every `chunk_size` rows
+                to Arrow columns, instead of building the Python objects of the whole sheet first. The
+                sheet is still returned as a single DataFrame.
         """
 
         self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.sheet_names = sheet_names
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.dtype_backend = DtypeBackend(dtype_backend)
+        self.streaming = streaming
+
+    def _list_sheet_names(self) -> list[str]:
+        """List the sheets to extract from the Excel file.
+
+        Returns:
+            list[str]: The configured sheet names or, if none were given, every sheet in the file.
+        """
+
+        if self.sheet_names:
+            return list(self.sheet_names)
+
+        with pd.ExcelFile(self.file_path) as xls:
+            return [str(sheet_name) for sheet_name in xls.sheet_names]
+
+    def _parse_sheets_in_parallel(self, sheet_names: list[str]) -> dict[str, pd.DataFrame]:
+        """Parse the sheets concurrently, one worker process per sheet.
+
+        Args:
+            sheet_names (list[str]): The sheets to parse.
+
+        Returns:
+            dict[str, pd.DataFrame]: A dictionary with sheet names as keys and DataFrames as values.
+        """
+
+        max_workers = self.max_workers or len(sheet_names)
+        logger.info(f'Extraindo {len(sheet_names)} planilhas em paralelo com {max_workers} processos...')
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            data_frames = executor.map(_parse_sheet,
+                                       [self.file_path] * len(sheet_names),
+                                       sheet_names,
+                                       [self.dtype_backend] * len(sheet_names))
+
+            return dict(zip(sheet_names, data_frames))
+
+    def _parse(self, xls: pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+        """Parse a single sheet of an open Excel file with the configured dtype backend."""
+
+        if self.dtype_backend == DtypeBackend.ARROW:
+            return xls.parse(sheet_name, dtype_backend='pyarrow')
+
+        return xls.parse(sheet_name)
 
     def extract_all_sheets(self) -> dict[str, pd.DataFrame]:
         """Extract all sheets from the Excel file.
 
+        Only the sheets listed in `sheet_names` are parsed when it is set.
+
         Returns:
             dict[str, pd.DataFrame]: A dictionary with sheet names as keys and DataFrames as values.
         """
@@ -41,8 +135,15 @@ class ExcelExtractor:
         logger.info(f'Extraindo todas as planilhas do arquivo Excel: {self.file_path}')
 
         try:
-            xls = pd.ExcelFile(self.file_path)
-            sheets = {str(sheet_name): xls.parse(sheet_name) for sheet_name in xls.sheet_names}
+            sheet_names = self._list_sheet_names()
+
+            if self.streaming:
+                sheets = {sheet_name: self._read_sheet_in_chunks(sheet_name) for sheet_name in sheet_names}
+            elif self.parallel and len(sheet_names) > 1:
+                sheets = self._parse_sheets_in_parallel(sheet_names)
+            else:
+                with pd.ExcelFile(self.file_path) as xls:
+                    sheets = {sheet_name: self._parse(xls, sheet_name) for sheet_name in sheet_names}
 
             logger.info(f'Extração de todas as planilhas bem-sucedida: {list(sheets.keys())}')
 
@@ -52,6 +153,151 @@ class ExcelExtractor:
 
             return {}
 
+    @staticmethod
+    def _build_chunk(rows: list[tuple], columns: list[str]) -> pd.DataFrame:
+        """Build a DataFrame chunk from raw worksheet rows.
+
+        Args:
+            rows (list[tuple]): The cell values of each row.
+            columns (list[str]): The column names taken from the sheet header.
+
+        Returns:
+            pd.DataFrame: The chunk, with the dtypes inferred from its own rows.
+        """
+
+        # Colunas com inteiros e decimais misturados viriam como object sem a inferência.
+        return pd.DataFrame.from_records(rows, columns=columns).infer_objects()
+
+    @staticmethod
+    def _build_record_batch(rows: list[tuple], columns: list[str]) -> pa.RecordBatch:
+        """Build an Arrow record batch from raw worksheet rows.
+
+        Args:
+            rows (list[tuple]): The cell values of each row.
+            columns (list[str]): The column names taken from the sheet header.
+
+        Returns:
+            pa.RecordBatch: The chunk, with the types inferred from its own rows (integers with
+                blanks stay integers, with nulls).
+
+        Raises:
+            pa.ArrowInvalid: If a column mixes values without a common Arrow type (ex: text and numbers).
+        """
+
+        values = zip(*rows) if rows else [()] * len(columns)
+
+        return pa.RecordBatch.from_arrays([pa.array(column_values) for column_values in values], names=columns)
+
+    def _iter_sheet_chunks(self, sheet_name: str) -> Iterator[tuple[list[str], list[tuple]]]:
+        """Stream a sheet from the Excel file as bounded-size chunks of rows.
+
+        The workbook is opened in openpyxl read-only mode, so only the rows of the current
+        chunk are held as Python objects.
+
+        Args:
+            sheet_name (str): The name of the sheet to stream.
+
+        Yields:
+            tuple[list[str], list[tuple]]: The column names and the cell values of at most
+                `chunk_size` rows, and at least one chunk (possibly empty) for a sheet with a header.
+        """
+
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+
+            header = next(rows, None)
+            if header is None:
+                logger.warning(f'A planilha "{sheet_name}" está vazia.')
+                return
+
+            # Descartando as células vazias à direita do cabeçalho, como faz o pandas.
+            width = len(header)
+            while width > 0 and header[width - 1] is None:
+                width -= 1
+            columns = [str(name) if name is not None else f'Unnamed: {index}'
+                       for index, name in enumerate(header[:width])]
+
+            chunk_number = 0
+            buffer: list[tuple] = []
+            for row in rows:
+                # Células com erro de fórmula (ex: #DIV/0!) são tratadas como ausentes, como no pandas.
+                values = tuple(None if value in ERROR_CODES else value for value in row[:width])
+                values += (None,) * (width - len(values))
+                # Ignorando linhas completamente vazias.
+                if all(value is None for value in values):
+                    continue
+
+                buffer.append(values)
+                if len(buffer) >= self.chunk_size:
+                    chunk_number += 1
+                    logger.debug(f'Planilha "{sheet_name}": bloco {chunk_number} com {len(buffer)} linhas.')
+                    yield columns, buffer
+                    buffer = []
+
+            if buffer or chunk_number == 0:
+                chunk_number += 1
+                logger.debug(f'Planilha "{sheet_name}": bloco {chunk_number} com {len(buffer)} linhas.')
+                yield columns, buffer
+        finally:
+            workbook.close()
+
+    def _read_sheet_in_chunks(self, sheet_name: str) -> pd.DataFrame:
+        """Read a sheet in streaming mode, producing the same DataFrame as `pd.read_excel`.
+
+        Each chunk is converted to an Arrow record batch as soon as it is read, so only the
+        Python objects of the current chunk are held next to the compact columns of the rows
+        read so far. The batches are joined once, promoting the types that differ between
+        chunks (ex: int64 and double), and converted to pandas column by column.
+
+        Args:
+            sheet_name (str): The name of the sheet to read.
+
+        Returns:
+            pd.DataFrame: The sheet.
+        """
+
+        batches = []
+        chunks = None
+        for columns, rows in self._iter_sheet_chunks(sheet_name):
+            if chunks is None:
+                try:
+                    batches.append(self._build_record_batch(rows, columns))
+                    continue
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    # Uma coluna com textos e números misturados não tem tipo Arrow: segue como object no pandas.
+                    logger.debug(f'Planilha "{sheet_name}" com tipos mistos; concatenando os blocos no pandas.')
+                    chunks = [batch.to_pandas(coerce_temporal_nanoseconds=True) for batch in batches]
+                    batches = []
+            chunks.append(self._build_chunk(rows, columns))
+
+        if chunks is None:
+            if not batches:
+                return pd.DataFrame()
+            try:
+                table = pa.concat_tables([pa.Table.from_batches([batch]) for batch in batches],
+                                         promote_options='permissive')
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                chunks = [batch.to_pandas(coerce_temporal_nanoseconds=True) for batch in batches]
+            else:
+                del batches
+                if self.dtype_backend == DtypeBackend.ARROW:
+                    return table.to_pandas(types_mapper=pd.ArrowDtype)
+                return table.to_pandas(split_blocks=True, self_destruct=True, coerce_temporal_nanoseconds=True)
+
+        # Colunas com tipos diferentes entre os blocos viram object na concatenação e são inferidas de novo.
+        data = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        del chunks
+        object_columns = data.select_dtypes(include='object').columns
+        if len(object_columns):
+            data[object_columns] = data[object_columns].infer_objects()
+
+        if self.dtype_backend == DtypeBackend.ARROW:
+            # A conversão para Arrow é feita uma única vez, para que os tipos sejam os mesmos em toda a planilha.
+            data = pa.Table.from_pandas(data, preserve_index=False).to_pandas(types_mapper=pd.ArrowDtype)
+
+        return data
+
     def extract(self) -> dict[str, pd.DataFrame]:
         """Extract data from the Excel file."""
 
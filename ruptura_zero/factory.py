@@ -16,76 +16,439 @@
 import pandera.pandas as pa
 from loguru import logger
 
+from ruptura_zero.extractor.cached_extractor import CachedExtractor
+from ruptura_zero.extractor.duckdb_extractor import DuckDBExtractor
 from ruptura_zero.extractor.excel_extractor import ExcelExtractor
 from ruptura_zero.loader.data_loader import DataLoader
 from ruptura_zero.manager import PipelineManager
 from ruptura_zero.pipeline import Pipeline
 from ruptura_zero.protocols.data_persistence import DataPersistenceProtocol
+from ruptura_zero.protocols.extractor import ExtractorProtocol
+from ruptura_zero.protocols.loader import LoaderProtocol
+from ruptura_zero.protocols.transformer import DataMergerProtocol
 from ruptura_zero.services.data_cleaning_service import DataCleaningService
 from ruptura_zero.services.data_transforming_service import DataTransformingService
+from ruptura_zero.services.duckdb_transforming_service import DuckDBTransformingService
+from ruptura_zero.services.memoized_cleaning_service import MemoizedCleaningService
+from ruptura_zero.services.memoized_transforming_service import MemoizedTransformingService
 from ruptura_zero.transformer.cleaner import DataCleaner
+from ruptura_zero.transformer.compiled_schema_validator import CompiledSchemaValidator
 from ruptura_zero.transformer.data_cleaning_schemas import DATA_CLEANING_SCHEMAS
 from ruptura_zero.transformer.data_merge import DataMerger
-from ruptura_zero.transformer.pandera_schemas import CONSOLIDATED_SCHEMA
+from ruptura_zero.transformer.fast_cleaner import FastDataCleaner
+from ruptura_zero.transformer.hash_deduplicator import HashDeduplicator
+from ruptura_zero.transformer.in_place_cleaner import InPlaceDataCleaner
+from ruptura_zero.transformer.indexed_data_merge import IndexedDataMerger
+from ruptura_zero.transformer.pandera_schemas import CONSOLIDATED_SCHEMA, to_arrow_schema
+from ruptura_zero.transformer.validation_policy import ValidationPolicy
+from ruptura_zero.utilities.arrow_data_persistence import (FeatherDataPersistence,
+                                                           ParquetDataPersistence,
+                                                           PartitionedDataPersistence)
+from ruptura_zero.utilities.background_data_persistence import BackgroundDataPersistence
 from ruptura_zero.utilities.configurations import Config as Cfg
 from ruptura_zero.utilities.data_persistence import DataPersistence
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
+from ruptura_zero.utilities.extractor_backend import ExtractorBackend
+from ruptura_zero.utilities.join_cardinality import JoinCardinality
+from ruptura_zero.utilities.load_mode import LoadMode
+from ruptura_zero.utilities.load_target import LoadTarget
+from ruptura_zero.utilities.memo_store import MemoStore
+from ruptura_zero.utilities.merge_engine import MergeEngine
+from ruptura_zero.utilities.persistence_format import PersistenceFormat
+from ruptura_zero.utilities.pipeline_stage import PipelineStage
+from ruptura_zero.utilities.stage_checkpoint import StageCheckpoint
+from ruptura_zero.utilities.stage_profiler import StageProfiler
+from ruptura_zero.utilities.validation_mode import ValidationMode
 
 
-def create_cleaning_service(schema: list[dict]) -> DataCleaningService:
+def create_extractor(backend: ExtractorBackend,
+                     parallel: bool = False,
+                     dtype_backend: DtypeBackend = DtypeBackend.NUMPY,
+                     streaming: bool = False) -> ExtractorProtocol:
+    """Create the data extractor.
+
+    Args:
+        backend (ExtractorBackend): The engine used to read the raw data.
+        parallel (bool): Whether to parse each sheet in its own worker process (Excel backend only).
+        dtype_backend (DtypeBackend): The backend of the extracted columns.
+        streaming (bool): Whether to read each sheet in bounded-size chunks of rows (Excel backend only).
+
+    Returns:
+        ExtractorProtocol: The data extractor instance.
+    """
+
+    source = Cfg.RAW_DATA.value / Cfg.RAW_DATA_FILE.value
+    sheet_names = [Cfg.SHEET_RUPTURA.value, Cfg.SHEET_ESTOQUE.value, Cfg.SHEET_VENDAS.value]
+
+    match backend:
+        case ExtractorBackend.EXCEL:
+            logger.info('Criando o extrator Excel...')
+            if streaming and parallel:
+                logger.warning('A extração em blocos lê as planilhas em sequência; ignorando a extração paralela.')
+            return ExcelExtractor(source,
+                                  sheet_names=sheet_names,
+                                  parallel=parallel,
+                                  dtype_backend=dtype_backend,
+                                  streaming=streaming)
+        case ExtractorBackend.DUCKDB:
+            logger.info('Criando o extrator DuckDB...')
+            if streaming:
+                logger.warning('A extração em blocos só se aplica ao extrator Excel; ignorando-a.')
+            return DuckDBExtractor(source, sheet_names=sheet_names, dtype_backend=dtype_backend)
+        case _:
+            raise ValueError(f"Backend de extração desconhecido: '{backend}'")
+
+
+def create_cleaning_service(schema: list[dict],
+                            fast_cleaning: bool = False,
+                            in_place: bool = False,
+                            memory_budget_bytes: int | None = None,
+                            hash_deduplication: bool = False,
+                            incremental_deduplication: bool = False,
+                            validation_mode: ValidationMode = ValidationMode.FULL,
+                            typed_cleaning: bool = False,
+                            dtype_backend: DtypeBackend = DtypeBackend.NUMPY,
+                            profiler: StageProfiler | None = None,
+                            trace_memory: bool = False) -> DataCleaningService:
     """Create the data cleaning service.
 
     Args:
         schema (list[dict]): The schema to be used for data cleaning.
+        fast_cleaning (bool): Whether to use the vectorized cleaner.
+        in_place (bool): Whether to clean each sheet in place, on a single buffer (implies the vectorized cleaner).
+        memory_budget_bytes (int | None): The maximum memory a sheet may use while being cleaned, checked
+            against an estimate before cleaning. Sheets over the budget are cleaned in place when that fits.
+        hash_deduplication (bool): Whether to remove repeated rows through 64-bit row hashes before cleaning.
+        incremental_deduplication (bool): Whether to also skip the rows loaded in previous runs
+            (implies hash deduplication).
+        validation_mode (ValidationMode): Which rows of each cleaned sheet are validated.
+        typed_cleaning (bool): Whether the cleaner emits the final dtypes, validated without coercion.
+        dtype_backend (DtypeBackend): The backend of the cleaned columns.
+        profiler (StageProfiler | None): Records the time and memory spent on each sheet.
+        trace_memory (bool): Whether to measure the memory actually allocated while cleaning each sheet.
 
     Returns:
         DataCleaningService: The data cleaning service instance.
     """
 
     logger.info('Criando o serviço de limpeza de dados...')
-    cleaner = DataCleaner()
+    dtype_backend = DtypeBackend(dtype_backend)
+    if in_place:
+        cleaner = InPlaceDataCleaner(dtype_backend)
+    elif fast_cleaning:
+        cleaner = FastDataCleaner(dtype_backend)
+    else:
+        cleaner = DataCleaner(dtype_backend)
+
+    if dtype_backend == DtypeBackend.ARROW:
+        logger.info('Usando colunas Arrow na limpeza de dados...')
+        schema = [{**sheet_schema, 'pandera_schema': to_arrow_schema(sheet_schema['pandera_schema'])}
+                  for sheet_schema in schema]
+
+    deduplicator = None
+    if hash_deduplication or incremental_deduplication:
+        deduplicator = HashDeduplicator(incremental=incremental_deduplication)
+
+    return DataCleaningService(cleaner,
+                               schema,
+                               in_place=in_place,
+                               memory_budget_bytes=memory_budget_bytes,
+                               deduplicator=deduplicator,
+                               validation_policy=ValidationPolicy(ValidationMode(validation_mode)),
+                               typed=typed_cleaning,
+                               profiler=profiler,
+                               trace_memory=trace_memory)
 
-    return DataCleaningService(cleaner, schema)
+
+def create_data_persistence(persistence_format: PersistenceFormat,
+                            background: bool = False) -> DataPersistenceProtocol:
+    """Create the data persister.
+
+    Args:
+        persistence_format (PersistenceFormat): The file format of the processed data.
+        background (bool): Whether to write the files in a background thread.
+
+    Returns:
+        DataPersistenceProtocol: The data persistence instance.
+    """
+
+    match persistence_format:
+        case PersistenceFormat.CSV:
+            data_persistence = DataPersistence()
+        case PersistenceFormat.PARQUET:
+            logger.info('Persistindo os dados processados em Parquet...')
+            data_persistence = ParquetDataPersistence()
+        case PersistenceFormat.FEATHER:
+            logger.info('Persistindo os dados processados em Feather...')
+            data_persistence = FeatherDataPersistence()
+        case PersistenceFormat.PARTITIONED:
+            logger.info('Persistindo os dados processados em Parquet particionado...')
+            data_persistence = PartitionedDataPersistence()
+        case _:
+            raise ValueError(f"Formato de persistência desconhecido: '{persistence_format}'")
+
+    if background:
+        logger.info('Gravando os dados processados em segundo plano...')
+        return BackgroundDataPersistence(data_persistence)
+
+    return data_persistence
+
+
+def create_merger(engine: MergeEngine) -> DataMergerProtocol:
+    """Create the data merger.
+
+    Args:
+        engine (MergeEngine): The engine used to join the cleaned datasets.
+
+    Returns:
+        DataMergerProtocol: The data merger instance.
+    """
+
+    match engine:
+        case MergeEngine.PANDAS:
+            return DataMerger()
+        case MergeEngine.INDEXED:
+            logger.info('Usando o motor de junção indexado...')
+            return IndexedDataMerger()
+        case _:
+            raise ValueError(f"Motor de junção desconhecido: '{engine}'")
 
 
 def create_transforming_service(data_persister: DataPersistenceProtocol,
-                                schema: pa.DataFrameSchema) -> DataTransformingService:
+                                schema: pa.DataFrameSchema,
+                                merge_engine: MergeEngine = MergeEngine.PANDAS,
+                                join_cardinality: JoinCardinality = JoinCardinality.ALLOW,
+                                validation_mode: ValidationMode = ValidationMode.FULL,
+                                compiled_validation: bool = False,
+                                dtype_backend: DtypeBackend = DtypeBackend.NUMPY) -> DataTransformingService:
     """Create the data transforming service.
 
     Args:
         schema (pa.DataFrameSchema): The schema to be used for data transforming.
+        merge_engine (MergeEngine): The engine used to join the cleaned datasets.
+        join_cardinality (JoinCardinality): What to do when the right side of a join repeats a key.
+        validation_mode (ValidationMode): Which rows of the consolidated data are validated.
+        compiled_validation (bool): Whether to check the consolidated data with the compiled,
+            vectorized validator instead of Pandera.
+        dtype_backend (DtypeBackend): The backend of the consolidated columns.
 
     Returns:
         DataTransformingService: The data transforming service instance.
     """
 
     logger.info('Criando o serviço de transformação de dados...')
-    merger = DataMerger()
+    if DtypeBackend(dtype_backend) == DtypeBackend.ARROW:
+        schema = to_arrow_schema(schema)
+    validation_policy = ValidationPolicy(ValidationMode(validation_mode))
+    if compiled_validation:
+        logger.info('Usando o validador compilado para os dados consolidados...')
+        schema = CompiledSchemaValidator(schema)
+    if MergeEngine(merge_engine) == MergeEngine.DUCKDB:
+        logger.info('Usando o DuckDB para as junções de consolidação...')
+        return DuckDBTransformingService(data_persister,
+                                         schema,
+                                         JoinCardinality(join_cardinality),
+                                         validation_policy)
+
+    merger = create_merger(MergeEngine(merge_engine))
+
+    return DataTransformingService(merger,
+                                   data_persister,
+                                   schema,
+                                   JoinCardinality(join_cardinality),
+                                   validation_policy)
+
+
+def create_loader(target: LoadTarget, load_mode: LoadMode = LoadMode.REPLACE) -> LoaderProtocol:
+    """Create the data loader.
+
+    Args:
+        target (LoadTarget): The database that receives the consolidated data.
+        load_mode (LoadMode): How the data reaches the destination table.
+
+    Returns:
+        LoaderProtocol: The data loader instance.
+    """
+
+    match target:
+        case LoadTarget.MOTHERDUCK:
+            logger.info('Carregando os dados no MotherDuck...')
+        case LoadTarget.LOCAL:
+            logger.info(f'Carregando os dados no arquivo DuckDB local {Cfg.LOCAL_DATABASE.value}...')
+        case LoadTarget.MEMORY:
+            logger.info('Carregando os dados em um banco DuckDB em memória...')
+        case _:
+            raise ValueError(f"Destino de carga desconhecido: '{target}'")
 
-    return DataTransformingService(merger, data_persister, schema)
+    return DataLoader(load_mode=load_mode, target=target)
 
 
-def build_application():
-    """Build the ETL application."""
+def build_application(extractor_backend: ExtractorBackend = ExtractorBackend.EXCEL,
+                      parallel_extraction: bool = False,
+                      streaming_extraction: bool = False,
+                      extraction_cache: bool = False,
+                      fast_cleaning: bool = False,
+                      in_place_cleaning: bool = False,
+                      cleaning_memory_budget: int | None = None,
+                      trace_cleaning_memory: bool = False,
+                      hash_deduplication: bool = False,
+                      incremental_load: bool = False,
+                      merge_engine: MergeEngine = MergeEngine.PANDAS,
+                      join_cardinality: JoinCardinality = JoinCardinality.ALLOW,
+                      persistence_format: PersistenceFormat = Cfg.PERSISTENCE_FORMAT.value,
+                      background_persistence: bool = False,
+                      validation_mode: ValidationMode = ValidationMode.FULL,
+                      compiled_validation: bool = False,
+                      typed_cleaning: bool = False,
+                      dtype_backend: DtypeBackend = DtypeBackend.NUMPY,
+                      load_mode: LoadMode = LoadMode.REPLACE,
+                      load_target: LoadTarget = LoadTarget.MOTHERDUCK,
+                      run_report: bool = False,
+                      run_report_memory_tracing: bool = True,
+                      prometheus_metrics: bool = False,
+                      stage_checkpoints: bool = False,
+                      resume_from: PipelineStage | None = None,
+                      memoization: bool = False):
+    """Build the ETL application.
+
+    Args:
+        extractor_backend (ExtractorBackend): The engine used to read the raw data.
+        parallel_extraction (bool): Whether to parse each Excel sheet in its own worker process.
+        streaming_extraction (bool): Whether to read each Excel sheet in chunks of EXTRACTION_CHUNK_SIZE
+            rows, converted to compact Arrow columns as they are read, which lowers the peak memory of the
+            extraction of large sheets. Each sheet still reaches the cleaning as a whole DataFrame, since
+            deduplication, missing-value fills and checkpoints work on complete sheets.
+        extraction_cache (bool): Whether to reuse the sheets parsed in previous runs of the same workbook.
+        fast_cleaning (bool): Whether to use the vectorized cleaner.
+        in_place_cleaning (bool): Whether to clean each sheet in place, on a single buffer.
+        cleaning_memory_budget (int | None): The maximum memory, in bytes, a sheet may use while being cleaned.
+            It is checked against an estimate before each sheet is cleaned: a sheet over the budget is
+            cleaned in place if that fits, and refused with a MemoryError otherwise.
+        trace_cleaning_memory (bool): Whether to measure, with tracemalloc, the memory actually allocated
+            while cleaning each sheet and warn when it exceeded the budget. Slows down the cleaning.
+        hash_deduplication (bool): Whether to remove repeated rows through 64-bit row hashes.
+        incremental_load (bool): Whether to skip the rows loaded in previous runs and append only the new ones.
+        merge_engine (MergeEngine): The engine used to join the cleaned datasets.
+        join_cardinality (JoinCardinality): What to do when a join would be many-to-many
+            ('allow', 'warn', 'reject', 'deduplicate' or 'aggregate').
+        persistence_format (PersistenceFormat): The file format of the processed data
+            ('csv', 'parquet', 'feather' or 'partitioned').
+        background_persistence (bool): Whether to write the processed data in a background thread,
+            overlapping the writes with the next merge and the load.
+        validation_mode (ValidationMode): Which rows are validated against the Pandera schemas
+            ('full', 'head', 'tail', 'sample' or 'new_partitions').
+        compiled_validation (bool): Whether to check the consolidated data in a single vectorized
+            pass per column instead of through Pandera.
+        typed_cleaning (bool): Whether the cleaner emits the dtypes declared by the Pandera schemas,
+            so the cleaned sheets are validated without a second coercion.
+        dtype_backend (DtypeBackend): The backend of the column dtypes, from extraction to load
+            ('numpy' or 'arrow', for pyarrow-backed string and numeric columns).
+        load_mode (LoadMode): How the consolidated data reaches the destination table ('replace',
+            'append', 'merge' to upsert by data_base/cliente_id/categoria_material, or 'partitions'
+            to replace only the year/month partitions that changed). Defaults to 'append' when
+            `incremental_load` is set.
+        load_target (LoadTarget): The database that receives the consolidated data ('motherduck',
+            'local' for a DuckDB file under data/warehouse, or 'memory'). Only 'motherduck'
+            requires the MOTHERDUCK_TOKEN.
+        run_report (bool): Whether to record the wall time, CPU time, memory and rows of each stage
+            and sheet, written as a JSON run report under data/reports.
+        run_report_memory_tracing (bool): Whether the run report traces the memory allocated in each
+            stage with tracemalloc, which slows down the measured stages.
+        prometheus_metrics (bool): Whether to also write the run report in the Prometheus textfile
+            format (implies `run_report`).
+        stage_checkpoints (bool): Whether to save the output of the extract, clean and transform stages
+            under data/cache/checkpoints, so a failed run can be resumed.
+        resume_from (PipelineStage | None): The first stage to run ('clean_and_validate_data',
+            'transform_for_analysis' or 'load_to_destination'); the earlier stages are restored
+            from their last valid checkpoint (implies `stage_checkpoints`).
+        memoization (bool): Whether to reuse, from data/cache/memo, the cleaned sheets and the
+            consolidated data of previous runs whose inputs, schemas and options did not change.
+    """
 
     logger.info('Construindo a aplicação ETL...')
 
-    # Create an ExcelExtractor instance.
-    logger.info('Criando o extrator Excel...')
-    extractor = ExcelExtractor(Cfg.RAW_DATA.value / Cfg.RAW_DATA_FILE.value)
+    load_mode = LoadMode(load_mode)
+    if incremental_load and load_mode == LoadMode.REPLACE:
+        load_mode = LoadMode.APPEND
+    if incremental_load and load_mode == LoadMode.PARTITIONS:
+        # Com a carga incremental, as partições seriam substituídas apenas pelas linhas novas.
+        raise ValueError("A carga incremental não pode ser combinada com o modo de carga 'partitions'.")
+    if incremental_load and resume_from is not None:
+        # As linhas restauradas não seriam registradas no índice incremental após a carga.
+        raise ValueError('A carga incremental não pode ser retomada a partir de um ponto de controle.')
+    if incremental_load and memoization:
+        # As planilhas reutilizadas não passariam pela deduplicação incremental.
+        raise ValueError('A carga incremental não pode ser combinada com a memoização.')
+
+    # Apenas as opções que alteram a saída de cada etapa invalidam os seus pontos de controle.
+    stage_options = {PipelineStage.EXTRACT: {'extractor_backend': extractor_backend,
+                                             'dtype_backend': dtype_backend},
+                     PipelineStage.CLEAN: {'fast_cleaning': fast_cleaning,
+                                           'in_place_cleaning': in_place_cleaning,
+                                           'hash_deduplication': hash_deduplication,
+                                           'validation_mode': validation_mode,
+                                           'typed_cleaning': typed_cleaning},
+                     PipelineStage.TRANSFORM: {'merge_engine': merge_engine,
+                                               'join_cardinality': join_cardinality,
+                                               'validation_mode': validation_mode,
+                                               'compiled_validation': compiled_validation}}
+    checkpoint = StageCheckpoint(enabled=stage_checkpoints or resume_from is not None,
+                                 stage_options=stage_options,
+                                 resume_from=resume_from)
+
+    profiler = StageProfiler(enabled=run_report or prometheus_metrics,
+                             trace_memory=run_report_memory_tracing,
+                             prometheus_textfile=prometheus_metrics)
+
+    # Create the extractor instance.
+    extractor = create_extractor(ExtractorBackend(extractor_backend),
+                                 parallel_extraction,
+                                 dtype_backend,
+                                 streaming_extraction)
+    if extraction_cache:
+        logger.info('Habilitando o cache de extração...')
+        extractor = CachedExtractor(extractor)
 
     # Criando o serviço de limpeza de dados.
-    cleaning_service = create_cleaning_service(DATA_CLEANING_SCHEMAS)
+    cleaning_service = create_cleaning_service(DATA_CLEANING_SCHEMAS,
+                                               fast_cleaning,
+                                               in_place_cleaning,
+                                               cleaning_memory_budget,
+                                               hash_deduplication,
+                                               incremental_load,
+                                               validation_mode,
+                                               typed_cleaning,
+                                               dtype_backend,
+                                               profiler,
+                                               trace_cleaning_memory)
+    if memoization:
+        logger.info('Habilitando a memoização da limpeza de dados...')
+        cleaning_service = MemoizedCleaningService(cleaning_service,
+                                                   MemoStore('cleaning'),
+                                                   {**stage_options[PipelineStage.CLEAN],
+                                                    'dtype_backend': dtype_backend})
 
     # Create a DataPersistence instance.
     logger.info('Criando o persistente de dados...')
-    data_persistence = DataPersistence()
+    data_persistence = create_data_persistence(PersistenceFormat(persistence_format), background_persistence)
 
     # Criando o serviço de transformação de dados.
-    transforming_service = create_transforming_service(data_persistence, CONSOLIDATED_SCHEMA)
+    transforming_service = create_transforming_service(data_persistence,
+                                                       CONSOLIDATED_SCHEMA,
+                                                       merge_engine,
+                                                       join_cardinality,
+                                                       validation_mode,
+                                                       compiled_validation,
+                                                       dtype_backend)
+    if memoization:
+        logger.info('Habilitando a memoização da transformação de dados...')
+        transforming_service = MemoizedTransformingService(transforming_service,
+                                                           MemoStore('transforming'),
+                                                           stage_options[PipelineStage.TRANSFORM])
 
     # Create a DataLoader instance.
     logger.info('Criando o carregador de dados...')
-    loader = DataLoader()
+    loader = create_loader(LoadTarget(load_target), load_mode)
 
     # Create a Pipeline instance.
     logger.info('Criando o pipeline...')
@@ -94,4 +457,4 @@ def build_application():
                         transforming_service,
                         loader)
 
-    return PipelineManager(pipeline)
+    return PipelineManager(pipeline, profiler, checkpoint, incremental_load)
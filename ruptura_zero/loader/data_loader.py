@@ -14,25 +14,76 @@
 # ------------------------------------------------------------------------------
 
 import os
+import threading
+import time
+from pathlib import Path
+from typing import ClassVar
 
 import duckdb as db
 import pandas as pd
+import pyarrow as pa
 from dotenv import load_dotenv
 from loguru import logger
 
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.load_mode import LoadMode
+from ruptura_zero.utilities.load_target import LoadTarget
+from ruptura_zero.utilities.memory_tracker import format_bytes
+
 
 class DataLoader:
-    def __init__(self, table_name: str = 'ruptura_zero_analysis') -> None:
+    """Loads the consolidated data into a DuckDB database (MotherDuck, a local file or memory).
+
+    Each target database is opened once and its connection is kept in a pool shared by every
+    loader of the process, so consecutive loads reuse the same authenticated session. Frames
+    with pyarrow-backed columns are sent as a stream of Arrow record batches; NumPy-backed frames
+    are scanned by DuckDB in place, which is faster than converting them to Arrow first (DuckDB
+    reads pandas categoricals through their codes, but decodes Arrow dictionaries). Categorical
+    columns are written as VARCHAR, never as ENUM, so the table accepts new categories in later
+    loads. The number of rows written is taken from the result of the statement that writes them.
+    """
+
+    # Conexões de longa duração, uma por banco de destino.
+    _connection_pool: ClassVar[dict[str, db.DuckDBPyConnection]] = {}
+    _connection_pool_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self,
+                 table_name: str = 'ruptura_zero_analysis',
+                 load_mode: LoadMode = LoadMode.REPLACE,
+                 key_columns: tuple[str, ...] = Cfg.LOAD_KEY_COLUMNS.value,
+                 partition_columns: tuple[str, ...] = Cfg.PERSISTENCE_PARTITION_COLUMNS.value,
+                 target: LoadTarget = LoadTarget.MOTHERDUCK,
+                 database_path: Path = Cfg.LOCAL_DATABASE.value,
+                 batch_size: int = Cfg.LOAD_BATCH_SIZE.value) -> None:
         """Initialize the DataLoader.
 
         Args:
             table_name (str): The name of the table to load data into.
+            load_mode (LoadMode): How the data reaches the table: `replace` recreates it, `append`
+                inserts every row, `merge` upserts the rows by `key_columns` and `partitions`
+                replaces only the year/month partitions whose content changed since the last load.
+            key_columns (tuple[str, ...]): The columns that identify a row in the `merge` mode.
+            partition_columns (tuple[str, ...]): The columns that identify a partition in the `partitions` mode.
+            target (LoadTarget): The database that receives the data: MotherDuck, a local DuckDB
+                file or an in-memory DuckDB database kept while the process runs.
+            database_path (Path): The DuckDB file of the `local` target.
+            batch_size (int): The maximum number of rows of each Arrow record batch sent to the database.
         """
 
         self.table_name = table_name
+        self.load_mode = LoadMode(load_mode)
+        self.key_columns = list(key_columns)
+        self.partition_columns = list(partition_columns)
+        self.target = LoadTarget(target)
+        self.database_path = Path(database_path)
+        self.batch_size = batch_size
 
-        # Carregando o token do MotherDuck.
-        self._load_token()
+        # Linhas gravadas, bytes preparados para envio e duração da última carga.
+        self.statistics: dict[str, float] = {}
+
+        # Apenas o MotherDuck exige o token.
+        if self.target == LoadTarget.MOTHERDUCK:
+            self._load_token()
 
     def _load_token(self) -> None:
         """Load the MotherDuck token from environment variables."""
@@ -50,44 +101,335 @@ class DataLoader:
 
         self.token = motherduck_token
 
-    def _load_data_to_motherduck(self, data: pd.DataFrame) -> None:
-        """Load data into MotherDuck.
+    def _stage(self, connection: db.DuckDBPyConnection, name: str, data: pd.DataFrame, streamed: bool = True) -> int:
+        """Register the data as a relation of the connection.
+
+        Pyarrow-backed frames are registered as a stream of record batches of at most
+        `batch_size` rows, built from the buffers they already hold. Other frames are
+        registered as they are.
 
         Args:
-            data (pd.DataFrame): The data to load into MotherDuck.
+            connection (db.DuckDBPyConnection): The connection to the target database.
+            name (str): The name of the relation.
+            data (pd.DataFrame): The data to stage.
+            streamed (bool): Whether the relation is read by a single statement. A stream of
+                batches can only be read once, so relations read again are registered as tables.
+
+        Returns:
+            int: The size of the staged data in bytes (for object columns, of their pointers only).
+        """
+
+        if any(isinstance(dtype, pd.ArrowDtype) for dtype in data.dtypes):
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            if streamed:
+                connection.register(name, pa.RecordBatchReader.from_batches(
+                    table.schema, table.to_batches(max_chunksize=self.batch_size)))
+            else:
+                connection.register(name, table)
+            return table.nbytes
+
+        connection.register(name, data)
+
+        # Sem `deep=True`, que mediria cada texto em Python e custaria mais que a própria carga.
+        return int(data.memory_usage(index=False).sum())
+
+    @staticmethod
+    def _decoded(name: str, data: pd.DataFrame) -> str:
+        """Return a relation of the staged data with its categorical columns decoded to VARCHAR.
+
+        DuckDB would otherwise create ENUM columns fixed to the categories of the first load.
+
+        Args:
+            name (str): The name of the staged relation.
+            data (pd.DataFrame): The staged data.
+
+        Returns:
+            str: The relation, to be used in a FROM clause.
+        """
+
+        categorical_columns = [column for column, dtype in data.dtypes.items()
+                               if isinstance(dtype, pd.CategoricalDtype)
+                               or (isinstance(dtype, pd.ArrowDtype) and pa.types.is_dictionary(dtype.pyarrow_dtype))]
+        if not categorical_columns:
+            return name
+
+        # A conversão é feita pelo DuckDB, que decodifica cada categoria uma única vez.
+        replaced = ', '.join(f'CAST("{column}" AS VARCHAR) AS "{column}"' for column in categorical_columns)
+
+        return f'(SELECT * REPLACE ({replaced}) FROM {name})'
+
+    @property
+    def _target_name(self) -> str:
+        """The name of the target, as shown in the logs."""
+
+        match self.target:
+            case LoadTarget.LOCAL:
+                return f'DuckDB local ({self.database_path})'
+            case LoadTarget.MEMORY:
+                return 'DuckDB em memória'
+            case _:
+                return 'MotherDuck'
+
+    @property
+    def _database(self) -> str:
+        """The database DuckDB connects to for the target."""
+
+        match self.target:
+            case LoadTarget.LOCAL:
+                return str(self.database_path)
+            case LoadTarget.MEMORY:
+                return ':memory:'
+            case _:
+                return 'md:'
+
+    def _connect(self) -> db.DuckDBPyConnection:
+        """Open a cursor on the pooled connection of the target database, connecting on first use.
+
+        Returns:
+            db.DuckDBPyConnection: The cursor, to be closed by the caller. Closing it keeps the
+                pooled connection (and an in-memory database) open.
+        """
+
+        with DataLoader._connection_pool_lock:
+            connection = DataLoader._connection_pool.get(self._database)
+            if connection is None:
+                logger.info(f'Estabelecendo conexão com o {self._target_name}...')
+                if self.target == LoadTarget.LOCAL:
+                    self.database_path.parent.mkdir(parents=True, exist_ok=True)
+                connection = db.connect(database=self._database, read_only=False)
+                DataLoader._connection_pool[self._database] = connection
+                logger.success(f'Conexão com o {self._target_name} estabelecida com sucesso.')
+
+        return connection.cursor()
+
+    @classmethod
+    def close_connections(cls) -> None:
+        """Close the pooled connections of every target."""
+
+        with cls._connection_pool_lock:
+            for connection in cls._connection_pool.values():
+                connection.close()
+            cls._connection_pool.clear()
+
+    @property
+    def _partitions_table_name(self) -> str:
+        """The table that keeps the fingerprint of each loaded partition."""
+
+        return f'{self.table_name}_partitions'
+
+    def _create_table_if_missing(self, connection: db.DuckDBPyConnection, staged_relation: str) -> None:
+        """Create the target table, with the columns of the staged relation, if it does not exist yet."""
+
+        # `WITH NO DATA` só lê o esquema, sem consumir o fluxo de lotes.
+        connection.execute(f'CREATE TABLE IF NOT EXISTS {self.table_name} '
+                           f'AS SELECT * FROM {staged_relation} WITH NO DATA')
+
+        # Tabelas criadas por cargas anteriores podem ter colunas ENUM, que rejeitariam categorias novas.
+        enum_columns = connection.execute("SELECT column_name FROM duckdb_columns() "
+                                          "WHERE database_name = current_database() "
+                                          "AND schema_name = current_schema() "
+                                          "AND table_name = ? AND data_type LIKE 'ENUM%'",
+                                          [self.table_name]).fetchall()
+        for (column,) in enum_columns:
+            logger.info(f'Convertendo a coluna ENUM "{column}" de "{self.table_name}" para VARCHAR...')
+            connection.execute(f'ALTER TABLE {self.table_name} ALTER COLUMN "{column}" TYPE VARCHAR')
+
+    def _replace_table(self, connection: db.DuckDBPyConnection, data: pd.DataFrame) -> tuple[int, int]:
+        """Recreate the target table with the data.
+
+        Args:
+            connection (db.DuckDBPyConnection): The connection to the target database.
+            data (pd.DataFrame): The data to load.
+
+        Returns:
+            tuple[int, int]: The number of rows written and the size of the staged data, in bytes.
+        """
+
+        staged_bytes = self._stage(connection, 'data_to_load', data)
+        rows = connection.execute(f'CREATE OR REPLACE TABLE {self.table_name} '
+                                  f'AS SELECT * FROM {self._decoded("data_to_load", data)}').fetchone()[0]
+
+        return rows, staged_bytes
+
+    def _append_data(self, connection: db.DuckDBPyConnection, data: pd.DataFrame) -> tuple[int, int]:
+        """Insert the data into the target table.
+
+        Args:
+            connection (db.DuckDBPyConnection): The connection to the target database.
+            data (pd.DataFrame): The data to load.
+
+        Returns:
+            tuple[int, int]: The number of rows written and the size of the staged data, in bytes.
         """
 
+        staged_bytes = self._stage(connection, 'data_to_load', data)
+        source = self._decoded('data_to_load', data)
+        self._create_table_if_missing(connection, source)
+        rows = connection.execute(f'INSERT INTO {self.table_name} BY NAME SELECT * FROM {source}').fetchone()[0]
+
+        return rows, staged_bytes
+
+    def _merge_data(self, connection: db.DuckDBPyConnection, data: pd.DataFrame) -> tuple[int, int]:
+        """Upsert the rows into the target table by their key columns.
+
+        Args:
+            connection (db.DuckDBPyConnection): The connection to the target database.
+            data (pd.DataFrame): The data to load.
+
+        Returns:
+            tuple[int, int]: The number of rows inserted or updated and the size of the staged data, in bytes.
+        """
+
+        missing = [column for column in self.key_columns if column not in data.columns]
+        if missing:
+            raise KeyError(f'Colunas da chave de carga ausentes: {missing}')
+
+        # Com chaves repetidas, a tabela passaria a ter mais de uma linha por chave.
+        duplicated = int(data.duplicated(subset=self.key_columns).sum())
+        if duplicated:
+            raise ValueError(f'{duplicated} linhas repetem a chave de carga {self.key_columns}.')
+
+        # Lidos pela remoção e pela inserção, os dados não podem ser enviados como fluxo de lotes.
+        staged_bytes = self._stage(connection, 'data_to_load', data, streamed=False)
+        source = self._decoded('data_to_load', data)
+        self._create_table_if_missing(connection, source)
+
+        matches = ' AND '.join(f'target.{column} = source.{column}' for column in self.key_columns)
+
+        # Remoção e inserção em uma única transação, em vez do MERGE INTO, disponível só no DuckDB 1.4.
+        connection.execute('BEGIN TRANSACTION')
         try:
-            logger.info('Estabelecendo conexão com o MotherDuck...')
+            connection.execute(f'DELETE FROM {self.table_name} AS target USING {source} AS source WHERE {matches}')
+            rows = connection.execute(f'INSERT INTO {self.table_name} BY NAME SELECT * FROM {source}').fetchone()[0]
+            connection.execute('COMMIT')
+        except db.Error:
+            connection.execute('ROLLBACK')
+            raise
 
-            with db.connect(database='md:', read_only=False) as connection:
-                logger.success('Conexão com MotherDuck estabelecida com sucesso.')
-                logger.info(f'Preparando para carregar dados na tabela "{self.table_name}"...')
+        return rows, staged_bytes
+
+    def _partition_fingerprints(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Compute the fingerprint of each partition of the data.
+
+        The fingerprint combines the number of rows and the sum of their 64-bit hashes, so it
+        does not depend on the order of the rows.
+
+        Args:
+            data (pd.DataFrame): The data to fingerprint.
+
+        Returns:
+            pd.DataFrame: The partition columns and the fingerprint of each partition.
+        """
+
+        row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+        # A soma em uint64 dá a volta no estouro, como esperado para uma soma de hashes.
+        partitions = data[self.partition_columns].assign(row_hash=row_hashes) \
+                                                 .groupby(self.partition_columns, observed=True)['row_hash'] \
+                                                 .agg(['size', 'sum'])
+
+        fingerprints = [f'{size}:{row_hash_sum:016x}'
+                        for size, row_hash_sum in zip(partitions['size'], partitions['sum'])]
+
+        return partitions.index.to_frame(index=False).assign(fingerprint=fingerprints)
+
+    def _replace_changed_partitions(self, connection: db.DuckDBPyConnection, data: pd.DataFrame) -> tuple[int, int]:
+        """Replace the partitions of the target table whose content changed since the last load.
 
-                connection.register('data_to_load', data)
-                connection.execute(f'CREATE OR REPLACE TABLE {self.table_name} AS SELECT * FROM data_to_load')
+        Args:
+            connection (db.DuckDBPyConnection): The connection to the target database.
+            data (pd.DataFrame): The data to load.
+
+        Returns:
+            tuple[int, int]: The number of rows written and the size of the staged data, in bytes.
+        """
+
+        missing = [column for column in self.partition_columns if column not in data.columns]
+        if missing:
+            raise KeyError(f'Colunas de partição ausentes: {missing}')
+
+        fingerprints = self._partition_fingerprints(data)
+        self._stage(connection, 'loaded_partitions', fingerprints, streamed=False)
+        connection.execute(f'CREATE TABLE IF NOT EXISTS {self._partitions_table_name} '
+                           'AS SELECT * FROM loaded_partitions WITH NO DATA')
+
+        partition_columns = ', '.join(self.partition_columns)
+        known_fingerprints = {tuple(row[:-1]): row[-1] for row in connection.execute(
+            f'SELECT {partition_columns}, fingerprint FROM {self._partitions_table_name}').fetchall()}
+
+        is_changed = [known_fingerprints.get(tuple(partition[:-1])) != partition[-1]
+                      for partition in fingerprints.itertuples(index=False, name=None)]
+        changed_partitions = fingerprints.loc[is_changed]
+        if changed_partitions.empty:
+            logger.info('Nenhuma partição alterada desde a última carga.')
+            return 0, 0
+
+        logger.info(f'{len(changed_partitions)} de {len(fingerprints)} partições alteradas desde a última carga.')
+
+        # Apenas as linhas das partições alteradas são enviadas ao destino.
+        is_changed_row = pd.MultiIndex.from_frame(data[self.partition_columns]) \
+                                      .isin(pd.MultiIndex.from_frame(changed_partitions[self.partition_columns]))
+        staged_bytes = self._stage(connection, 'changed_rows', data.loc[is_changed_row])
+        self._stage(connection, 'changed_partitions', changed_partitions, streamed=False)
+        changed_rows = self._decoded('changed_rows', data)
+        self._create_table_if_missing(connection, changed_rows)
+
+        matches = ' AND '.join(f'target.{column} = changed.{column}' for column in self.partition_columns)
+
+        # Uma única transação: as consultas à tabela nunca veem uma partição pela metade.
+        connection.execute('BEGIN TRANSACTION')
+        try:
+            connection.execute(f'DELETE FROM {self.table_name} AS target '
+                               f'USING changed_partitions AS changed WHERE {matches}')
+            rows = connection.execute(f'INSERT INTO {self.table_name} BY NAME '
+                                      f'SELECT * FROM {changed_rows}').fetchone()[0]
+            connection.execute(f'DELETE FROM {self._partitions_table_name} AS target '
+                               f'USING changed_partitions AS changed WHERE {matches}')
+            connection.execute(f'INSERT INTO {self._partitions_table_name} BY NAME SELECT * FROM changed_partitions')
+            connection.execute('COMMIT')
+        except db.Error:
+            connection.execute('ROLLBACK')
+            raise
+
+        return rows, staged_bytes
+
+    def _load_data_to_database(self, data: pd.DataFrame) -> None:
+        """Load data into the target database.
+
+        Args:
+            data (pd.DataFrame): The data to load.
+        """
+
+        try:
+            with self._connect() as connection:
+                logger.info(f'Preparando para carregar dados na tabela "{self.table_name}"...')
 
-                # Checando o número de linhas carregadas para o MotherDuck.
-                count_result = connection.execute(f'SELECT COUNT(*) FROM {self.table_name}').fetchone()
-                if count_result:
-                    logger.success(f'Dados carregados com sucesso na tabela "{self.table_name}" no MotherDuck.')
-                    logger.info(f'{count_result[0]} linhas foram carregadas na tabela "{self.table_name}"')
-                else:
-                    logger.warning('Não foi possível verificar o número de linhas carregadas.')
+                start = time.perf_counter()
+                match self.load_mode:
+                    case LoadMode.APPEND:
+                        # Carga incremental: apenas as linhas novas são inseridas na tabela existente.
+                        rows, staged_bytes = self._append_data(connection, data)
+                    case LoadMode.MERGE:
+                        rows, staged_bytes = self._merge_data(connection, data)
+                    case LoadMode.PARTITIONS:
+                        rows, staged_bytes = self._replace_changed_partitions(connection, data)
+                    case _:
+                        rows, staged_bytes = self._replace_table(connection, data)
+                seconds = time.perf_counter() - start
 
         except db.Error as error:
-            logger.error(f'Ocorreu um erro ao carregar os dados para o MotherDuck: {error}')
+            logger.error(f'Ocorreu um erro ao carregar os dados para o {self._target_name}: {error}')
             raise
 
-    def load_data(self, data: pd.DataFrame, to_motherduck: bool = True) -> None:
-        """Load data into the specified destination.
+        self.statistics = {'rows': rows, 'bytes': staged_bytes, 'seconds': seconds}
+        logger.success(f'Dados carregados com sucesso na tabela "{self.table_name}" no {self._target_name}.')
+        logger.info(f'{rows} linhas gravadas em {seconds:.2f} s ({rows / max(seconds, 1e-9):,.0f} linhas/s, '
+                    f'{format_bytes(staged_bytes)} enviados).')
+
+    def load_data(self, data: pd.DataFrame) -> None:
+        """Load data into the target database.
 
         Args:
             data (pd.DataFrame): The data to load.
-            to_motherduck (bool): Whether to load data into MotherDuck.
         """
 
-        if to_motherduck:
-            self._load_data_to_motherduck(data)
-        else:
-            logger.warning('Carregamento de dados para o destino não suportado.')
+        self._load_data_to_database(data)
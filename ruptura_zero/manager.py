@@ -13,36 +13,123 @@
 #  License: MIT
 # ------------------------------------------------------------------------------
 
+from typing import Any, Callable
+
 from loguru import logger
 
 from ruptura_zero.pipeline import Pipeline
+from ruptura_zero.utilities.pipeline_stage import PipelineStage
+from ruptura_zero.utilities.stage_checkpoint import StageCheckpoint
+from ruptura_zero.utilities.stage_profiler import StageProfiler
 
 
 class PipelineManager:
     """Orchestrates the ETL pipeline stages."""
 
-    def __init__(self, pipeline: Pipeline) -> None:
+    def __init__(self,
+                 pipeline: Pipeline,
+                 profiler: StageProfiler | None = None,
+                 checkpoint: StageCheckpoint | None = None,
+                 incremental_load: bool = False) -> None:
         """Initialize the PipelineManager.
 
         Args:
             pipeline (Pipeline): The ETL pipeline instance.
+            profiler (StageProfiler | None): Records the time, memory and data volume of each stage
+                and writes the run report. Defaults to a disabled profiler.
+            checkpoint (StageCheckpoint | None): Saves the output of each stage and restores it when
+                resuming a run. Defaults to disabled checkpoints.
+            incremental_load (bool): Whether only the rows not loaded in previous runs are processed,
+                so the run ends early when a cleaned sheet has no new rows.
         """
 
         logger.info('Inicializando o Pipeline Manager...')
 
         self.pipeline = pipeline
+        self.profiler = profiler or StageProfiler(enabled=False)
+        self.checkpoint = checkpoint or StageCheckpoint(enabled=False)
+        self.incremental_load = incremental_load
 
     def run_pipeline(self) -> None:
         """Run the entire ETL pipeline."""
 
+        with self.profiler.run():
+            self._run_stages()
+
+    def _run_stage(self, stage: PipelineStage, run: Callable, *inputs: Any) -> Any:
+        """Run a stage, measuring it and saving its output as a checkpoint.
+
+        Args:
+            stage (PipelineStage): The stage.
+            run (Callable): The pipeline method that runs the stage.
+            *inputs (Any): The output of the previous stage, if any.
+
+        Returns:
+            Any: The output of the stage.
+        """
+
+        with self.profiler.measure(stage, *inputs) as record:
+            output = record.output = run(*inputs)
+
+        self.checkpoint.save(stage, output)
+
+        return output
+
+    def _restore_stage(self, stage: PipelineStage) -> Any:
+        """Restore the output of a stage from its checkpoint, measuring the restore."""
+
+        logger.info(f'Retomando o pipeline a partir do ponto de controle de {stage}...')
+
+        with self.profiler.measure(stage) as record:
+            record.status = 'restored'
+            output = record.output = self.checkpoint.load(stage)
+
+        return output
+
+    def _run_stages(self) -> None:
+        """Run the pipeline stages, measuring each one."""
+
+        # Ao retomar uma execução, as etapas anteriores ao ponto de controle não são executadas.
+        restored_stage = self.checkpoint.restorable_stage()
+        stages = list(PipelineStage)
+        pending_stages = stages[stages.index(restored_stage) + 1:] if restored_stage is not None else stages
+        data = self._restore_stage(restored_stage) if restored_stage is not None else None
+
         # Extraindo os dados brutos.
-        raw_data = self.pipeline.extract_from_source()
+        if PipelineStage.EXTRACT in pending_stages:
+            data = self._run_stage(PipelineStage.EXTRACT, self.pipeline.extract_from_source)
 
         # Limpando e validando os dados.
-        cleaned_data = self.pipeline.clean_and_validate_data(raw_data)
+        if PipelineStage.CLEAN in pending_stages:
+            data = self._run_stage(PipelineStage.CLEAN, self.pipeline.clean_and_validate_data, data)
+
+        # Na carga incremental, uma planilha vazia significa que não há linhas novas.
+        if (self.incremental_load and PipelineStage.TRANSFORM in pending_stages
+                and any(data_frame.empty for data_frame in data.values())):
+            logger.warning('Nenhuma linha nova para processar. Encerrando o pipeline.')
+            return
+
+        try:
+            # Transformando os dados para análise.
+            if PipelineStage.TRANSFORM in pending_stages:
+                data = self._run_stage(PipelineStage.TRANSFORM, self.pipeline.transform_for_analysis, data)
+
+            # Carregando os dados transformados.
+            with self.profiler.measure(PipelineStage.LOAD, data) as stage:
+                self.pipeline.load_to_destination(data)
+                # O destino recebe exatamente o conjunto consolidado.
+                stage.output = data
+        except BaseException:
+            # A falha original prevalece: um erro das gravações em segundo plano é apenas registrado.
+            try:
+                self.pipeline.flush_pending_writes()
+            except Exception as error:
+                logger.error(f'Falha ao concluir as gravações em segundo plano: {error}')
+            raise
 
-        # Transformando os dados para análise.
-        transformed_data = self.pipeline.transform_for_analysis(cleaned_data)
+        # As gravações em segundo plano terminam antes de o estado da carga ser registrado.
+        self.pipeline.flush_pending_writes()
 
-        # Carregando os dados transformados.
-        self.pipeline.load_to_destination(transformed_data)
+        # O estado incremental só é registrado depois de uma carga e de gravações bem-sucedidas.
+        if data is not None:
+            self.pipeline.commit_loaded_state(data)
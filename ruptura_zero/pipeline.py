@@ -90,10 +90,30 @@ class Pipeline:
     def load_to_destination(self, final_data: pd.DataFrame | None) -> None:
         """Load the data into the destination."""
 
-        logger.info('Carregando os dados para o MotherDuck...')
+        logger.info('Carregando os dados para o destino...')
 
         if final_data is not None:
-            # Carregando os dados consolidados para o MotherDuck.
-            self.loader.load_data(final_data, to_motherduck=True)
+            # Carregando os dados consolidados no banco de destino.
+            self.loader.load_data(final_data)
         else:
-            logger.warning('Nenhum dado final para carregar no MotherDuck.')
+            logger.warning('Nenhum dado final para carregar no destino.')
+
+    def flush_pending_writes(self) -> None:
+        """Wait for the processed datasets still being written in the background."""
+
+        logger.info('Aguardando a gravação dos dados processados...')
+
+        self.transforming_service.flush()
+
+    def commit_loaded_state(self, loaded_data: pd.DataFrame | None = None) -> None:
+        """Persist the state of the rows loaded in this run (ex: the deduplication index).
+
+        Args:
+            loaded_data (pd.DataFrame | None): The data loaded in this run, which limits the
+                deduplication index to the rows that reached the destination.
+        """
+
+        logger.info('Registrando o estado da carga concluída...')
+
+        self.cleaning_service.commit(loaded_data)
+        self.transforming_service.commit()
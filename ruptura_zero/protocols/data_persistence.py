@@ -24,3 +24,6 @@ class DataPersistenceProtocol(Protocol):
 
     def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
         raise NotImplementedError('You should implement this method.')
+
+    def flush(self) -> None:
+        raise NotImplementedError('You should implement this method.')
@@ -21,5 +21,5 @@ import pandas as pd
 class LoaderProtocol(Protocol):
     """Protocol for data loaders."""
 
-    def load_data(self, data: pd.DataFrame, to_motherduck: bool) -> None:
+    def load_data(self, data: pd.DataFrame) -> None:
         raise NotImplementedError('You should implement this method.')
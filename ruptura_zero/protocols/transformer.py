@@ -17,13 +17,23 @@ from typing import Mapping, Protocol
 
 import pandas as pd
 
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
 from ruptura_zero.utilities.merge_how_options import MergeHowOptions
 
 
 class DataCleanerProtocol(Protocol):
     """Protocol for data cleaners."""
 
-    def clean(self, data: pd.DataFrame, column_types: dict) -> pd.DataFrame:
+    dtype_backend: DtypeBackend
+
+    def clean(self,
+              data: pd.DataFrame,
+              column_types: dict,
+              fill_strategies: dict | None = None,
+              dtypes: dict | None = None) -> pd.DataFrame:
+        raise NotImplementedError('You should implement this method.')
+
+    def estimate_peak_bytes(self, column_bytes: pd.Series) -> int:
         raise NotImplementedError('You should implement this method.')
 
 
@@ -33,6 +43,9 @@ class DataCleaningServiceProtocol(Protocol):
     def run(self, extracted_data: Mapping[str, pd.DataFrame | None]) -> Mapping[str, pd.DataFrame]:
         raise NotImplementedError('You should implement this method.')
 
+    def commit(self, loaded_data: pd.DataFrame | None = None) -> None:
+        raise NotImplementedError('You should implement this method.')
+
 
 class DataTransformingServiceProtocol(Protocol):
     """Protocol for data transformation services."""
@@ -40,6 +53,21 @@ class DataTransformingServiceProtocol(Protocol):
     def run(self, cleaned_data: Mapping[str, pd.DataFrame | None]) -> pd.DataFrame | None:
         raise NotImplementedError('You should implement this method.')
 
+    def flush(self) -> None:
+        raise NotImplementedError('You should implement this method.')
+
+    def commit(self) -> None:
+        raise NotImplementedError('You should implement this method.')
+
+
+class SchemaValidatorProtocol(Protocol):
+    """Protocol for schema validators, such as `pa.DataFrameSchema`."""
+
+    columns: dict
+
+    def validate(self, check_obj: pd.DataFrame, lazy: bool = False) -> pd.DataFrame:
+        raise NotImplementedError('You should implement this method.')
+
 
 class DataMergerProtocol(Protocol):
     """Protocol for data mergers."""
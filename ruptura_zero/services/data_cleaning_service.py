@@ -20,63 +20,230 @@ from loguru import logger
 from pandera.errors import SchemaError
 
 from ruptura_zero.protocols.transformer import DataCleanerProtocol
+from ruptura_zero.transformer.hash_deduplicator import HashDeduplicator
+from ruptura_zero.transformer.in_place_cleaner import InPlaceDataCleaner
+from ruptura_zero.transformer.validation_policy import ValidationPolicy
+from ruptura_zero.utilities.memory_tracker import MemoryTracker, format_bytes
+from ruptura_zero.utilities.stage_profiler import StageProfiler
 
 
 class DataCleaningService:
     """Service for cleaning and validating extracted data."""
 
-    def __init__(self, cleaner: DataCleanerProtocol, data_cleaning_schemas: list[dict]) -> None:
+    def __init__(self,
+                 cleaner: DataCleanerProtocol,
+                 data_cleaning_schemas: list[dict],
+                 in_place: bool = False,
+                 memory_budget_bytes: int | None = None,
+                 deduplicator: HashDeduplicator | None = None,
+                 validation_policy: ValidationPolicy | None = None,
+                 typed: bool = False,
+                 profiler: StageProfiler | None = None,
+                 trace_memory: bool = False) -> None:
         """Initialize the data cleaning service.
 
         Args:
             cleaner (DataCleanerProtocol): The data cleaner instance.
             data_cleaning_schemas (list[dict]): The schema to be used for data cleaning.
+            in_place (bool): Whether to rename and clean the extracted frames in place, without copies.
+            memory_budget_bytes (int | None): The maximum memory a sheet may use while being cleaned,
+                counting the extracted frame and the peak of the allocations made by the cleaning. The
+                peak is estimated before cleaning: a sheet over the budget is cleaned in place if that
+                fits, and refused otherwise.
+            deduplicator (HashDeduplicator | None): Removes repeated rows, and the rows loaded in
+                previous runs, from each extracted frame before it is cleaned.
+            validation_policy (ValidationPolicy | None): Which rows of each cleaned frame are validated.
+                Defaults to validating every row.
+            typed (bool): Whether the cleaner emits the dtypes declared by each Pandera schema,
+                which is then checked without coercion.
+            profiler (StageProfiler | None): Records the time and memory spent on each sheet.
+            trace_memory (bool): Whether to measure, with tracemalloc, the memory actually allocated while
+                cleaning each sheet and compare it with the estimate. Slows down the cleaning.
         """
 
         self.cleaner = cleaner
         self.data_cleaning_schemas = data_cleaning_schemas
+        self.in_place = in_place
+        self.memory_budget_bytes = memory_budget_bytes
+        self.deduplicator = deduplicator
+        self.validation_policy = validation_policy or ValidationPolicy()
+        self.typed = typed
+        self.profiler = profiler or StageProfiler(enabled=False)
+        self.trace_memory = trace_memory
 
-    def _cleaning_data(self, data: Mapping[str, pd.DataFrame | None]) -> Mapping[str, pd.DataFrame]:
+        # Limpeza no lugar usada quando a estimativa da limpeza configurada excede o orçamento.
+        self._in_place_cleaner = cleaner if in_place else InPlaceDataCleaner(cleaner.dtype_backend)
+
+        # No modo tipado, a validação só confere os tipos já emitidos pela limpeza.
+        self._non_coercing_schemas = {}
+        if typed:
+            for schema in data_cleaning_schemas:
+                pandera_schema = schema.get('pandera_schema')
+                if pandera_schema:
+                    self._non_coercing_schemas[schema['name']] = pandera_schema.update_columns(
+                        {column: {'coerce': False} for column in pandera_schema.columns})
+
+    def _choose_cleaner(self, name: str, data_frame: pd.DataFrame) -> tuple[DataCleanerProtocol, bool]:
+        """Choose how to clean a sheet within the memory budget, before cleaning it.
+
+        Args:
+            name (str): The name of the sheet.
+            data_frame (pd.DataFrame): The extracted sheet.
+
+        Returns:
+            tuple[DataCleanerProtocol, bool]: The cleaner to use and whether it cleans the sheet in place.
+
+        Raises:
+            MemoryError: If not even the in-place cleaning is estimated to fit the budget.
+        """
+
+        if self.memory_budget_bytes is None:
+            return self.cleaner, self.in_place
+
+        column_bytes = data_frame.memory_usage(deep=True, index=False)
+        input_bytes = int(column_bytes.sum())
+        estimated_bytes = input_bytes + self.cleaner.estimate_peak_bytes(column_bytes)
+        if estimated_bytes <= self.memory_budget_bytes:
+            return self.cleaner, self.in_place
+
+        if not self.in_place:
+            in_place_bytes = input_bytes + self._in_place_cleaner.estimate_peak_bytes(column_bytes)
+            if in_place_bytes <= self.memory_budget_bytes:
+                logger.warning(f'Limpeza de {name} estimada em {format_bytes(estimated_bytes)}, acima do orçamento '
+                               f'de {format_bytes(self.memory_budget_bytes)}. Limpando no lugar '
+                               f'(estimativa de {format_bytes(in_place_bytes)}).')
+                return self._in_place_cleaner, True
+            estimated_bytes = in_place_bytes
+
+        logger.error(f'Os dados de {name} excedem o orçamento de memória: estimativa de '
+                     f'{format_bytes(estimated_bytes)} de {format_bytes(self.memory_budget_bytes)}.')
+
+        raise MemoryError(f'Orçamento de memória insuficiente para a limpeza de {name}.')
+
+    def _clean_data_frame(self,
+                          data_frame: pd.DataFrame,
+                          schema: dict,
+                          cleaner: DataCleanerProtocol,
+                          in_place: bool) -> pd.DataFrame:
+        """Rename and clean a single extracted frame.
+
+        Args:
+            data_frame (pd.DataFrame): The extracted frame.
+            schema (dict): The cleaning schema of the frame.
+            cleaner (DataCleanerProtocol): The cleaner to use.
+            in_place (bool): Whether to rename the columns of the extracted frame in place.
+
+        Returns:
+            pd.DataFrame: The cleaned frame.
+        """
+
+        columns_mapping = schema.get('columns')
+        if columns_mapping:
+            if in_place:
+                data_frame.rename(columns=columns_mapping, inplace=True)
+            else:
+                data_frame = data_frame.rename(columns=columns_mapping)
+
+        dtypes = None
+        if self.typed and schema.get('pandera_schema'):
+            dtypes = {column: column_schema.dtype
+                      for column, column_schema in schema['pandera_schema'].columns.items()}
+
+        return cleaner.clean(data_frame, schema['types'], schema.get('fill_strategies'), dtypes)
+
+    def _clean_sheet(self, data_frame: pd.DataFrame, schema: dict) -> pd.DataFrame:
+        """Deduplicate and clean a single extracted sheet within the memory budget.
+
+        Args:
+            data_frame (pd.DataFrame): The extracted sheet.
+            schema (dict): The cleaning schema of the sheet.
+
+        Returns:
+            pd.DataFrame: The cleaned sheet.
+        """
+
+        if self.deduplicator is not None:
+            data_frame = self.deduplicator.deduplicate(schema['name'],
+                                                       data_frame,
+                                                       schema.get('incremental', False))
+
+        cleaner, in_place = self._choose_cleaner(schema['name'], data_frame)
+        if not self.trace_memory:
+            return self._track_keys(self._clean_data_frame(data_frame, schema, cleaner, in_place), schema)
+
+        input_bytes = int(data_frame.memory_usage(deep=True).sum())
+        with MemoryTracker() as tracker:
+            cleaned_dataframe = self._clean_data_frame(data_frame, schema, cleaner, in_place)
+        logger.info(f'Memória na limpeza de {schema["name"]}: {format_bytes(input_bytes)} de entrada, '
+                    f'pico de {format_bytes(tracker.peak_bytes)} em alocações adicionais.')
+        if self.memory_budget_bytes is not None and input_bytes + tracker.peak_bytes > self.memory_budget_bytes:
+            logger.warning(f'A limpeza de {schema["name"]} excedeu o orçamento de memória, acima da estimativa: '
+                           f'{format_bytes(input_bytes + tracker.peak_bytes)} de '
+                           f'{format_bytes(self.memory_budget_bytes)}.')
+
+        return self._track_keys(cleaned_dataframe, schema)
+
+    def _track_keys(self, cleaned_dataframe: pd.DataFrame, schema: dict) -> pd.DataFrame:
+        """Hand the keys of the cleaned rows to the deduplicator, which commits only the rows that get loaded.
+
+        Args:
+            cleaned_dataframe (pd.DataFrame): The cleaned sheet.
+            schema (dict): The cleaning schema of the sheet.
+
+        Returns:
+            pd.DataFrame: The cleaned sheet, unchanged.
+        """
+
+        if self.deduplicator is not None and schema.get('consolidated_keys'):
+            self.deduplicator.track_keys(schema['name'], cleaned_dataframe[schema['consolidated_keys']])
+
+        return cleaned_dataframe
+
+    def _cleaning_data(self,
+                       data: Mapping[str, pd.DataFrame | None],
+                       data_cleaning_schemas: list[dict]) -> Mapping[str, pd.DataFrame]:
         """Clean the extracted data using the defined schemas.
 
         Args:
             data (Mapping[str, pd.DataFrame | None]): The extracted data to clean.
+            data_cleaning_schemas (list[dict]): The schemas of the sheets to clean.
 
         Returns:
             Mapping[str, pd.DataFrame]: The cleaned data.
         """
 
         cleaned_data = {}
-        for schema in self.data_cleaning_schemas:
+        for schema in data_cleaning_schemas:
             data_frame = data.get(schema['data_attr'])
             if data_frame is not None:
-                columns_mapping = schema.get('columns')
-                if columns_mapping:
-                    data_frame = data_frame.rename(columns=columns_mapping)
-                cleaned_dataframe = self.cleaner.clean(data_frame, schema['types'])
-                cleaned_data[schema['data_attr']] = cleaned_dataframe
+                with self.profiler.measure(schema['data_attr'], data_frame):
+                    cleaned_data[schema['data_attr']] = self._clean_sheet(data_frame, schema)
             else:
                 logger.error(f'Dados de {schema["name"].lower()} não foram extraídos corretamente.')
 
         return cleaned_data
 
-    def _validate_data(self, data: Mapping[str, pd.DataFrame | None]) -> Mapping[str, pd.DataFrame]:
+    def _validate_data(self,
+                       data: Mapping[str, pd.DataFrame | None],
+                       data_cleaning_schemas: list[dict]) -> Mapping[str, pd.DataFrame]:
         """Validate the cleaned data against the defined schemas.
 
         Args:
             data (Mapping[str, pd.DataFrame | None]): The cleaned data to validate.
+            data_cleaning_schemas (list[dict]): The schemas of the sheets to validate.
 
         Returns:
             Mapping[str, pd.DataFrame]: The validated data.
         """
 
         validated_data = {}
-        for schema in self.data_cleaning_schemas:
+        for schema in data_cleaning_schemas:
             data_frame = data.get(schema['data_attr'])
-            pandera_schema = schema.get('pandera_schema')
+            pandera_schema = self._non_coercing_schemas.get(schema['name'], schema.get('pandera_schema'))
             if data_frame is not None and pandera_schema:
                 try:
-                    pandera_schema.validate(data_frame, lazy=True)
+                    with self.profiler.measure(schema['data_attr']):
+                        self.validation_policy.validate(schema['name'], pandera_schema, data_frame)
                     validated_data[schema['data_attr']] = data_frame
                 except SchemaError as error:
                     logger.error(f'Validação de dados para {schema["name"]} falhou.')
@@ -87,13 +254,39 @@ class DataCleaningService:
 
         return validated_data
 
-    def run(self, extracted_data: Mapping[str, pd.DataFrame | None]) -> Mapping[str, pd.DataFrame]:
-        """Clean and validate the extracted data."""
+    def commit(self, loaded_data: pd.DataFrame | None = None) -> None:
+        """Persist the state of the rows loaded in this run.
+
+        Args:
+            loaded_data (pd.DataFrame | None): The data loaded in this run.
+        """
+
+        if self.deduplicator is not None:
+            self.deduplicator.commit(loaded_data)
+
+        self.validation_policy.commit()
+
+    def run(self,
+            extracted_data: Mapping[str, pd.DataFrame | None],
+            data_cleaning_schemas: list[dict] | None = None) -> Mapping[str, pd.DataFrame]:
+        """Clean and validate the extracted data.
+
+        Args:
+            extracted_data (Mapping[str, pd.DataFrame | None]): The extracted data.
+            data_cleaning_schemas (list[dict] | None): The schemas of the sheets to clean and validate.
+                Defaults to every schema of the service.
+
+        Returns:
+            Mapping[str, pd.DataFrame]: The validated data.
+        """
 
         logger.info('Iniciando o processo de limpeza e validação dos dados extraídos...')
 
-        cleaned_data = self._cleaning_data(extracted_data)
-        validated_data = self._validate_data(cleaned_data)
+        if data_cleaning_schemas is None:
+            data_cleaning_schemas = self.data_cleaning_schemas
+
+        cleaned_data = self._cleaning_data(extracted_data, data_cleaning_schemas)
+        validated_data = self._validate_data(cleaned_data, data_cleaning_schemas)
 
         logger.success('Processo de limpeza e validação de dados concluído com sucesso.')
 
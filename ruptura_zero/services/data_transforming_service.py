@@ -17,14 +17,28 @@ from typing import Mapping
 
 import pandas as pd
 from loguru import logger
-import pandera.pandas as pa
 from pandera.errors import SchemaError
 
 from ruptura_zero.protocols.data_persistence import DataPersistenceProtocol
-from ruptura_zero.protocols.transformer import DataMergerProtocol
+from ruptura_zero.protocols.transformer import DataMergerProtocol, SchemaValidatorProtocol
+from ruptura_zero.transformer.validation_policy import ValidationPolicy
 from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.join_cardinality import JoinCardinality
 from ruptura_zero.utilities.merge_how_options import MergeHowOptions
 
+# Chaves e sufixos das junções de consolidação.
+RUPTURA_ESTOQUE_KEYS = ['mes', 'cliente_id', 'categoria_material']
+RUPTURA_ESTOQUE_SUFFIXES = ('_ruptura', '_estoque')
+VENDAS_KEYS = ['mes', 'cliente_id']
+VENDAS_SUFFIXES = ('_ruptura_estoque', '_vendas')
+
+# Agregação das medidas de vendas quando uma chave se repete; as demais colunas mantêm o primeiro valor.
+VENDAS_AGGREGATIONS = {'valor_volume_real': 'sum'}
+
+# Colunas removidas e renomeadas após a consolidação.
+CONSOLIDATED_DROPPED_COLUMNS = ['cod_mes', 'ano_ruptura_estoque', 'data_base_ruptura_estoque', 'descricao_cliente']
+CONSOLIDATED_RENAMED_COLUMNS = {'data_base_vendas': 'data_base', 'ano_vendas': 'ano'}
+
 
 class DataTransformingService:
     """Service for data transformation."""
@@ -32,18 +46,91 @@ class DataTransformingService:
     def __init__(self,
                  data_merger: DataMergerProtocol,
                  data_persistence: DataPersistenceProtocol,
-                 data_validation_schemas: pa.DataFrameSchema) -> None:
+                 data_validation_schemas: SchemaValidatorProtocol,
+                 join_cardinality: JoinCardinality = JoinCardinality.ALLOW,
+                 validation_policy: ValidationPolicy | None = None) -> None:
         """Initialize the data transformation service.
 
         Args:
             merger (DataMergerProtocol): The data merger protocol.
             data_persistence (DataPersistenceProtocol): The data persistence protocol.
             data_validation_schemas (list[dict]): The data validation schemas.
+            join_cardinality (JoinCardinality): What to do when the right side of a join repeats a key,
+                turning the join into a many-to-many one.
+            validation_policy (ValidationPolicy | None): Which rows of the consolidated data are validated.
+                Defaults to validating every row.
         """
 
         self.data_merger = data_merger
         self.data_persistence = data_persistence
         self.data_validation_schemas = data_validation_schemas
+        self.join_cardinality = join_cardinality
+        self.validation_policy = validation_policy or ValidationPolicy()
+
+    @staticmethod
+    def _aggregate_by_key(data: pd.DataFrame, keys: list[str], aggregations: dict) -> pd.DataFrame:
+        """Collapse the rows that share a join key into a single row.
+
+        Args:
+            data (pd.DataFrame): The right side of the join.
+            keys (list[str]): The join keys.
+            aggregations (dict): The aggregation of each measure column; other columns keep their first value.
+
+        Returns:
+            pd.DataFrame: One row per key, with the original column order.
+        """
+
+        specification = {column: aggregations.get(column, 'first') for column in data.columns if column not in keys}
+        aggregated = data.groupby(keys, observed=True, dropna=False, sort=False, as_index=False).agg(specification)
+
+        return aggregated[list(data.columns)]
+
+    def _enforce_join_cardinality(self,
+                                  data: pd.DataFrame,
+                                  keys: list[str],
+                                  name: str,
+                                  aggregations: dict | None = None) -> pd.DataFrame:
+        """Check that the right side of a join has one row per key, applying the configured policy.
+
+        Args:
+            data (pd.DataFrame): The right side of the join.
+            keys (list[str]): The join keys.
+            name (str): The name of the dataset, for the log messages.
+            aggregations (dict | None): The aggregation of each measure column, used by the aggregate policy.
+
+        Returns:
+            pd.DataFrame: The right side, with unique keys under the deduplicate and aggregate policies.
+        """
+
+        if self.join_cardinality == JoinCardinality.ALLOW:
+            return data
+
+        duplicated = data.duplicated(subset=keys)
+        repeated = int(duplicated.sum())
+        if repeated == 0:
+            logger.info(f'Junção com {name} é muitos-para-um nas chaves {keys}.')
+            return data
+
+        fan_out = int(data.groupby(keys, observed=True, dropna=False, sort=False).size().max())
+        # Só o lado direito é verificado: chaves repetidas nele multiplicam as linhas do lado esquerdo.
+        message = (f'Chaves repetidas em {name}: {repeated} linhas repetem as chaves {keys}, '
+                   f'com até {fan_out} linhas por chave.')
+
+        match self.join_cardinality:
+            case JoinCardinality.WARN:
+                logger.warning(message)
+                return data
+            case JoinCardinality.REJECT:
+                logger.error(message)
+                raise pd.errors.MergeError(message)
+            case JoinCardinality.DEDUPLICATE:
+                logger.warning(f'{message} Mantendo a primeira linha de cada chave.')
+                return data.loc[~duplicated]
+            case JoinCardinality.AGGREGATE:
+                logger.warning(f'{message} Agregando as linhas de cada chave.')
+                return self._aggregate_by_key(data, keys, aggregations or {})
+            case _:
+                raise ValueError(f"Política de cardinalidade desconhecida: '{self.join_cardinality}'")
 
     def _transforming(self, cleaned_data: Mapping[str, pd.DataFrame | None]) -> pd.DataFrame | None:
         """Transform the data for analysis.
@@ -65,13 +152,17 @@ class DataTransformingService:
             logger.error('Dados de entrada para a transformação estão faltando. Abortando.')
             return None
 
+        # Verifica a cardinalidade das chaves antes de cada junção.
+        estoque_data = self._enforce_join_cardinality(estoque_data, RUPTURA_ESTOQUE_KEYS, 'estoque')
+        vendas_data = self._enforce_join_cardinality(vendas_data, VENDAS_KEYS, 'vendas', VENDAS_AGGREGATIONS)
+
         # Consolida os dados de ruptura e estoque.
         ruptura_estoque_merged = self.data_merger.merge_data(data_frame_left=ruptura_data,
                                                              data_frame_right=estoque_data,
-                                                             left_key=['mes', 'cliente_id', 'categoria_material'],
-                                                             right_key=['mes', 'cliente_id', 'categoria_material'],
+                                                             left_key=RUPTURA_ESTOQUE_KEYS,
+                                                             right_key=RUPTURA_ESTOQUE_KEYS,
                                                              how=MergeHowOptions.INNER,
-                                                             suffixes=('_ruptura', '_estoque'))
+                                                             suffixes=RUPTURA_ESTOQUE_SUFFIXES)
         # Persistindo os dados consolidados.
         self.data_persistence.save_data(ruptura_estoque_merged,
                                         Cfg.PROCESSED_DATA.value / Cfg.RUPTURA_ESTOQUE_MERGED.value,
@@ -80,19 +171,15 @@ class DataTransformingService:
         # Consolida os dados de ruptura, estoque e vendas.
         ruptura_estoque_vendas_merged = self.data_merger.merge_data(data_frame_left=ruptura_estoque_merged,
                                                                     data_frame_right=vendas_data,
-                                                                    left_key=['mes', 'cliente_id'],
-                                                                    right_key=['mes', 'cliente_id'],
+                                                                    left_key=VENDAS_KEYS,
+                                                                    right_key=VENDAS_KEYS,
                                                                     how=MergeHowOptions.INNER,
-                                                                    suffixes=('_ruptura_estoque', '_vendas'))
+                                                                    suffixes=VENDAS_SUFFIXES)
 
         # Removendo colunas desnecessárias.
-        ruptura_estoque_vendas_merged = ruptura_estoque_vendas_merged.drop(columns=['cod_mes',
-                                                                                    'ano_ruptura_estoque',
-                                                                                    'data_base_ruptura_estoque',
-                                                                                    'descricao_cliente'])
+        ruptura_estoque_vendas_merged = ruptura_estoque_vendas_merged.drop(columns=CONSOLIDATED_DROPPED_COLUMNS)
         # Renomeando colunas para padronização.
-        ruptura_estoque_vendas_merged = ruptura_estoque_vendas_merged.rename(columns={'data_base_vendas': 'data_base',
-                                                                                      'ano_vendas': 'ano'})
+        ruptura_estoque_vendas_merged = ruptura_estoque_vendas_merged.rename(columns=CONSOLIDATED_RENAMED_COLUMNS)
 
         return ruptura_estoque_vendas_merged
 
@@ -111,7 +198,9 @@ class DataTransformingService:
             # Validando o esquema dos dados consolidados.
             expected_order = list(self.data_validation_schemas.columns.keys())
             ruptura_estoque_vendas_merged = data.loc[:, expected_order]
-            self.data_validation_schemas.validate(ruptura_estoque_vendas_merged, lazy=True)
+            self.validation_policy.validate('consolidado',
+                                            self.data_validation_schemas,
+                                            ruptura_estoque_vendas_merged)
 
             logger.success('Validação dos dados consolidados bem-sucedida.')
         except SchemaError as error:
@@ -141,3 +230,13 @@ class DataTransformingService:
         logger.success('Processo de transformação de dados concluído com sucesso.')
 
         return validated_data
+
+    def flush(self) -> None:
+        """Wait for the processed datasets to be written."""
+
+        self.data_persistence.flush()
+
+    def commit(self) -> None:
+        """Persist the state of the data loaded in this run."""
+
+        self.validation_policy.commit()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: duckdb_transforming_service.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from typing import Mapping
+
+import duckdb as db
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from ruptura_zero.protocols.data_persistence import DataPersistenceProtocol
+from ruptura_zero.protocols.transformer import SchemaValidatorProtocol
+from ruptura_zero.services.data_transforming_service import (CONSOLIDATED_DROPPED_COLUMNS,
+                                                             CONSOLIDATED_RENAMED_COLUMNS,
+                                                             RUPTURA_ESTOQUE_KEYS,
+                                                             RUPTURA_ESTOQUE_SUFFIXES,
+                                                             VENDAS_AGGREGATIONS,
+                                                             VENDAS_KEYS,
+                                                             VENDAS_SUFFIXES,
+                                                             DataTransformingService)
+from ruptura_zero.transformer.data_merge import DataMerger, align_categorical_keys
+from ruptura_zero.transformer.validation_policy import ValidationPolicy
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.join_cardinality import JoinCardinality
+
+# Coluna auxiliar com a posição original de cada linha, usada para reproduzir a ordem do pandas.
+ROW_ID_COLUMN = '__row_id'
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier."""
+
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _merged_columns(left_columns: list[str],
+                    right_columns: list[str],
+                    keys: list[str],
+                    suffixes: tuple[str, str]) -> list[tuple[str, str, str]]:
+    """Name the columns of an inner join on same-named keys as `pd.merge` does.
+
+    Args:
+        left_columns (list[str]): The columns of the left side.
+        right_columns (list[str]): The columns of the right side.
+        keys (list[str]): The columns to join on, present on both sides.
+        suffixes (tuple[str, str]): The suffixes to apply to overlapping column names.
+
+    Returns:
+        list[tuple[str, str, str]]: The side ('left' or 'right'), the source column and the output name
+            of each output column.
+    """
+
+    right_only = [column for column in right_columns if column not in keys]
+    overlap = set(left_columns).intersection(right_only)
+    left_suffix, right_suffix = suffixes
+
+    columns = [('left', column, f'{column}{left_suffix}' if column in overlap else column)
+               for column in left_columns]
+    columns += [('right', column, f'{column}{right_suffix}' if column in overlap else column)
+                for column in right_only]
+
+    return columns
+
+
+class DuckDBTransformingService(DataTransformingService):
+    """Transforming service that runs the consolidation joins inside DuckDB.
+
+    The cleaned frames are registered as Arrow tables and both inner joins, the column drop
+    and the renames run as a single query planned by DuckDB's parallel hash join. Key columns
+    are matched with `IS NOT DISTINCT FROM`, rows are ordered as `pd.merge` orders them and
+    categorical columns get back the categories pandas would give them, so the result is the
+    same frame produced by `DataTransformingService`.
+    """
+
+    def __init__(self,
+                 data_persistence: DataPersistenceProtocol,
+                 data_validation_schemas: SchemaValidatorProtocol,
+                 join_cardinality: JoinCardinality = JoinCardinality.ALLOW,
+                 validation_policy: ValidationPolicy | None = None) -> None:
+        """Initialize the DuckDB transforming service.
+
+        Args:
+            data_persistence (DataPersistenceProtocol): The data persistence protocol.
+            data_validation_schemas (SchemaValidatorProtocol): The schema of the consolidated data.
+            join_cardinality (JoinCardinality): What to do when the right side of a join repeats a key.
+            validation_policy (ValidationPolicy | None): Which rows of the consolidated data are validated.
+        """
+
+        super().__init__(DataMerger(),
+                         data_persistence,
+                         data_validation_schemas,
+                         join_cardinality,
+                         validation_policy)
+
+    @staticmethod
+    def _register(connection: db.DuckDBPyConnection, name: str, data: pd.DataFrame) -> None:
+        """Register a frame as an Arrow table, with its row positions in an extra column.
+
+        Categorical columns are registered as their integer codes, so strings are never
+        materialized by the joins.
+
+        Args:
+            connection (db.DuckDBPyConnection): The DuckDB connection.
+            name (str): The name of the view.
+            data (pd.DataFrame): The frame to register.
+        """
+
+        arrays = []
+        for column in data.columns:
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                arrays.append(pa.array(values.cat.codes.to_numpy()))
+            else:
+                arrays.append(pa.array(values, from_pandas=True))
+        arrays.append(pa.array(np.arange(len(data), dtype=np.int64)))
+
+        connection.register(name, pa.Table.from_arrays(arrays, names=[*data.columns, ROW_ID_COLUMN]))
+
+    @staticmethod
+    def _fetch(connection: db.DuckDBPyConnection, query: str, arrow_dtypes: bool = False) -> pd.DataFrame:
+        """Run a query and convert its Arrow result to pandas.
+
+        Args:
+            connection (db.DuckDBPyConnection): The DuckDB connection.
+            query (str): The query to run.
+            arrow_dtypes (bool): Whether to wrap the Arrow columns in `ArrowDtype` instead of converting them.
+
+        Returns:
+            pd.DataFrame: The result of the query.
+        """
+
+        result = connection.execute(query).arrow()
+        # Versões recentes do DuckDB retornam um leitor de lotes em vez de uma tabela.
+        if isinstance(result, pa.RecordBatchReader):
+            result = result.read_all()
+
+        if arrow_dtypes:
+            return result.to_pandas(types_mapper=pd.ArrowDtype)
+
+        return result.to_pandas(split_blocks=True, self_destruct=True)
+
+    @staticmethod
+    def _join_query(left: str, right: str, columns: list[tuple[str, str, str]], keys: list[str]) -> str:
+        """Build the SELECT of an inner join between two registered relations.
+
+        Args:
+            left (str): The name of the left relation.
+            right (str): The name of the right relation.
+            columns (list[tuple[str, str, str]]): The side, source column and output name of each column.
+            keys (list[str]): The columns to join on.
+
+        Returns:
+            str: The SQL query.
+        """
+
+        aliases = {'left': 'l', 'right': 'r'}
+        select = ', '.join(f'{aliases[side]}.{_quote(source)} AS {_quote(name)}' for side, source, name in columns)
+
+        # Assim como no pandas, chaves ausentes correspondem entre si.
+        on = ' AND '.join(f'l.{_quote(key)} IS NOT DISTINCT FROM r.{_quote(key)}' for key in keys)
+
+        return f'SELECT {select} FROM {_quote(left)} AS l JOIN {_quote(right)} AS r ON {on}'
+
+    @staticmethod
+    def _restore_dtypes(data: pd.DataFrame, registered_dtypes: dict, expected_dtypes: dict) -> pd.DataFrame:
+        """Decode the categorical codes fetched from DuckDB into the categories of the pandas merge.
+
+        Args:
+            data (pd.DataFrame): The frame fetched from DuckDB.
+            registered_dtypes (dict): The dtype each column had when its codes were registered.
+            expected_dtypes (dict): The dtype `pd.merge` gives each column.
+
+        Returns:
+            pd.DataFrame: The frame with the expected categorical dtypes.
+        """
+
+        for column in data.columns:
+            registered = registered_dtypes.get(column)
+            if not isinstance(registered, pd.CategoricalDtype):
+                continue
+
+            values = pd.Categorical.from_codes(data[column].to_numpy(), dtype=registered)
+            expected = expected_dtypes[column]
+            if expected != registered:
+                values = values.set_categories(expected.categories)
+            data[column] = values
+
+        return data
+
+    def _transforming(self, cleaned_data: Mapping[str, pd.DataFrame | None]) -> pd.DataFrame | None:
+        """Transform the data for analysis with a single DuckDB query.
+
+        Args:
+            cleaned_data (Mapping[str, pd.DataFrame | None]): The cleaned data.
+
+        Returns:
+            pd.DataFrame | None: The transformed data or None if transformation fails.
+        """
+
+        logger.info('Transformando os dados para análise com o DuckDB...')
+
+        ruptura_data = cleaned_data.get('ruptura_data')
+        estoque_data = cleaned_data.get('estoque_data')
+        vendas_data = cleaned_data.get('vendas_data')
+
+        if ruptura_data is None or estoque_data is None or vendas_data is None:
+            logger.error('Dados de entrada para a transformação estão faltando. Abortando.')
+            return None
+
+        # Verifica a cardinalidade das chaves antes de cada junção.
+        estoque_data = self._enforce_join_cardinality(estoque_data, RUPTURA_ESTOQUE_KEYS, 'estoque')
+        vendas_data = self._enforce_join_cardinality(vendas_data, VENDAS_KEYS, 'vendas', VENDAS_AGGREGATIONS)
+
+        # As categorias das chaves são unidas como no DataMerger, para que o resultado tenha os mesmos dtypes.
+        ruptura_data, estoque_data = align_categorical_keys(ruptura_data,
+                                                            estoque_data,
+                                                            RUPTURA_ESTOQUE_KEYS,
+                                                            RUPTURA_ESTOQUE_KEYS)
+        ruptura_estoque_columns = _merged_columns(list(ruptura_data.columns),
+                                                  list(estoque_data.columns),
+                                                  RUPTURA_ESTOQUE_KEYS,
+                                                  RUPTURA_ESTOQUE_SUFFIXES)
+        ruptura_estoque_dtypes = {name: (ruptura_data if side == 'left' else estoque_data)[source].dtype
+                                  for side, source, name in ruptura_estoque_columns}
+
+        # As três tabelas recebem as mesmas categorias nas chaves, para que os códigos sejam comparáveis.
+        ruptura_data, vendas_data = align_categorical_keys(ruptura_data,
+                                                           vendas_data,
+                                                           VENDAS_KEYS,
+                                                           VENDAS_KEYS)
+        estoque_data = estoque_data.assign(**{key: estoque_data[key].astype(ruptura_data[key].dtype)
+                                              for key in VENDAS_KEYS
+                                              if estoque_data[key].dtype != ruptura_data[key].dtype})
+        registered_dtypes = {name: (ruptura_data if side == 'left' else estoque_data)[source].dtype
+                             for side, source, name in ruptura_estoque_columns}
+
+        consolidated_columns = _merged_columns([name for _, _, name in ruptura_estoque_columns],
+                                               list(vendas_data.columns),
+                                               VENDAS_KEYS,
+                                               VENDAS_SUFFIXES)
+        consolidated_dtypes = {name: ruptura_estoque_dtypes[source] if side == 'left' else vendas_data[source].dtype
+                               for side, source, name in consolidated_columns}
+        consolidated_dtypes.update({key: ruptura_data[key].dtype for key in VENDAS_KEYS})
+        consolidated_registered_dtypes = {name: registered_dtypes[source] if side == 'left'
+                                          else vendas_data[source].dtype
+                                          for side, source, name in consolidated_columns}
+
+        # Remoção e renomeação das colunas, seguidas da ordem do esquema consolidado.
+        dropped = set(CONSOLIDATED_DROPPED_COLUMNS).difference(name for _, _, name in consolidated_columns)
+        if dropped:
+            raise KeyError(f'Colunas a remover não encontradas na consolidação: {sorted(dropped)}')
+        available = {CONSOLIDATED_RENAMED_COLUMNS.get(name, name): name
+                     for _, _, name in consolidated_columns if name not in CONSOLIDATED_DROPPED_COLUMNS}
+        expected_order = list(self.data_validation_schemas.columns.keys())
+        missing = [column for column in expected_order if column not in available]
+        if missing:
+            raise KeyError(f'Colunas do esquema consolidado ausentes: {missing}')
+
+        ruptura_row_id = f'ruptura{ROW_ID_COLUMN}'
+        estoque_row_id = f'estoque{ROW_ID_COLUMN}'
+        vendas_row_id = f'vendas{ROW_ID_COLUMN}'
+
+        # Dados limpos com o backend Arrow voltam do DuckDB sem conversão para NumPy.
+        arrow_dtypes = any(isinstance(dtype, pd.ArrowDtype) for dtype in consolidated_dtypes.values())
+
+        with db.connect() as connection:
+            self._register(connection, 'ruptura', ruptura_data)
+            self._register(connection, 'estoque', estoque_data)
+            self._register(connection, 'vendas', vendas_data)
+
+            ruptura_estoque_row_ids = [('left', ROW_ID_COLUMN, ruptura_row_id),
+                                       ('right', ROW_ID_COLUMN, estoque_row_id)]
+            ruptura_estoque_query = self._join_query('ruptura',
+                                                     'estoque',
+                                                     ruptura_estoque_columns + ruptura_estoque_row_ids,
+                                                     RUPTURA_ESTOQUE_KEYS)
+            # Materializada uma única vez, pois alimenta tanto a persistência quanto a segunda junção.
+            connection.execute(f'CREATE TEMP TABLE ruptura_estoque AS {ruptura_estoque_query}')
+
+            # Persistindo os dados consolidados de ruptura e estoque, na ordem produzida pelo pandas.
+            ruptura_estoque_merged = self._fetch(
+                connection,
+                f'SELECT * EXCLUDE ({_quote(ruptura_row_id)}, {_quote(estoque_row_id)}) FROM ruptura_estoque '
+                f'ORDER BY {_quote(ruptura_row_id)}, {_quote(estoque_row_id)}',
+                arrow_dtypes)
+            ruptura_estoque_merged = self._restore_dtypes(ruptura_estoque_merged,
+                                                          registered_dtypes,
+                                                          ruptura_estoque_dtypes)
+            self.data_persistence.save_data(ruptura_estoque_merged,
+                                            Cfg.PROCESSED_DATA.value / Cfg.RUPTURA_ESTOQUE_MERGED.value,
+                                            {'sep': ';', 'encoding': 'utf-8'})
+
+            # Junções, remoção e renomeação das colunas em uma única consulta.
+            consolidated_query = self._join_query('ruptura_estoque',
+                                                  'vendas',
+                                                  consolidated_columns + [('left', ruptura_row_id, ruptura_row_id),
+                                                                          ('left', estoque_row_id, estoque_row_id),
+                                                                          ('right', ROW_ID_COLUMN, vendas_row_id)],
+                                                  VENDAS_KEYS)
+            select = ', '.join(f'{_quote(available[column])} AS {_quote(column)}' for column in expected_order)
+            consolidated = self._fetch(
+                connection,
+                f'SELECT {select} FROM ({consolidated_query}) '
+                f'ORDER BY {_quote(ruptura_row_id)}, {_quote(estoque_row_id)}, {_quote(vendas_row_id)}',
+                arrow_dtypes)
+
+        return self._restore_dtypes(consolidated,
+                                    {column: consolidated_registered_dtypes[available[column]]
+                                     for column in expected_order},
+                                    {column: consolidated_dtypes[available[column]] for column in expected_order})
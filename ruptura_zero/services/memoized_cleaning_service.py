@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: memoized_cleaning_service.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import json
+from typing import Mapping
+
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.services.data_cleaning_service import DataCleaningService
+from ruptura_zero.utilities.fingerprint import frame_fingerprint, schema_fingerprint
+from ruptura_zero.utilities.memo_store import MemoStore
+
+
+class MemoizedCleaningService:
+    """Reuses the cleaned and validated sheets of previous runs whose inputs did not change.
+
+    Each extracted sheet is fingerprinted with its cleaning schema entry (including its Pandera
+    schema) and the options of the service; a sheet whose key is in the store is returned from
+    it, skipping its cleaning and validation entirely. Only the remaining sheets run through the
+    wrapped service, and their outputs are stored for the next runs.
+    """
+
+    def __init__(self, cleaning_service: DataCleaningService, store: MemoStore, options: dict | None = None) -> None:
+        """Initialize the MemoizedCleaningService.
+
+        Args:
+            cleaning_service (DataCleaningService): The service that cleans the sheets not found in the store.
+            store (MemoStore): The store of the cleaned sheets.
+            options (dict | None): The options that change the cleaned sheets (ex: the cleaner used),
+                which are part of every key.
+        """
+
+        self.cleaning_service = cleaning_service
+        self.store = store
+        self._options = json.dumps(options or {}, sort_keys=True, default=str)
+        self._schema_fingerprints = {schema['name']: schema_fingerprint(schema)
+                                     for schema in cleaning_service.data_cleaning_schemas}
+
+    def run(self, extracted_data: Mapping[str, pd.DataFrame | None]) -> Mapping[str, pd.DataFrame]:
+        """Clean and validate the extracted sheets not found in the store."""
+
+        profiler = self.cleaning_service.profiler
+        memoized_data, keys, missed_schemas = {}, {}, []
+        for schema in self.cleaning_service.data_cleaning_schemas:
+            data_frame = extracted_data.get(schema['data_attr'])
+            if data_frame is None:
+                # A planilha ausente segue para o serviço, que registra o erro.
+                missed_schemas.append(schema)
+                continue
+
+            # A chave é calculada antes da limpeza, que pode alterar o DataFrame extraído.
+            keys[schema['data_attr']] = self.store.key(frame_fingerprint(data_frame),
+                                                       self._schema_fingerprints[schema['name']],
+                                                       self._options)
+            with profiler.measure(schema['data_attr'], data_frame) as record:
+                entry = self.store.get(keys[schema['data_attr']])
+                memoized_frame = entry[0][schema['data_attr']] if entry is not None else None
+                if memoized_frame is not None:
+                    record.status = 'memoized'
+                    record.output = memoized_frame
+            if memoized_frame is not None:
+                logger.info(f'Dados de {schema["name"].lower()} inalterados, reutilizando a limpeza anterior.')
+                memoized_data[schema['data_attr']] = memoized_frame
+            else:
+                missed_schemas.append(schema)
+
+        cleaned_data = {}
+        if missed_schemas:
+            cleaned_data = self.cleaning_service.run(extracted_data, missed_schemas)
+            for data_attr, data_frame in cleaned_data.items():
+                self.store.put(keys[data_attr], {data_attr: data_frame})
+
+        self.store.log_statistics()
+
+        # Mantendo a ordem dos esquemas, como no serviço sem memoização.
+        return {schema['data_attr']: memoized_data.get(schema['data_attr'], cleaned_data.get(schema['data_attr']))
+                for schema in self.cleaning_service.data_cleaning_schemas
+                if schema['data_attr'] in memoized_data or schema['data_attr'] in cleaned_data}
+
+    def commit(self, loaded_data: pd.DataFrame | None = None) -> None:
+        """Persist the state of the rows loaded in this run."""
+
+        self.cleaning_service.commit(loaded_data)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: memoized_transforming_service.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import json
+from pathlib import Path
+from typing import Mapping
+
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.protocols.data_persistence import DataPersistenceProtocol
+from ruptura_zero.services.data_transforming_service import DataTransformingService
+from ruptura_zero.utilities.fingerprint import frame_fingerprint, schema_fingerprint
+from ruptura_zero.utilities.memo_store import MemoStore
+
+# Nome do DataFrame consolidado nas entradas da memoização.
+CONSOLIDATED_FRAME = 'consolidated'
+
+
+class RecordingDataPersistence:
+    """Records the DataFrames saved through a data persister, so they can be saved again later."""
+
+    def __init__(self, data_persistence: DataPersistenceProtocol) -> None:
+        """Initialize the RecordingDataPersistence.
+
+        Args:
+            data_persistence (DataPersistenceProtocol): The persister that writes the files.
+        """
+
+        self.data_persistence = data_persistence
+        self.saved: list[tuple[pd.DataFrame, Path, dict]] = []
+
+    def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
+        """Save a DataFrame through the wrapped persister, recording it."""
+
+        self.saved.append((data, Path(storage_path), options))
+        self.data_persistence.save_data(data, storage_path, options)
+
+    def flush(self) -> None:
+        """Wait for the files of the wrapped persister to be written."""
+
+        self.data_persistence.flush()
+
+
+class MemoizedTransformingService:
+    """Reuses the consolidated data of a previous run whose cleaned sheets did not change.
+
+    The key of a run hashes the fingerprint of every cleaned sheet, the consolidated schema and
+    the options of the service. An entry holds the consolidated data and every DataFrame the
+    service saved as a processed file; on a hit, the joins and the validation are skipped, and
+    the stored DataFrames are saved again through the current persister, so the processed files
+    always match the data that is loaded.
+    """
+
+    def __init__(self,
+                 transforming_service: DataTransformingService,
+                 store: MemoStore,
+                 options: dict | None = None) -> None:
+        """Initialize the MemoizedTransformingService.
+
+        Args:
+            transforming_service (DataTransformingService): The service that consolidates the data on a miss.
+            store (MemoStore): The store of the consolidated data.
+            options (dict | None): The options that change the consolidated data (ex: the merge engine),
+                which are part of every key.
+        """
+
+        self.transforming_service = transforming_service
+        self.store = store
+        self._options = json.dumps(options or {}, sort_keys=True, default=str)
+        self._schema_fingerprint = schema_fingerprint(transforming_service.data_validation_schemas)
+
+        # Os arquivos processados gravados pelo serviço são registrados para serem armazenados com a entrada.
+        self._recorder = RecordingDataPersistence(transforming_service.data_persistence)
+        transforming_service.data_persistence = self._recorder
+
+    def _store(self, key: str, transformed_data: pd.DataFrame) -> None:
+        """Store the consolidated data with the processed files saved in this run.
+
+        Args:
+            key (str): The key of the entry.
+            transformed_data (pd.DataFrame): The consolidated data.
+        """
+
+        data_frames = {CONSOLIDATED_FRAME: transformed_data}
+        processed_files = []
+        for position, (data, storage_path, options) in enumerate(self._recorder.saved):
+            # Os dados consolidados também são gravados como arquivo, mas armazenados uma única vez.
+            name = CONSOLIDATED_FRAME if data is transformed_data else f'processed_{position:03d}'
+            data_frames[name] = data
+            processed_files.append({'frame': name, 'storage_path': str(storage_path), 'options': options})
+
+        self.store.put(key, data_frames, {'processed_files': processed_files})
+
+    def _restore_processed_files(self, data_frames: dict[str, pd.DataFrame], metadata: dict) -> None:
+        """Save again the processed files of a stored entry.
+
+        Args:
+            data_frames (dict[str, pd.DataFrame]): The DataFrames of the entry.
+            metadata (dict): The metadata of the entry, listing the processed files.
+        """
+
+        for processed_file in metadata['processed_files']:
+            storage_path = Path(processed_file['storage_path'])
+            # O diretório dos dados processados pode ter sido removido desde a execução que gerou a entrada.
+            storage_path.parent.mkdir(parents=True, exist_ok=True)
+            self._recorder.data_persistence.save_data(data_frames[processed_file['frame']],
+                                                      storage_path,
+                                                      processed_file['options'])
+
+    def run(self, cleaned_data: Mapping[str, pd.DataFrame | None]) -> pd.DataFrame | None:
+        """Run the data transformation process, unless its output is already in the store."""
+
+        sheet_fingerprints = [f'{name}:{frame_fingerprint(data_frame) if data_frame is not None else None}'
+                              for name, data_frame in sorted(cleaned_data.items())]
+        key = self.store.key(*sheet_fingerprints, self._schema_fingerprint, self._options)
+
+        entry = self.store.get(key)
+        if entry is not None:
+            logger.info('Dados limpos inalterados, reutilizando a consolidação anterior.')
+            data_frames, metadata = entry
+            self._restore_processed_files(data_frames, metadata)
+            transformed_data = data_frames[CONSOLIDATED_FRAME]
+        else:
+            self._recorder.saved.clear()
+            transformed_data = self.transforming_service.run(cleaned_data)
+            if transformed_data is not None:
+                self._store(key, transformed_data)
+            self._recorder.saved.clear()
+
+        self.store.log_statistics()
+
+        return transformed_data
+
+    def flush(self) -> None:
+        """Wait for the processed datasets to be written."""
+
+        self.transforming_service.flush()
+
+    def commit(self) -> None:
+        """Persist the state of the data loaded in this run."""
+
+        self.transforming_service.commit()
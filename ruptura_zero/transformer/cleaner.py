@@ -13,12 +13,42 @@
 #  License: MIT
 # ------------------------------------------------------------------------------
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pandera.dtypes import DataType
+from pandera.engines.pandas_engine import Engine
+
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
 
 
 class DataCleaner:
     """Cleans and preprocesses data for analysis."""
 
+    def __init__(self, dtype_backend: DtypeBackend = DtypeBackend.NUMPY) -> None:
+        """Initialize the DataCleaner.
+
+        Args:
+            dtype_backend (DtypeBackend): The backend of the cleaned columns. With `arrow`, every
+                non-categorical column of the cleaned data is a pyarrow-backed `ArrowDtype`.
+        """
+
+        self.dtype_backend = DtypeBackend(dtype_backend)
+
+    def estimate_peak_bytes(self, column_bytes: pd.Series) -> int:
+        """Estimate the peak memory allocated while cleaning a frame, on top of the frame itself.
+
+        Every step works on a new copy of the frame, so the allocations reach about twice its size.
+
+        Args:
+            column_bytes (pd.Series): The memory used by each column of the extracted frame.
+
+        Returns:
+            int: The estimated peak of the additional allocations, in bytes.
+        """
+
+        return 2 * int(column_bytes.sum())
+
     def _normalize_numeric_columns(self, data: pd.DataFrame, numeric_columns: list) -> pd.DataFrame:
         """Normalize numeric columns by converting them to a consistent format.
 
@@ -95,6 +125,53 @@ class DataCleaner:
 
         return data
 
+    def _encode_categorical_columns(self, data: pd.DataFrame, categorical_columns: list) -> pd.DataFrame:
+        """Encode low-cardinality string columns as pandas Categorical.
+
+        Args:
+            data (pd.DataFrame): The data to encode categorical columns for.
+            categorical_columns (list): The names of the categorical columns to encode.
+
+        Returns:
+            pd.DataFrame: The data with categorical columns encoded as integer codes plus categories.
+        """
+
+        for column in categorical_columns:
+            data[column] = data[column].astype('category')
+
+        return data
+
+    def _convert_to_arrow_dtypes(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Convert the non-categorical columns to pyarrow-backed dtypes.
+
+        Args:
+            data (pd.DataFrame): The data to convert.
+
+        Returns:
+            pd.DataFrame: The data with `ArrowDtype` columns.
+        """
+
+        for column in data.columns:
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                continue
+
+            if isinstance(values.dtype, pd.ArrowDtype):
+                # `pd.to_numeric` sobre texto Arrow devolve NaN, e não nulo, para valores inválidos.
+                if pa.types.is_floating(values.dtype.pyarrow_dtype):
+                    is_nan = np.isnan(values.to_numpy(dtype=np.float64, na_value=np.nan))
+                    if is_nan.any():
+                        data[column] = values.mask(is_nan)
+                continue
+
+            try:
+                data[column] = pd.arrays.ArrowExtensionArray(pa.array(values, from_pandas=True))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Colunas com tipos misturados continuam como object.
+                continue
+
+        return data
+
     def _remove_duplicates(self, data: pd.DataFrame) -> pd.DataFrame:
         """Remove duplicate rows from the data.
 
@@ -107,37 +184,151 @@ class DataCleaner:
 
         return data.drop_duplicates()
 
-    def _fill_missing_values(self, data: pd.DataFrame, strategy: str = "mode") -> pd.DataFrame:
-        """Fill missing values in the data.
+    @staticmethod
+    def _column_mode(column: pd.Series) -> object:
+        """Compute the mode of a single column with a hash-based value count.
+
+        Ties are resolved as in `pd.DataFrame.mode`, which returns the smallest of the modes.
 
         Args:
-            data (pd.DataFrame): The data to fill missing values in.
-            strategy (str, optional): The strategy to use for filling missing values.
-                Options are "mean", "median", or "mode". Defaults to "mean".
+            column (pd.Series): The column to compute the mode for.
 
         Returns:
-            pd.DataFrame: The cleaned data with missing values filled.
+            object: The mode of the column, or None if the column has no values.
         """
 
+        counts = column.value_counts(dropna=True, sort=False)
+        counts = counts[counts > 0]
+        if counts.empty:
+            return None
+
+        modes = counts.index[counts.to_numpy() == counts.max()]
+        if len(modes) == 1:
+            return modes[0]
+
+        # Em caso de empate, o próprio pandas ordena os poucos candidatos.
+        return pd.Series(modes).mode().iloc[0]
+
+    def _column_fill_value(self, column: pd.Series, strategy: str) -> object:
+        """Compute the value used to fill the missing values of a single column.
+
+        Args:
+            column (pd.Series): The column to compute the fill value for.
+            strategy (str): The strategy to use. Options are "mean", "median", or "mode".
+
+        Returns:
+            object: The fill value, or None if the strategy does not apply to the column.
+        """
+
+        if not column.notna().any():
+            return None
+
         match strategy:
-            case "mean":
-                data = data.fillna(data.mean(numeric_only=True))
-            case "median":
-                data = data.fillna(
-                    data.median(numeric_only=True))
+            case "mean" | "median":
+                # Assim como `numeric_only=True`, colunas não numéricas não são preenchidas.
+                if not pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+                    return None
+                return column.mean() if strategy == "mean" else column.median()
             case "mode":
-                data = data.fillna(data.mode().iloc[0])
+                return self._column_mode(column)
             case _:
                 raise ValueError(f"Estratégia de preenchimento desconhecida: '{strategy}'")
 
+    def _missing_fill_values(self,
+                             data: pd.DataFrame,
+                             strategy: str,
+                             column_strategies: dict | None) -> dict:
+        """Compute the fill values of the columns that contain missing values.
+
+        Args:
+            data (pd.DataFrame): The data to fill missing values in.
+            strategy (str): The default strategy for filling missing values.
+            column_strategies (dict | None): Strategies declared per column, overriding the default.
+
+        Returns:
+            dict: The fill value of each column with missing values.
+        """
+
+        column_strategies = column_strategies or {}
+        for column_strategy in {strategy, *column_strategies.values()}:
+            if column_strategy not in ("mean", "median", "mode"):
+                raise ValueError(f"Estratégia de preenchimento desconhecida: '{column_strategy}'")
+
+        # Estatísticas são calculadas apenas para as colunas que de fato têm valores ausentes.
+        columns_with_nulls = data.columns[data.isna().any().to_numpy()]
+
+        fill_values = {}
+        for column in columns_with_nulls:
+            value = self._column_fill_value(data[column], column_strategies.get(column, strategy))
+            if value is not None:
+                fill_values[column] = value
+
+        return fill_values
+
+    def _fill_missing_values(self,
+                             data: pd.DataFrame,
+                             strategy: str = "mode",
+                             column_strategies: dict | None = None) -> pd.DataFrame:
+        """Fill missing values in the data.
+
+        Args:
+            data (pd.DataFrame): The data to fill missing values in.
+            strategy (str, optional): The strategy to use for filling missing values.
+                Options are "mean", "median", or "mode". Defaults to "mode".
+            column_strategies (dict | None, optional): Strategies declared per column,
+                overriding `strategy` (ex: {'ddv': 'median'}). Defaults to None.
+
+        Returns:
+            pd.DataFrame: The cleaned data with missing values filled.
+        """
+
+        fill_values = self._missing_fill_values(data, strategy, column_strategies)
+        if fill_values:
+            data = data.fillna(fill_values)
+
+        return data
+
+    def _enforce_dtypes(self, data: pd.DataFrame, dtypes: dict[str, DataType]) -> pd.DataFrame:
+        """Cast the columns to their declared dtypes, skipping the ones that already have them.
+
+        Args:
+            data (pd.DataFrame): The data to cast.
+            dtypes (dict[str, DataType]): The Pandera dtype declared for each column.
+
+        Returns:
+            pd.DataFrame: The data with the declared dtypes.
+        """
+
+        for column, dtype in dtypes.items():
+            if column not in data.columns:
+                continue
+
+            values = data[column]
+            if str(dtype) == 'str':
+                # Texto fica em colunas object: basta confirmar que todos os valores já são strings.
+                if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+                    continue
+            elif dtype.check(Engine.dtype(values.dtype)):
+                continue
+
+            # A conversão do próprio Pandera mantém o resultado idêntico ao de `coerce=True`.
+            data[column] = dtype.try_coerce(values)
+
         return data
 
-    def clean(self, data: pd.DataFrame, column_types: dict) -> pd.DataFrame:
+    def clean(self,
+              data: pd.DataFrame,
+              column_types: dict,
+              fill_strategies: dict | None = None,
+              dtypes: dict[str, DataType] | None = None) -> pd.DataFrame:
         """Perform all cleaning steps.
 
         Args:
             data (pd.DataFrame): The data to clean.
             column_types (dict): The expected column types.
+            fill_strategies (dict | None): The missing-value strategy of each column, if not "mode".
+            dtypes (dict[str, DataType] | None): The final dtype of each column, if the cleaned
+                data must already have the types declared by its validation schema.
 
         Returns:
             pd.DataFrame: The cleaned data.
@@ -150,8 +341,9 @@ class DataCleaner:
         month_code_columns = [column for column, dtype in column_types.items() if dtype == 'month_code']
         data = self._normalize_month_code_columns(data, month_code_columns)
 
-        # Normaliza as colunas numéricas.
-        numeric_columns = [column for column, dtype in column_types.items() if dtype == 'integer']
+        # Normaliza as colunas numéricas, inclusive as datas-base YYYYMM, que chegam como texto de alguns extratores.
+        numeric_columns = [column for column, dtype in column_types.items()
+                           if dtype in ('integer', 'float', 'data-base')]
         data = self._normalize_numeric_columns(data, numeric_columns)
 
         # Normaliza as colunas monetárias.
@@ -162,10 +354,22 @@ class DataCleaner:
         percent_columns = [column for column, dtype in column_types.items() if dtype == 'percent']
         data = self._normalize_percent_columns(data, percent_columns)
 
+        # Codifica as colunas categóricas.
+        categorical_columns = [column for column, dtype in column_types.items() if dtype == 'category']
+        data = self._encode_categorical_columns(data, categorical_columns)
+
+        # Converte as colunas para o backend Arrow antes de remover duplicados e preencher ausentes.
+        if self.dtype_backend == DtypeBackend.ARROW:
+            data = self._convert_to_arrow_dtypes(data)
+
         # Remove valores duplicados.
         data = self._remove_duplicates(data)
 
         # Preenche valores ausentes.
-        data = self._fill_missing_values(data)
+        data = self._fill_missing_values(data, column_strategies=fill_strategies)
+
+        # Emite os tipos finais, dispensando a coerção na validação.
+        if dtypes:
+            data = self._enforce_dtypes(data, dtypes)
 
         return data
@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: compiled_schema_validator.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import operator
+
+import numpy as np
+import pandas as pd
+import pandera.pandas as pa
+from loguru import logger
+from pandera.engines.pandas_engine import Engine
+from pandera.errors import SchemaError, SchemaErrorReason, SchemaErrors
+
+# Verificações nativas do Pandera que o validador compilado sabe avaliar.
+SUPPORTED_CHECKS = {'greater_than_or_equal_to', 'greater_than', 'less_than_or_equal_to', 'less_than',
+                    'equal_to', 'not_equal_to', 'in_range', 'isin', 'notin', 'str_length'}
+
+COMPARISONS = {'greater_than_or_equal_to': (operator.ge, 'min_value'),
+               'greater_than': (operator.gt, 'min_value'),
+               'less_than_or_equal_to': (operator.le, 'max_value'),
+               'less_than': (operator.lt, 'max_value'),
+               'equal_to': (operator.eq, 'value'),
+               'not_equal_to': (operator.ne, 'value')}
+
+
+def _check_mask(check: pa.Check, values: pd.Series) -> np.ndarray:
+    """Evaluate a built-in Pandera check as a boolean mask over non-null values.
+
+    Args:
+        check (pa.Check): The check to evaluate.
+        values (pd.Series): The values to check.
+
+    Returns:
+        np.ndarray: Whether each value passes the check.
+    """
+
+    statistics = check.statistics
+    match check.name:
+        case 'in_range':
+            lower = operator.ge if statistics['include_min'] else operator.gt
+            upper = operator.le if statistics['include_max'] else operator.lt
+            mask = lower(values, statistics['min_value']) & upper(values, statistics['max_value'])
+        case 'isin':
+            mask = values.isin(list(statistics['allowed_values']))
+        case 'notin':
+            mask = ~values.isin(list(statistics['forbidden_values']))
+        case 'str_length':
+            lengths = values.str.len()
+            if statistics['exact_value'] is not None:
+                mask = lengths == statistics['exact_value']
+            else:
+                mask = pd.Series(True, index=values.index)
+                if statistics['min_value'] is not None:
+                    mask &= lengths >= statistics['min_value']
+                if statistics['max_value'] is not None:
+                    mask &= lengths <= statistics['max_value']
+        case _:
+            comparison, statistic = COMPARISONS[check.name]
+            mask = comparison(values, statistics[statistic])
+
+    return np.asarray(mask, dtype=bool)
+
+
+class CompiledSchemaValidator:
+    """Validates a DataFrame against a Pandera schema in one vectorized pass per column.
+
+    The schema is compiled once: column presence, order, dtype, nullability and the built-in
+    checks (comparisons, `in_range`, `isin`, `notin`, `str_length`) of each column are evaluated
+    with NumPy masks that share the column's null mask. Categorical columns are checked on their
+    categories only and the result is mapped to the rows through the codes, and string columns
+    are type-checked with `infer_dtype` instead of a Python call per value. Failures are reported
+    as the same `SchemaError`/`SchemaErrors` Pandera raises, with the same `failure_cases`.
+    Schemas using features outside this set (coercion, custom checks, index or dataframe-level
+    checks) are validated by Pandera itself.
+    """
+
+    def __init__(self, schema: pa.DataFrameSchema) -> None:
+        """Initialize the CompiledSchemaValidator.
+
+        Args:
+            schema (pa.DataFrameSchema): The schema to compile.
+        """
+
+        self.schema = schema
+        self.compiled = self._is_supported(schema)
+
+        if not self.compiled:
+            logger.info('Esquema com recursos não suportados pelo validador compilado, usando o Pandera.')
+
+    @property
+    def columns(self) -> dict:
+        """The column schemas, as in `pa.DataFrameSchema.columns`."""
+
+        return self.schema.columns
+
+    @staticmethod
+    def _is_supported(schema: pa.DataFrameSchema) -> bool:
+        """Whether every rule of the schema can be evaluated by the compiled validator."""
+
+        if (schema.coerce or schema.index is not None or schema.checks or schema.parsers or schema.unique
+                or schema.strict not in (True, False) or schema.add_missing_columns or schema.drop_invalid_rows):
+            return False
+
+        for column in schema.columns.values():
+            if column.coerce or column.unique or column.regex or column.parsers or column.dtype is None:
+                return False
+            for check in column.checks:
+                if (check.name not in SUPPORTED_CHECKS or not check.ignore_na or check.raise_warning
+                        or check.groupby is not None or check.element_wise):
+                    return False
+
+        return True
+
+    @staticmethod
+    def _failure_cases(values: pd.Series) -> pd.DataFrame:
+        """Reshape the failing values of a column into Pandera's failure case frame."""
+
+        return pd.DataFrame({'index': values.index, 'failure_case': values.to_numpy(dtype=object)})
+
+    def _structure_errors(self, data: pd.DataFrame) -> list[SchemaError]:
+        """Check the presence and order of the columns.
+
+        Args:
+            data (pd.DataFrame): The data to validate.
+
+        Returns:
+            list[SchemaError]: The errors found.
+        """
+
+        errors = []
+        for column in data.columns:
+            if self.schema.strict and column not in self.schema.columns:
+                errors.append(SchemaError(self.schema, data, f"column '{column}' not in DataFrameSchema {{}}",
+                                          failure_cases=column,
+                                          check='column_in_schema',
+                                          reason_code=SchemaErrorReason.COLUMN_NOT_IN_SCHEMA))
+
+        for name, column in self.schema.columns.items():
+            if column.required and name not in data.columns:
+                errors.append(SchemaError(self.schema, data, f"column '{name}' not in dataframe",
+                                          failure_cases=name,
+                                          check='column_in_dataframe',
+                                          reason_code=SchemaErrorReason.COLUMN_NOT_IN_DATAFRAME))
+
+        if self.schema.ordered:
+            present = [column for column in data.columns if column in self.schema.columns]
+            expected = [column for column in self.schema.columns if column in present]
+            for column, expected_column in zip(present, expected):
+                if column != expected_column:
+                    errors.append(SchemaError(self.schema, data, f"column '{column}' out-of-order",
+                                              failure_cases=column,
+                                              check='column_ordered',
+                                              reason_code=SchemaErrorReason.COLUMN_NOT_ORDERED))
+
+        return errors
+
+    @staticmethod
+    def _dtype_passes(column: pa.Column, values: pd.Series) -> bool:
+        """Check the dtype of a column, without a Python call per value for string columns."""
+
+        if str(column.dtype) == 'str' and values.dtype == object:
+            # Texto em coluna object: o Pandera testaria `isinstance(valor, str)` linha a linha.
+            return pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+        result = column.dtype.check(Engine.dtype(values.dtype), values)
+
+        return bool(result) if isinstance(result, bool) else bool(np.all(result))
+
+    def _column_errors(self, column: pa.Column, values: pd.Series) -> list[SchemaError]:
+        """Check the dtype, the nulls and the checks of a single column.
+
+        Args:
+            column (pa.Column): The column schema.
+            values (pd.Series): The column values.
+
+        Returns:
+            list[SchemaError]: The errors found.
+        """
+
+        errors = []
+        if not self._dtype_passes(column, values):
+            failure_cases = str(values.dtype)
+            if str(column.dtype) == 'str' and values.dtype == object:
+                # Assim como o Pandera, aponta os valores que não são texto.
+                is_text = values.map(lambda value: isinstance(value, str) or pd.isna(value)).to_numpy(dtype=bool)
+                failure_cases = self._failure_cases(values[~is_text])
+            errors.append(SchemaError(column, None,
+                                      f"expected series '{column.name}' to have type {column.dtype}, "
+                                      f"got {values.dtype}",
+                                      failure_cases=failure_cases,
+                                      check=f"dtype('{column.dtype}')",
+                                      reason_code=SchemaErrorReason.WRONG_DATATYPE,
+                                      column_name=column.name))
+
+        is_categorical = isinstance(values.dtype, pd.CategoricalDtype)
+        if is_categorical:
+            codes = values.cat.codes.to_numpy()
+            is_null = codes == -1
+        else:
+            is_null = values.isna().to_numpy()
+
+        # A máscara de nulos é calculada uma vez e serve à nulidade e a todas as verificações.
+        has_nulls = bool(is_null.any())
+        if has_nulls and not column.nullable:
+            errors.append(SchemaError(column, None, f"non-nullable series '{column.name}' contains null values",
+                                      failure_cases=self._failure_cases(values[is_null]),
+                                      check='not_nullable',
+                                      reason_code=SchemaErrorReason.SERIES_CONTAINS_NULLS,
+                                      column_name=column.name))
+
+        if not column.checks:
+            return errors
+
+        if is_categorical:
+            # As verificações rodam sobre as poucas categorias e são mapeadas para as linhas pelos códigos.
+            categories = pd.Series(values.cat.categories)
+            category_masks = [_check_mask(check, categories) for check in column.checks]
+            if all(mask.all() for mask in category_masks):
+                return errors
+            row_masks = [np.append(mask, True)[codes] for mask in category_masks]
+        else:
+            non_null = values[~is_null] if has_nulls else values
+            row_masks = []
+            for check in column.checks:
+                mask = np.ones(len(values), dtype=bool)
+                mask[~is_null] = _check_mask(check, non_null)
+                row_masks.append(mask)
+
+        for check_index, (check, passed) in enumerate(zip(column.checks, row_masks)):
+            if passed.all():
+                continue
+
+            failures = values[~passed]
+            failure_cases = self._failure_cases(failures)
+            errors.append(SchemaError(column, None,
+                                      f"Column '{column.name}' failed element-wise validator number {check_index}: "
+                                      f"{check} failure cases: {', '.join(map(str, failures.tolist()))}",
+                                      failure_cases=failure_cases,
+                                      check=check,
+                                      check_index=check_index,
+                                      check_output=pd.Series(passed, index=values.index),
+                                      reason_code=SchemaErrorReason.DATAFRAME_CHECK,
+                                      column_name=column.name))
+
+        return errors
+
+    def validate(self, check_obj: pd.DataFrame, lazy: bool = False) -> pd.DataFrame:
+        """Validate the DataFrame against the compiled schema.
+
+        Args:
+            check_obj (pd.DataFrame): The data to validate.
+            lazy (bool): Whether to collect every error into a `SchemaErrors` instead of
+                raising the first `SchemaError`.
+
+        Returns:
+            pd.DataFrame: The validated data.
+        """
+
+        if not self.compiled:
+            return self.schema.validate(check_obj, lazy=lazy)
+
+        errors = self._structure_errors(check_obj)
+        if errors and not lazy:
+            raise errors[0]
+
+        for name, column in self.schema.columns.items():
+            if name not in check_obj.columns:
+                continue
+
+            errors += self._column_errors(column, check_obj[name])
+            if errors and not lazy:
+                raise errors[0]
+
+        if errors:
+            raise SchemaErrors(self.schema, errors, check_obj)
+
+        return check_obj
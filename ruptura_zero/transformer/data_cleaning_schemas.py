@@ -18,10 +18,16 @@ from ruptura_zero.transformer.pandera_schemas import (ESTOQUE_SCHEMA,
                                                       VENDAS_SCHEMA)
 from ruptura_zero.utilities.configurations import Config as Cfg
 
+# Cada esquema pode declarar a chave opcional 'fill_strategies' (ex: {'ddv': 'median'}),
+# definindo a estratégia de preenchimento de valores ausentes por coluna; o padrão é 'mode'.
+# Em cargas incrementais, apenas as linhas novas dos esquemas com 'incremental' são processadas;
+# as demais planilhas são tabelas de consulta e entram inteiras nas junções. A chave 'consolidated_keys'
+# lista as colunas de junção que identificam, nos dados carregados, as linhas vindas da planilha.
 DATA_CLEANING_SCHEMAS = [
     {
         'name': Cfg.SHEET_RUPTURA.value,
         'data_attr': 'ruptura_data',
+        'incremental': True,
         'columns': {
             'DT_MES': 'data_base',
             'COD_CLIENTE': 'cliente_id',
@@ -34,9 +40,9 @@ DATA_CLEANING_SCHEMAS = [
         },
         'types': {
             'data_base': 'data-base',
-            'cliente_id': 'string',
+            'cliente_id': 'category',
             'descricao_cliente': 'string',
-            'categoria_material': 'string',
+            'categoria_material': 'category',
             'valor_ruptura': 'monetary',
             'valor_pedido': 'monetary',
             'volume_ruptura_und': 'integer',
@@ -44,7 +50,8 @@ DATA_CLEANING_SCHEMAS = [
             'ano': 'integer',
             'mes': 'integer'
         },
-        'pandera_schema': RUPTURA_SCHEMA
+        'pandera_schema': RUPTURA_SCHEMA,
+        'consolidated_keys': ['mes', 'cliente_id', 'categoria_material']
     },
     {
         'name': Cfg.SHEET_ESTOQUE.value,
@@ -62,13 +69,13 @@ DATA_CLEANING_SCHEMAS = [
         },
         'types': {
             'cod_mes': 'month_code',
-            'cliente_id': 'string',
-            'nome_cliente': 'string',
-            'categoria_material': 'string',
+            'cliente_id': 'category',
+            'nome_cliente': 'category',
+            'categoria_material': 'category',
             'estoque': 'integer',
             'ddv': 'float',
             'cobertura_dias': 'integer',
-            'tipo_cliente': 'string',
+            'tipo_cliente': 'category',
             'contato_cliente': 'string'
         },
         'pandera_schema': ESTOQUE_SCHEMA
@@ -86,11 +93,11 @@ DATA_CLEANING_SCHEMAS = [
         },
         'types': {
             'data_base': 'data-base',
-            'cliente_id': 'string',
-            'valor_volume_real': 'string',
-            'cidade': 'string',
-            'uf': 'string',
-            'pais': 'string',
+            'cliente_id': 'category',
+            'valor_volume_real': 'integer',
+            'cidade': 'category',
+            'uf': 'category',
+            'pais': 'category',
             'ano': 'integer',
             'mes': 'integer'
         },
@@ -19,6 +19,51 @@ from loguru import logger
 from ruptura_zero.utilities.merge_how_options import MergeHowOptions
 
 
+def align_categorical_keys(data_frame_left: pd.DataFrame,
+                           data_frame_right: pd.DataFrame,
+                           left_key: list[str],
+                           right_key: list[str]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Give categorical join keys the same categories on both sides.
+
+    With identical categories, pandas joins on the integer codes and the key columns
+    stay categorical in the result instead of being decoded to strings.
+
+    Args:
+        data_frame_left (pd.DataFrame): The left DataFrame to merge.
+        data_frame_right (pd.DataFrame): The right DataFrame to merge.
+        left_key (list[str]): The columns to join on from the left DataFrame.
+        right_key (list[str]): The columns to join on from the right DataFrame.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: The DataFrames with aligned categorical keys.
+    """
+
+    left_updates, right_updates = {}, {}
+    for left_column, right_column in zip(left_key, right_key):
+        left_values = data_frame_left[left_column]
+        right_values = data_frame_right[right_column]
+        if not (isinstance(left_values.dtype, pd.CategoricalDtype)
+                or isinstance(right_values.dtype, pd.CategoricalDtype)):
+            continue
+
+        left_values = left_values.astype('category')
+        right_values = right_values.astype('category')
+        if left_values.dtype == right_values.dtype:
+            continue
+
+        categories = left_values.cat.categories.union(right_values.cat.categories)
+        left_updates[left_column] = left_values.cat.set_categories(categories)
+        right_updates[right_column] = right_values.cat.set_categories(categories)
+
+    # `assign` troca apenas as colunas de chave, sem copiar as demais.
+    if left_updates:
+        data_frame_left = data_frame_left.assign(**left_updates)
+    if right_updates:
+        data_frame_right = data_frame_right.assign(**right_updates)
+
+    return data_frame_left, data_frame_right
+
+
 class DataMerger:
     """Class to merge different datasets for analysis."""
 
@@ -50,6 +95,11 @@ class DataMerger:
         logger.info(f'Tipo de merge: {how.value}')
         logger.info(f'Sufixos aplicados: {suffixes}')
 
+        data_frame_left, data_frame_right = align_categorical_keys(data_frame_left,
+                                                                   data_frame_right,
+                                                                   left_key,
+                                                                   right_key)
+
         return pd.merge(data_frame_left,
                         data_frame_right,
                         left_on=left_key,
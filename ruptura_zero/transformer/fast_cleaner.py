@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: fast_cleaner.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandera.dtypes import DataType
+
+from ruptura_zero.transformer.cleaner import DataCleaner
+from ruptura_zero.utilities.dtype_backend import DtypeBackend
+
+# Valores que o pandas converteria para float sem ambiguidade (ex: "1234.56", "-0.5").
+PLAIN_DECIMAL_PATTERN = r'^\s*[+-]?(\d+\.?\d*|\.\d+)\s*$'
+
+
+class FastDataCleaner(DataCleaner):
+    """Vectorized fast path of DataCleaner, with output identical to `DataCleaner.clean`.
+
+    Currency strings are normalized with Arrow compute kernels and YYYYMM dates are split
+    with NumPy integer arithmetic. Values outside the fast path are delegated to the same
+    pandas routines used by DataCleaner.
+    """
+
+    def __init__(self, dtype_backend: DtypeBackend = DtypeBackend.NUMPY) -> None:
+        """Initialize the FastDataCleaner.
+
+        Args:
+            dtype_backend (DtypeBackend): The backend of the cleaned columns.
+        """
+
+        super().__init__(dtype_backend)
+        self._year_and_month_as_integer = False
+
+    def estimate_peak_bytes(self, column_bytes: pd.Series) -> int:
+        """Estimate the peak memory allocated while cleaning a frame, on top of the frame itself.
+
+        Each column is converted once into a new array, so the allocations reach about the size of the frame.
+
+        Args:
+            column_bytes (pd.Series): The memory used by each column of the extracted frame.
+
+        Returns:
+            int: The estimated peak of the additional allocations, in bytes.
+        """
+
+        return int(column_bytes.sum())
+
+    def _normalize_monetary_column(self, column: pd.Series) -> pd.Series:
+        """Convert a Brazilian currency column (ex: "R$ 1.234,56") to float with Arrow kernels.
+
+        Args:
+            column (pd.Series): The column to convert.
+
+        Returns:
+            pd.Series: The converted column.
+        """
+
+        # Colunas com valores que não são texto seguem o caminho original do pandas.
+        if pd.api.types.infer_dtype(column, skipna=True) != 'string':
+            return super()._normalize_monetary_columns(column.to_frame(), [column.name])[column.name]
+
+        values = pa.array(column, type=pa.string(), from_pandas=True)
+        # Substituições literais nos buffers Arrow, sem criar objetos Python intermediários.
+        normalized = pc.replace_substring(values, 'R$', '')
+        normalized = pc.replace_substring(normalized, '.', '')
+        normalized = pc.replace_substring(normalized, ',', '.')
+        plain_decimal = pc.fill_null(pc.match_substring_regex(normalized, PLAIN_DECIMAL_PATTERN), False)
+
+        # O pandas devolve inteiros quando nenhum valor tem casa decimal: mantemos esse comportamento.
+        has_decimal_point = pc.any(pc.match_substring(normalized, '.')).as_py()
+        if not has_decimal_point and pc.all(plain_decimal).as_py():
+            return pd.to_numeric(normalized.to_pandas(), errors='coerce').set_axis(column.index)
+
+        numbers = pc.cast(pc.utf8_trim_whitespace(pc.if_else(plain_decimal, normalized, None)), pa.float64())
+        result = numbers.to_numpy(zero_copy_only=False)
+
+        # Valores fora do padrão (ex: "R$ -") são convertidos individualmente pelo pandas.
+        irregular = ~plain_decimal.to_numpy(zero_copy_only=False) & column.notna().to_numpy()
+        if irregular.any():
+            irregular_values = pd.Series(normalized.filter(pa.array(irregular)).to_pylist(), dtype=object)
+            result[irregular] = pd.to_numeric(irregular_values, errors='coerce').to_numpy(dtype=np.float64)
+
+        return pd.Series(result, index=column.index, name=column.name)
+
+    def _normalize_monetary_columns(self, data: pd.DataFrame, monetary_columns: list) -> pd.DataFrame:
+        """Normalize monetary columns by removing currency symbols and converting to numeric.
+
+        Args:
+            data (pd.DataFrame): The data to normalize monetary columns for.
+            monetary_columns (list): The names of the columns to normalize.
+
+        Returns:
+            pd.DataFrame: The data with normalized monetary columns.
+        """
+
+        for column in monetary_columns:
+            data[column] = self._normalize_monetary_column(data[column])
+
+        return data
+
+    def _extract_year_and_month(self, data: pd.DataFrame, date_columns: list) -> pd.DataFrame:
+        """Extract year and month from YYYYMM date columns using integer arithmetic."""
+
+        for column in date_columns:
+            values = data[column]
+            is_yyyymm = (self._year_and_month_as_integer
+                         and pd.api.types.is_integer_dtype(values)
+                         and bool(values.between(100000, 999999).all()))
+            if not is_yyyymm:
+                return super()._extract_year_and_month(data, date_columns)
+
+            if isinstance(values.dtype, pd.ArrowDtype):
+                # O pandas não implementa o resto da divisão para inteiros Arrow.
+                values = pd.Series(values.to_numpy(dtype=np.int64), index=values.index)
+
+            data['ano'] = values // 100
+            data['mes'] = values % 100
+
+        return data
+
+    def clean(self,
+              data: pd.DataFrame,
+              column_types: dict,
+              fill_strategies: dict | None = None,
+              dtypes: dict[str, DataType] | None = None) -> pd.DataFrame:
+        """Perform all cleaning steps.
+
+        Args:
+            data (pd.DataFrame): The data to clean.
+            column_types (dict): The expected column types.
+            fill_strategies (dict | None): The missing-value strategy of each column, if not "mode".
+            dtypes (dict[str, DataType] | None): The final dtype of each column, if any.
+
+        Returns:
+            pd.DataFrame: The cleaned data.
+        """
+
+        # Ano e mês só podem ser gerados como inteiros quando seriam convertidos para inteiros depois.
+        self._year_and_month_as_integer = column_types.get('ano') == column_types.get('mes') == 'integer'
+
+        return super().clean(data, column_types, fill_strategies, dtypes)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: hash_deduplicator.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.utilities.configurations import Config as Cfg
+
+
+class HashDeduplicator:
+    """Removes duplicate rows through 64-bit row hashes, optionally across pipeline runs.
+
+    Each row is reduced to a single uint64 hash, so duplicates are found in linear time
+    without comparing every column. In incremental mode, the hashes of the rows already
+    loaded are kept in a sorted index per sheet, and rows of the incremental sheets seen
+    in a previous run are skipped. New hashes only reach the index when `commit` is called,
+    after a successful load, and only for the rows that reached the loaded data: a new row
+    dropped by the inner joins (ex: a month without estoque or vendas yet) is processed again
+    in the next run.
+    """
+
+    def __init__(self,
+                 index_directory: Path = Cfg.CACHE_DATA.value / 'dedup',
+                 incremental: bool = False) -> None:
+        """Initialize the HashDeduplicator.
+
+        Args:
+            index_directory (Path): The directory where the hash index of each sheet is stored.
+            incremental (bool): Whether to skip the rows loaded in previous runs.
+        """
+
+        self.index_directory = Path(index_directory)
+        self.incremental = incremental
+
+        # Hashes vistos nesta execução, aguardando a confirmação da carga, indexados pelo rótulo de cada linha.
+        self._pending_hashes: dict[str, pd.Series] = {}
+        # Chaves de cada linha limpa que identificam, nos dados carregados, as linhas vindas da planilha.
+        self._pending_keys: dict[str, pd.DataFrame] = {}
+
+    def _index_path(self, name: str) -> Path:
+        """Return the path of the hash index of a sheet."""
+
+        return self.index_directory / f'{name.lower()}.npy'
+
+    def _load_index(self, name: str) -> np.ndarray:
+        """Load the sorted hash index of a sheet, or an empty index if there is none.
+
+        Args:
+            name (str): The name of the sheet.
+
+        Returns:
+            np.ndarray: The sorted hashes of the rows already loaded.
+        """
+
+        index_path = self._index_path(name)
+        if not index_path.exists():
+            return np.empty(0, dtype=np.uint64)
+
+        try:
+            return np.load(index_path)
+        except (OSError, ValueError) as error:
+            logger.warning(f'Índice de deduplicação de {name} inválido, ignorando: {error}')
+            return np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def row_hashes(data: pd.DataFrame) -> np.ndarray:
+        """Compute a 64-bit hash of each row, ignoring the index.
+
+        Args:
+            data (pd.DataFrame): The data to hash.
+
+        Returns:
+            np.ndarray: The uint64 hash of each row.
+        """
+
+        return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+    def deduplicate(self, name: str, data: pd.DataFrame, skip_loaded: bool = True) -> pd.DataFrame:
+        """Remove the duplicate rows of a sheet and, in incremental mode, the rows already loaded.
+
+        Args:
+            name (str): The name of the sheet.
+            data (pd.DataFrame): The data to deduplicate.
+            skip_loaded (bool): Whether the rows of this sheet loaded in previous runs are skipped.
+
+        Returns:
+            pd.DataFrame: The data with only the first occurrence of each new row.
+        """
+
+        hashes = self.row_hashes(data)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+
+        repeated = int(keep.size - keep.sum())
+        if repeated:
+            logger.info(f'{repeated} linhas repetidas removidas de {name}.')
+
+        if self.incremental and skip_loaded:
+            seen = self._load_index(name)
+            if seen.size:
+                # O índice é ordenado: a busca binária evita montar um conjunto Python.
+                positions = np.searchsorted(seen, hashes).clip(max=seen.size - 1)
+                already_loaded = keep & (seen[positions] == hashes)
+                keep &= ~already_loaded
+                logger.info(f'{int(already_loaded.sum())} linhas de {name} já foram carregadas '
+                            f'em execuções anteriores e serão ignoradas.')
+            self._pending_hashes[name] = pd.Series(hashes[keep], index=data.index[keep])
+
+        if keep.all():
+            return data
+
+        return data.loc[keep]
+
+    def track_keys(self, name: str, keys: pd.DataFrame) -> None:
+        """Record the keys of the cleaned rows of a sheet, used by `commit` to find the rows that were loaded.
+
+        Args:
+            name (str): The name of the sheet.
+            keys (pd.DataFrame): The key columns of the cleaned rows, with the labels of the extracted rows.
+        """
+
+        if name in self._pending_hashes:
+            self._pending_keys[name] = keys
+
+    def _unloaded_rows(self, name: str, loaded_data: pd.DataFrame) -> pd.Index:
+        """Return the labels of the cleaned rows of a sheet whose keys are not in the loaded data.
+
+        The joins only match rows by their keys, so a row reached the loaded data if, and only if,
+        its keys are there.
+
+        Args:
+            name (str): The name of the sheet.
+            loaded_data (pd.DataFrame): The data loaded in this run.
+
+        Returns:
+            pd.Index: The labels of the rows that were not loaded.
+        """
+
+        keys = self._pending_keys.get(name)
+        if keys is None:
+            return pd.Index([])
+
+        unloaded = ~np.isin(self.row_hashes(keys), self.row_hashes(loaded_data[list(keys.columns)]))
+        if unloaded.any():
+            logger.warning(f'{int(unloaded.sum())} linhas novas de {name} não chegaram aos dados carregados '
+                           f'e serão processadas novamente na próxima execução.')
+
+        return keys.index[unloaded]
+
+    def commit(self, loaded_data: pd.DataFrame | None = None) -> None:
+        """Add the hashes of the rows loaded in this run to the persistent index of each sheet.
+
+        Args:
+            loaded_data (pd.DataFrame | None): The data loaded in this run. The rows whose keys are
+                not in it are left out of the index.
+        """
+
+        if not self._pending_hashes:
+            return
+
+        self.index_directory.mkdir(parents=True, exist_ok=True)
+        for name, hashes in self._pending_hashes.items():
+            if loaded_data is not None:
+                hashes = hashes.drop(index=self._unloaded_rows(name, loaded_data))
+            index = np.union1d(self._load_index(name), hashes.to_numpy())
+
+            # Escrita atômica: um índice parcial nunca substitui o anterior.
+            index_path = self._index_path(name)
+            staging_path = index_path.with_suffix('.tmp.npy')
+            np.save(staging_path, index)
+            staging_path.replace(index_path)
+
+            logger.info(f'Índice de deduplicação de {name} atualizado: {index.size} linhas conhecidas.')
+
+        self._pending_hashes.clear()
+        self._pending_keys.clear()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: in_place_cleaner.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import pandas as pd
+
+from ruptura_zero.transformer.fast_cleaner import FastDataCleaner
+
+
+class InPlaceDataCleaner(FastDataCleaner):
+    """Cleaner that works on a single buffer per sheet.
+
+    Instead of reassigning a new copy of the frame at every step, the frame received by
+    `clean` is modified in place, and steps that have nothing to do (no duplicates, no
+    missing values) do not copy the data at all.
+    """
+
+    def estimate_peak_bytes(self, column_bytes: pd.Series) -> int:
+        """Estimate the peak memory allocated while cleaning a frame, on top of the frame itself.
+
+        The columns are replaced one at a time, so the allocations reach about twice the largest column.
+
+        Args:
+            column_bytes (pd.Series): The memory used by each column of the extracted frame.
+
+        Returns:
+            int: The estimated peak of the additional allocations, in bytes.
+        """
+
+        return 2 * int(column_bytes.max()) if len(column_bytes) else 0
+
+    def _remove_duplicates(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Remove duplicate rows using a 64-bit hash of each row.
+
+        Args:
+            data (pd.DataFrame): The data to remove duplicates from.
+
+        Returns:
+            pd.DataFrame: The same frame, without duplicates.
+        """
+
+        duplicated = pd.util.hash_pandas_object(data, index=False).duplicated().to_numpy()
+        if not duplicated.any():
+            return data
+
+        if data.index.is_unique:
+            data.drop(index=data.index[duplicated], inplace=True)
+            return data
+
+        return data.loc[~duplicated]
+
+    def _fill_missing_values(self,
+                             data: pd.DataFrame,
+                             strategy: str = "mode",
+                             column_strategies: dict | None = None) -> pd.DataFrame:
+        """Fill missing values in place.
+
+        Args:
+            data (pd.DataFrame): The data to fill missing values in.
+            strategy (str, optional): The strategy to use for filling missing values.
+                Options are "mean", "median", or "mode". Defaults to "mode".
+            column_strategies (dict | None, optional): Strategies declared per column,
+                overriding `strategy`. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The same frame, with missing values filled.
+        """
+
+        fill_values = self._missing_fill_values(data, strategy, column_strategies)
+        if fill_values:
+            data.fillna(fill_values, inplace=True)
+
+        return data
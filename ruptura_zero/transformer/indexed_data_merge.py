@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: indexed_data_merge.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.transformer.data_merge import DataMerger, align_categorical_keys
+from ruptura_zero.utilities.merge_how_options import MergeHowOptions
+
+# Acima deste tamanho, a chave composta é recodificada para não estourar o int64.
+MAX_KEY_SPACE = 2 ** 62
+
+# Espaços de chaves até este múltiplo do número de linhas usam uma tabela de endereçamento direto.
+DENSE_KEY_SPACE_FACTOR = 4
+
+
+class IndexedDataMerger(DataMerger):
+    """Join engine that merges through integer key codes instead of rebuilding a hash table.
+
+    Each key column becomes a code in a vocabulary shared by both sides: categorical keys reuse
+    the codes already built by the cleaning step, other keys are factorized once. The codes are
+    combined into a single int64 key and the right side is indexed by sorting it, a step that is
+    skipped when it is already sorted by key. Dense keys are then looked up in a direct-address
+    table, sparse keys by binary search. Output columns, row order and suffixes are the same as
+    `DataMerger.merge_data`; joins it does not cover fall back to `pd.merge`.
+    """
+
+    @staticmethod
+    def _shared_key_codes(left_values: pd.Series, right_values: pd.Series) -> tuple[np.ndarray, np.ndarray, int]:
+        """Encode a pair of key columns as integer codes of a vocabulary shared by both sides.
+
+        Missing values get their own code, so they match each other as in `pd.merge`.
+
+        Args:
+            left_values (pd.Series): The key column of the left DataFrame.
+            right_values (pd.Series): The key column of the right DataFrame.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, int]: The left codes, the right codes and the vocabulary size.
+        """
+
+        if isinstance(left_values.dtype, pd.CategoricalDtype):
+            # As categorias já foram alinhadas: os códigos existentes são o índice. O código -1 (ausente) vira 0.
+            return (left_values.cat.codes.to_numpy(dtype=np.int64) + 1,
+                    right_values.cat.codes.to_numpy(dtype=np.int64) + 1,
+                    len(left_values.cat.categories) + 1)
+
+        codes, uniques = pd.factorize(pd.concat([left_values, right_values], ignore_index=True),
+                                      use_na_sentinel=False)
+        codes = codes.astype(np.int64, copy=False)
+
+        return codes[:len(left_values)], codes[len(left_values):], len(uniques)
+
+    def _composite_keys(self,
+                        data_frame_left: pd.DataFrame,
+                        data_frame_right: pd.DataFrame,
+                        keys: list[str]) -> tuple[np.ndarray, np.ndarray, int]:
+        """Combine the codes of every key column into a single int64 key per row.
+
+        Args:
+            data_frame_left (pd.DataFrame): The left DataFrame to merge.
+            data_frame_right (pd.DataFrame): The right DataFrame to merge.
+            keys (list[str]): The columns to join on, with the same name on both sides.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, int]: The composite keys of the left and right rows,
+                and the number of possible keys.
+        """
+
+        left_keys = np.zeros(len(data_frame_left), dtype=np.int64)
+        right_keys = np.zeros(len(data_frame_right), dtype=np.int64)
+        key_space = 1
+        for key in keys:
+            left_codes, right_codes, size = self._shared_key_codes(data_frame_left[key], data_frame_right[key])
+            if key_space * size > MAX_KEY_SPACE:
+                codes, uniques = pd.factorize(np.concatenate([left_keys, right_keys]))
+                left_keys, right_keys = codes[:len(left_keys)], codes[len(left_keys):]
+                key_space = len(uniques)
+
+            left_keys = left_keys * size + left_codes
+            right_keys = right_keys * size + right_codes
+            key_space *= size
+
+        return left_keys, right_keys, key_space
+
+    @staticmethod
+    def _inner_join_indexers(left_keys: np.ndarray,
+                             right_keys: np.ndarray,
+                             key_space: int) -> tuple[np.ndarray, np.ndarray]:
+        """Compute the row positions of an inner join, keeping the left order as `pd.merge` does.
+
+        Args:
+            left_keys (np.ndarray): The composite keys of the left rows.
+            right_keys (np.ndarray): The composite keys of the right rows.
+            key_space (int): The number of possible keys.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The positions of the joined rows on the left and on the right.
+        """
+
+        # Caminho sort-merge: se o lado direito já está ordenado pela chave, a ordenação é dispensada.
+        if right_keys.size < 2 or bool(np.all(right_keys[:-1] <= right_keys[1:])):
+            order = None
+            sorted_keys = right_keys
+        else:
+            order = np.argsort(right_keys, kind='stable')
+            sorted_keys = right_keys[order]
+
+        if key_space <= DENSE_KEY_SPACE_FACTOR * (left_keys.size + right_keys.size):
+            # Chaves densas: a posição de cada chave no lado direito vem de uma tabela, sem busca binária.
+            key_counts = np.bincount(right_keys, minlength=key_space)
+            key_starts = np.cumsum(key_counts) - key_counts
+            starts = key_starts[left_keys]
+            counts = key_counts[left_keys]
+        else:
+            starts = np.searchsorted(sorted_keys, left_keys, side='left')
+            counts = np.searchsorted(sorted_keys, left_keys, side='right') - starts
+
+        # Cada linha da esquerda é repetida uma vez por correspondência, na ordem original da direita.
+        left_indexer = np.repeat(np.arange(left_keys.size), counts)
+        output_starts = np.cumsum(counts) - counts
+        right_positions = np.repeat(starts - output_starts, counts) + np.arange(left_indexer.size)
+        right_indexer = right_positions if order is None else order[right_positions]
+
+        return left_indexer, right_indexer
+
+    @staticmethod
+    def _output_columns(data_frame_left: pd.DataFrame,
+                        data_frame_right: pd.DataFrame,
+                        keys: list[str],
+                        suffixes: tuple[str, str]) -> tuple[dict, list[str], dict] | None:
+        """Name the output columns exactly as `pd.merge` does.
+
+        Args:
+            data_frame_left (pd.DataFrame): The left DataFrame to merge.
+            data_frame_right (pd.DataFrame): The right DataFrame to merge.
+            keys (list[str]): The columns to join on, with the same name on both sides.
+            suffixes (tuple[str, str]): The suffixes to apply to overlapping column names.
+
+        Returns:
+            tuple[dict, list[str], dict] | None: The renaming of the left columns, the right columns to keep
+                and their renaming, or None if the names are ambiguous.
+        """
+
+        right_columns = [column for column in data_frame_right.columns if column not in keys]
+        overlap = set(data_frame_left.columns).intersection(right_columns)
+
+        left_suffix, right_suffix = suffixes
+        if overlap and not (left_suffix or right_suffix):
+            return None
+
+        left_renames = {column: f'{column}{left_suffix}' for column in overlap if left_suffix}
+        right_renames = {column: f'{column}{right_suffix}' for column in overlap if right_suffix}
+
+        output = [left_renames.get(column, column) for column in data_frame_left.columns]
+        output += [right_renames.get(column, column) for column in right_columns]
+        if len(set(output)) != len(output):
+            return None
+
+        return left_renames, right_columns, right_renames
+
+    def merge_data(self,
+                   data_frame_left: pd.DataFrame,
+                   data_frame_right: pd.DataFrame,
+                   left_key: list[str],
+                   right_key: list[str],
+                   how: MergeHowOptions,
+                   suffixes: tuple[str, str]) -> pd.DataFrame:
+        """Merge the datasets into a single DataFrame through integer key codes.
+
+        Args:
+            data_frame_left (pd.DataFrame): The left DataFrame to merge.
+            data_frame_right (pd.DataFrame): The right DataFrame to merge.
+            left_key (list[str]): The columns to join on from the left DataFrame.
+            right_key (list[str]): The columns to join on from the right DataFrame.
+            how (MergeHowOptions): The type of merge to perform.
+            suffixes (tuple[str, str]): The suffixes to apply to overlapping column names.
+
+        Returns:
+            pd.DataFrame: The merged DataFrame.
+        """
+
+        aligned_left, aligned_right = align_categorical_keys(data_frame_left,
+                                                             data_frame_right,
+                                                             left_key,
+                                                             right_key)
+
+        columns = None
+        if (how == MergeHowOptions.INNER
+                and list(left_key) == list(right_key)
+                and aligned_left.columns.is_unique and aligned_right.columns.is_unique
+                and all(aligned_left[key].dtype == aligned_right[key].dtype for key in left_key)):
+            columns = self._output_columns(aligned_left, aligned_right, list(left_key), suffixes)
+
+        if columns is None:
+            logger.info('Junção não suportada pelo motor indexado, usando pd.merge.')
+            return super().merge_data(data_frame_left, data_frame_right, left_key, right_key, how, suffixes)
+
+        logger.info(
+            f'Consolidando os dados por índice: {aligned_left.shape[0]} linhas do lado esquerdo, '
+            f'{aligned_right.shape[0]} linhas do lado direito')
+        logger.info(f'Usando chaves de junção: {left_key}')
+        logger.info(f'Sufixos aplicados: {suffixes}')
+
+        left_keys, right_keys, key_space = self._composite_keys(aligned_left, aligned_right, list(left_key))
+        left_indexer, right_indexer = self._inner_join_indexers(left_keys, right_keys, key_space)
+
+        left_renames, right_columns, right_renames = columns
+        left_part = aligned_left.take(left_indexer).rename(columns=left_renames)
+        right_part = aligned_right[right_columns].take(right_indexer).rename(columns=right_renames)
+
+        return pd.concat([left_part.reset_index(drop=True), right_part.reset_index(drop=True)], axis=1)
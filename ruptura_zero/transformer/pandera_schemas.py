@@ -13,7 +13,9 @@
 #  License: MIT
 # ------------------------------------------------------------------------------
 
+import pandas as pd
 import pandera.pandas as pa
+import pyarrow
 
 from ruptura_zero.utilities.brazilian_states import BrazilianStates
 from ruptura_zero.utilities.client_type import ClientType
@@ -22,9 +24,9 @@ from ruptura_zero.utilities.client_type import ClientType
 RUPTURA_SCHEMA = pa.DataFrameSchema(
     columns={
         'data_base': pa.Column(pa.Int64, nullable=False, coerce=True),
-        'cliente_id': pa.Column(pa.String, nullable=False, coerce=True),
+        'cliente_id': pa.Column(pa.Category, nullable=False, coerce=True),
         'descricao_cliente': pa.Column(pa.String, nullable=False, coerce=True),
-        'categoria_material': pa.Column(pa.String, nullable=False, coerce=True),
+        'categoria_material': pa.Column(pa.Category, nullable=False, coerce=True),
         'valor_ruptura': pa.Column(pa.Float64, nullable=False, coerce=True),
         'valor_pedido': pa.Column(pa.Float64, nullable=False, coerce=True),
         'volume_ruptura_und': pa.Column(pa.Int64, nullable=False, coerce=True),
@@ -40,13 +42,13 @@ RUPTURA_SCHEMA = pa.DataFrameSchema(
 ESTOQUE_SCHEMA = pa.DataFrameSchema(
     columns={
         'cod_mes': pa.Column(pa.String, nullable=False, coerce=True),
-        'cliente_id': pa.Column(pa.String, nullable=False, coerce=True),
-        'nome_cliente': pa.Column(pa.String, nullable=False, coerce=True),
-        'categoria_material': pa.Column(pa.String, nullable=False, coerce=True),
+        'cliente_id': pa.Column(pa.Category, nullable=False, coerce=True),
+        'nome_cliente': pa.Column(pa.Category, nullable=False, coerce=True),
+        'categoria_material': pa.Column(pa.Category, nullable=False, coerce=True),
         'estoque': pa.Column(pa.Int64, nullable=False, coerce=True),
         'ddv': pa.Column(pa.Float64, nullable=False, coerce=True),
         'cobertura_dias': pa.Column(pa.Int64, nullable=False, coerce=True),
-        'tipo_cliente': pa.Column(pa.String, nullable=False, coerce=True),
+        'tipo_cliente': pa.Column(pa.Category, nullable=False, coerce=True),
         'contato_cliente': pa.Column(pa.String, nullable=False, coerce=True),
         'mes': pa.Column(pa.Int64, nullable=False, coerce=True),
     },
@@ -58,11 +60,11 @@ ESTOQUE_SCHEMA = pa.DataFrameSchema(
 VENDAS_SCHEMA = pa.DataFrameSchema(
     columns={
         'data_base': pa.Column(pa.Int64, nullable=False, coerce=True),
-        'cliente_id': pa.Column(pa.String, nullable=False, coerce=True),
-        'valor_volume_real': pa.Column(pa.Float64, nullable=False, coerce=True),
-        'cidade': pa.Column(pa.String, nullable=False, coerce=True),
-        'uf': pa.Column(pa.String, nullable=False, coerce=True),
-        'pais': pa.Column(pa.String, nullable=False, coerce=True),
+        'cliente_id': pa.Column(pa.Category, nullable=False, coerce=True),
+        'valor_volume_real': pa.Column(pa.Int64, nullable=False, coerce=True),
+        'cidade': pa.Column(pa.Category, nullable=False, coerce=True),
+        'uf': pa.Column(pa.Category, nullable=False, coerce=True),
+        'pais': pa.Column(pa.Category, nullable=False, coerce=True),
         'ano': pa.Column(pa.Int64, nullable=False, coerce=True),
         'mes': pa.Column(pa.Int64, nullable=False, coerce=True),
     },
@@ -83,33 +85,33 @@ CONSOLIDATED_SCHEMA = pa.DataFrameSchema(
                          nullable=False,
                          checks=pa.Check.in_range(1, 12),
                          description='Mês da observação em formato numérico (1-12)'),
-        'cliente_id': pa.Column(pa.String,
+        'cliente_id': pa.Column(pa.Category,
                                 nullable=False,
                                 checks=pa.Check.str_length(2, 2),
                                 description='Código identificador único do cliente'),
-        'nome_cliente': pa.Column(pa.String,
+        'nome_cliente': pa.Column(pa.Category,
                                   nullable=False,
                                   description='Nome do cliente (ex: ESMERALDA, RUBI)'),
-        'tipo_cliente': pa.Column(pa.String,
+        'tipo_cliente': pa.Column(pa.Category,
                                   checks=pa.Check.isin(ClientType),
                                   nullable=False,
                                   description='Classificação do cliente'),
-        'cidade': pa.Column(pa.String,
+        'cidade': pa.Column(pa.Category,
                             nullable=False,
                             description='Cidade do cliente'),
-        'uf': pa.Column(pa.String,
+        'uf': pa.Column(pa.Category,
                         nullable=False,
                         checks=[pa.Check.str_length(2, 2),
                                 pa.Check.isin(BrazilianStates)],
                         description='Unidade Federativa (UF) do cliente'),
-        'pais': pa.Column(pa.String,
+        'pais': pa.Column(pa.Category,
                           nullable=False,
                           checks=pa.Check.isin(['BR']),
                           description='País do cliente'),
         'contato_cliente': pa.Column(pa.String,
                                      nullable=False,
                                      description='Nome do contato no cliente'),
-        'categoria_material': pa.Column(pa.String,
+        'categoria_material': pa.Column(pa.Category,
                                         nullable=False,
                                         description='Categoria do produto'),
         'valor_ruptura': pa.Column(pa.Float64,
@@ -148,3 +150,25 @@ CONSOLIDATED_SCHEMA = pa.DataFrameSchema(
     strict=True,
     ordered=True
 )
+
+# Equivalentes Arrow dos tipos NumPy usados nos esquemas.
+ARROW_DTYPES = {'int64': pd.ArrowDtype(pyarrow.int64()),
+                'float64': pd.ArrowDtype(pyarrow.float64()),
+                'str': pd.ArrowDtype(pyarrow.string())}
+
+
+def to_arrow_schema(schema: pa.DataFrameSchema) -> pa.DataFrameSchema:
+    """Declare the integer, float and string columns of a schema with pyarrow-backed dtypes.
+
+    Categorical columns are kept as they are.
+
+    Args:
+        schema (pa.DataFrameSchema): The schema with NumPy dtypes.
+
+    Returns:
+        pa.DataFrameSchema: A copy of the schema with `ArrowDtype` columns.
+    """
+
+    return schema.update_columns({name: {'dtype': ARROW_DTYPES[str(column.dtype)]}
+                                  for name, column in schema.columns.items()
+                                  if str(column.dtype) in ARROW_DTYPES})
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: validation_policy.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import json
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.protocols.transformer import SchemaValidatorProtocol
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.validation_mode import ValidationMode
+
+
+class ValidationPolicy:
+    """Decides which rows of a dataset are validated against its Pandera schema.
+
+    In the sampled modes, only the first, the last or a random sample of `sample_size` rows
+    is validated; datasets up to that size are always validated in full. The rows are selected
+    before calling Pandera, which would otherwise coerce the whole frame before sampling it.
+    In the `new_partitions` mode, only the rows of the year/month partitions not validated in
+    a previous run are checked; datasets without every partition column are validated in full.
+    New partitions are only recorded when `commit` is called, after a successful load.
+    """
+
+    def __init__(self,
+                 mode: ValidationMode = ValidationMode.FULL,
+                 sample_size: int = Cfg.VALIDATION_SAMPLE_SIZE.value,
+                 random_state: int | None = None,
+                 partition_columns: tuple[str, ...] = Cfg.PERSISTENCE_PARTITION_COLUMNS.value,
+                 state_directory: Path = Cfg.CACHE_DATA.value / 'validation') -> None:
+        """Initialize the ValidationPolicy.
+
+        Args:
+            mode (ValidationMode): Which rows are validated.
+            sample_size (int): The number of rows validated in the sampled modes.
+            random_state (int | None): The seed of the random sample.
+            partition_columns (tuple[str, ...]): The columns that identify a partition.
+            state_directory (Path): The directory where the validated partitions of each dataset are stored.
+        """
+
+        self.mode = ValidationMode(mode)
+        self.sample_size = sample_size
+        self.random_state = random_state
+        self.partition_columns = list(partition_columns)
+        self.state_directory = Path(state_directory)
+
+        # Partições validadas nesta execução, aguardando a confirmação da carga.
+        self._pending_partitions: dict[str, set[tuple[str, ...]]] = {}
+
+    def _state_path(self, name: str) -> Path:
+        """Return the path of the validated partitions of a dataset."""
+
+        return self.state_directory / f'{name.lower()}.json'
+
+    def _load_partitions(self, name: str) -> set[tuple[str, ...]]:
+        """Load the partitions of a dataset validated in previous runs.
+
+        Args:
+            name (str): The name of the dataset.
+
+        Returns:
+            set[tuple[str, ...]]: The validated partitions, or an empty set if there are none.
+        """
+
+        state_path = self._state_path(name)
+        if not state_path.exists():
+            return set()
+
+        try:
+            return {tuple(partition) for partition in json.loads(state_path.read_text(encoding='utf-8'))}
+        except (OSError, ValueError) as error:
+            logger.warning(f'Registro de partições validadas de {name} inválido, ignorando: {error}')
+            return set()
+
+    def _new_partition_rows(self, name: str, data: pd.DataFrame) -> pd.DataFrame:
+        """Select the rows of the partitions not validated in previous runs.
+
+        Args:
+            name (str): The name of the dataset.
+            data (pd.DataFrame): The data to validate.
+
+        Returns:
+            pd.DataFrame: The rows of the new partitions.
+        """
+
+        # Sem todas as colunas de partição (ex: o estoque não tem o ano), uma partição parcial juntaria
+        # períodos distintos, e dados de um ano novo seriam tomados como já validados.
+        missing_columns = [column for column in self.partition_columns if column not in data.columns]
+        if missing_columns:
+            logger.info(f'{name} não tem as colunas de partição {missing_columns}, validando todas as linhas.')
+            return data
+
+        # As partições são comparadas uma vez cada, e não linha a linha.
+        partitions = data[self.partition_columns]
+        unique_partitions = partitions.drop_duplicates()
+        partition_keys = [tuple(map(str, partition)) for partition in unique_partitions.itertuples(index=False)]
+        self._pending_partitions[name] = set(partition_keys)
+
+        known_partitions = self._load_partitions(name)
+        is_new_partition = [key not in known_partitions for key in partition_keys]
+        if all(is_new_partition):
+            return data
+        if not any(is_new_partition):
+            logger.info(f'Nenhuma partição nova em {name}, validando apenas a estrutura.')
+            return data.iloc[:0]
+
+        new_partitions = pd.MultiIndex.from_frame(unique_partitions.loc[is_new_partition])
+        is_new = pd.MultiIndex.from_frame(partitions).isin(new_partitions)
+        logger.info(f'{int(is_new.sum())} de {len(data)} linhas de {name} pertencem a partições novas.')
+
+        return data.loc[is_new]
+
+    def _rows_to_validate(self, name: str, data: pd.DataFrame) -> pd.DataFrame:
+        """Select the rows of a dataset to validate according to the mode.
+
+        Args:
+            name (str): The name of the dataset.
+            data (pd.DataFrame): The data to validate.
+
+        Returns:
+            pd.DataFrame: The rows to validate.
+        """
+
+        if self.mode == ValidationMode.NEW_PARTITIONS:
+            return self._new_partition_rows(name, data)
+
+        # Conjuntos pequenos, como as cargas incrementais, são sempre validados por completo.
+        if self.mode == ValidationMode.FULL or len(data) <= self.sample_size:
+            return data
+
+        logger.info(f'Validando {self.sample_size} de {len(data)} linhas de {name} (modo {self.mode}).')
+
+        match self.mode:
+            case ValidationMode.HEAD:
+                return data.head(self.sample_size)
+            case ValidationMode.TAIL:
+                return data.tail(self.sample_size)
+            case ValidationMode.SAMPLE:
+                return data.sample(n=self.sample_size, random_state=self.random_state)
+            case _:
+                raise ValueError(f"Modo de validação desconhecido: '{self.mode}'")
+
+    def validate(self, name: str, schema: SchemaValidatorProtocol, data: pd.DataFrame) -> None:
+        """Validate the selected rows of a dataset, raising the Pandera errors found.
+
+        Args:
+            name (str): The name of the dataset.
+            schema (SchemaValidatorProtocol): The schema to validate against.
+            data (pd.DataFrame): The data to validate.
+        """
+
+        schema.validate(self._rows_to_validate(name, data), lazy=True)
+
+    def commit(self) -> None:
+        """Record the partitions validated in this run."""
+
+        if not self._pending_partitions:
+            return
+
+        self.state_directory.mkdir(parents=True, exist_ok=True)
+        for name, partitions in self._pending_partitions.items():
+            partitions = sorted(self._load_partitions(name) | partitions)
+
+            # Escrita atômica: um registro parcial nunca substitui o anterior.
+            state_path = self._state_path(name)
+            staging_path = state_path.with_suffix('.tmp')
+            staging_path.write_text(json.dumps(partitions), encoding='utf-8')
+            staging_path.replace(state_path)
+
+            logger.info(f'Partições validadas de {name} atualizadas: {len(partitions)} conhecidas.')
+
+        self._pending_partitions.clear()
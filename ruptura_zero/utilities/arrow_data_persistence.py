@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: arrow_data_persistence.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from loguru import logger
+
+from ruptura_zero.utilities.configurations import Config as Cfg
+
+
+class ParquetDataPersistence:
+    """Persists DataFrames as Parquet files, keeping the column types.
+
+    The file is written next to the requested path, with the `.parquet` extension.
+    CSV options (separator, encoding) do not apply to this format and are ignored.
+    """
+
+    def __init__(self,
+                 compression: str = Cfg.PERSISTENCE_COMPRESSION.value,
+                 row_group_size: int = Cfg.PERSISTENCE_ROW_GROUP_SIZE.value) -> None:
+        """Initialize the ParquetDataPersistence.
+
+        Args:
+            compression (str): The compression codec of the column chunks.
+            row_group_size (int): The maximum number of rows per row group.
+        """
+
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    @staticmethod
+    def _to_arrow(data: pd.DataFrame) -> pa.Table:
+        """Convert the DataFrame to an Arrow table, without its index."""
+
+        return pa.Table.from_pandas(data, preserve_index=False)
+
+    def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
+        """Save the DataFrame to a Parquet file.
+
+        Args:
+            data (pd.DataFrame): The DataFrame to save.
+            storage_path (Path): The path of the file, whose extension is replaced by `.parquet`.
+            options (dict): The options of the CSV writer, ignored by this format.
+        """
+
+        storage_path = Path(storage_path).with_suffix('.parquet')
+        logger.info(f'Salvando dados em {storage_path}...')
+
+        pq.write_table(self._to_arrow(data),
+                       storage_path,
+                       compression=self.compression,
+                       row_group_size=self.row_group_size)
+
+    def flush(self) -> None:
+        """Wait for the pending writes. Writes are synchronous, so there is nothing to wait for."""
+
+
+class FeatherDataPersistence(ParquetDataPersistence):
+    """Persists DataFrames as Arrow IPC (Feather v2) files, the fastest format to read back."""
+
+    def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
+        """Save the DataFrame to a Feather file.
+
+        Args:
+            data (pd.DataFrame): The DataFrame to save.
+            storage_path (Path): The path of the file, whose extension is replaced by `.feather`.
+            options (dict): The options of the CSV writer, ignored by this format.
+        """
+
+        storage_path = Path(storage_path).with_suffix('.feather')
+        logger.info(f'Salvando dados em {storage_path}...')
+
+        feather.write_feather(self._to_arrow(data),
+                              storage_path,
+                              compression=self.compression,
+                              chunksize=self.row_group_size)
+
+
+class PartitionedDataPersistence(ParquetDataPersistence):
+    """Persists DataFrames as a Parquet dataset partitioned by year and month (ex: `ano=2021/mes=1/`)."""
+
+    def __init__(self,
+                 compression: str = Cfg.PERSISTENCE_COMPRESSION.value,
+                 row_group_size: int = Cfg.PERSISTENCE_ROW_GROUP_SIZE.value,
+                 partition_columns: tuple[str, ...] = Cfg.PERSISTENCE_PARTITION_COLUMNS.value) -> None:
+        """Initialize the PartitionedDataPersistence.
+
+        Args:
+            compression (str): The compression codec of the column chunks.
+            row_group_size (int): The maximum number of rows per row group.
+            partition_columns (tuple[str, ...]): The columns used to split the dataset into directories.
+        """
+
+        super().__init__(compression, row_group_size)
+        self.partition_columns = list(partition_columns)
+
+    def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
+        """Save the DataFrame to a partitioned Parquet dataset.
+
+        Args:
+            data (pd.DataFrame): The DataFrame to save.
+            storage_path (Path): The path of the file, whose extension is dropped to name the dataset directory.
+            options (dict): The options of the CSV writer, ignored by this format.
+        """
+
+        missing_columns = [column for column in self.partition_columns if column not in data.columns]
+        if missing_columns:
+            logger.warning(f'Colunas de partição ausentes {missing_columns}, salvando em um único arquivo.')
+            return super().save_data(data, storage_path, options)
+
+        dataset_path = Path(storage_path).with_suffix('')
+        logger.info(f'Salvando dados particionados por {self.partition_columns} em {dataset_path}...')
+
+        # O conjunto é gravado em um diretório temporário e só então substitui o anterior,
+        # para que partições de execuções passadas não se misturem às novas.
+        staging_path = dataset_path.with_name(f'{dataset_path.name}.tmp')
+        shutil.rmtree(staging_path, ignore_errors=True)
+        pq.write_to_dataset(self._to_arrow(data),
+                            staging_path,
+                            partition_cols=self.partition_columns,
+                            compression=self.compression,
+                            row_group_size=self.row_group_size)
+
+        shutil.rmtree(dataset_path, ignore_errors=True)
+        staging_path.rename(dataset_path)
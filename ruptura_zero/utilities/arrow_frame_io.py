@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: arrow_frame_io.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+
+def write_arrow_frame(data_frame: pd.DataFrame, file_path: Path) -> dict:
+    """Write a DataFrame as an Arrow IPC file.
+
+    Args:
+        data_frame (pd.DataFrame): The DataFrame to write.
+        file_path (Path): The path of the file.
+
+    Returns:
+        dict: The columns whose Arrow-backed dtypes are not restored by the pandas metadata.
+    """
+
+    table = pa.Table.from_pandas(data_frame)
+    with pa.OSFile(str(file_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    # O pandas restaura textos Arrow como StringDtype, e categorias Arrow como object.
+    arrow_columns, arrow_categories = [], []
+    for column, dtype in data_frame.dtypes.items():
+        if isinstance(dtype, pd.ArrowDtype):
+            arrow_columns.append(column)
+        elif isinstance(dtype, pd.CategoricalDtype) and isinstance(dtype.categories.dtype, pd.ArrowDtype):
+            arrow_categories.append(column)
+
+    return {'arrow_columns': arrow_columns, 'arrow_categories': arrow_categories}
+
+
+def read_arrow_frame(file_path: Path, dtypes: dict) -> pd.DataFrame:
+    """Read a DataFrame written by `write_arrow_frame`.
+
+    Args:
+        file_path (Path): The path of the file.
+        dtypes (dict): The Arrow-backed columns recorded when the file was written.
+
+    Returns:
+        pd.DataFrame: The DataFrame, with its original index and dtypes.
+    """
+
+    with pa.memory_map(str(file_path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    data_frame = table.to_pandas()
+    for column in dtypes['arrow_columns']:
+        data_frame[column] = pd.arrays.ArrowExtensionArray(table.column(column))
+    for column in dtypes['arrow_categories']:
+        categorical = data_frame[column].cat
+        categories = categorical.categories.astype(pd.ArrowDtype(table.schema.field(column).type.value_type))
+        data_frame[column] = pd.Categorical.from_codes(categorical.codes,
+                                                       dtype=pd.CategoricalDtype(categories, categorical.ordered))
+
+    return data_frame
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: background_data_persistence.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.protocols.data_persistence import DataPersistenceProtocol
+
+
+class BackgroundDataPersistence:
+    """Hands the writes of another persister to a background thread, so they overlap with the next stage.
+
+    Writes run one at a time, in the order they were requested. The frames handed over must not
+    be modified afterwards. `flush` waits for every pending write and raises the first error.
+    """
+
+    def __init__(self, data_persistence: DataPersistenceProtocol) -> None:
+        """Initialize the BackgroundDataPersistence.
+
+        Args:
+            data_persistence (DataPersistenceProtocol): The persister that performs the writes.
+        """
+
+        self.data_persistence = data_persistence
+
+        # Uma única thread: as gravações não disputam o disco e mantêm a ordem de chegada.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='data-persistence')
+        self._pending_writes: list[tuple[Path, Future]] = []
+
+    def save_data(self, data: pd.DataFrame, storage_path: Path, options: dict) -> None:
+        """Schedule the DataFrame to be saved in the background.
+
+        Args:
+            data (pd.DataFrame): The DataFrame to save.
+            storage_path (Path): The path of the file.
+            options (dict): Additional options to pass to the underlying persister.
+        """
+
+        logger.info(f'Agendando a gravação de {storage_path} em segundo plano...')
+
+        future = self._executor.submit(self.data_persistence.save_data, data, storage_path, options)
+        self._pending_writes.append((storage_path, future))
+
+    def flush(self) -> None:
+        """Wait for the pending writes, raising the first error found."""
+
+        if not self._pending_writes:
+            return
+
+        pending_writes, self._pending_writes = self._pending_writes, []
+        wait([future for _, future in pending_writes])
+
+        first_error = None
+        for storage_path, future in pending_writes:
+            error = future.exception()
+            if error is not None:
+                logger.error(f'Falha ao gravar {storage_path}: {error}')
+                first_error = first_error or error
+
+        if first_error is not None:
+            raise first_error
+
+        self.data_persistence.flush()
+        logger.info(f'{len(pending_writes)} gravações em segundo plano concluídas.')
@@ -26,9 +26,24 @@ class Config(Enum):
     SHEET_VENDAS = '03_BD_Vendas'
     RUPTURA_ESTOQUE_MERGED = 'ruptura_estoque.csv'
     RUPTURA_ESTOQUE_VENDAS_MERGED = 'ruptura_estoque_vendas.csv'
+    EXTRACTION_CHUNK_SIZE = 50_000
+    EXTRACTION_CACHE_MAX_SIZE = 1024 ** 3
+    EXTRACTION_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+    MEMO_STORE_MAX_SIZE = 2 * 1024 ** 3
+    PERSISTENCE_FORMAT = 'csv'
+    PERSISTENCE_COMPRESSION = 'zstd'
+    PERSISTENCE_ROW_GROUP_SIZE = 128 * 1024
+    PERSISTENCE_PARTITION_COLUMNS = ('ano', 'mes')
+    VALIDATION_SAMPLE_SIZE = 10_000
+    LOAD_KEY_COLUMNS = ('data_base', 'cliente_id', 'categoria_material')
+    LOAD_BATCH_SIZE = 100_000
 
     BASE_DIRECTORY = Path.cwd()
     LOG_DIRECTORY = BASE_DIRECTORY / 'logs'
     RAW_DATA = BASE_DIRECTORY / 'data' / 'raw'
     CLEANED_DATA = BASE_DIRECTORY / 'data' / 'cleaned'
     PROCESSED_DATA = BASE_DIRECTORY / 'data' / 'processed'
+    CACHE_DATA = BASE_DIRECTORY / 'data' / 'cache'
+    LOCAL_DATABASE = BASE_DIRECTORY / 'data' / 'warehouse' / 'ruptura_zero.duckdb'
+    RUN_REPORTS = BASE_DIRECTORY / 'data' / 'reports'
+    BENCHMARK_RESULTS = BASE_DIRECTORY / 'data' / 'benchmarks'
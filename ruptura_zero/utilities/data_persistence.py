@@ -33,3 +33,6 @@ class DataPersistence:
         logger.info(f'Salvando dados em {storage_path}...')
 
         data.to_csv(storage_path, index=False, **options)
+
+    def flush(self) -> None:
+        """Wait for the pending writes. Writes are synchronous, so there is nothing to wait for."""
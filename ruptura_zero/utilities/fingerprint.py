@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: fingerprint.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import hashlib
+import json
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+# Diretório do pacote: o código de todos os módulos, exceto a carga, produz os dados tratados.
+PACKAGE_DIRECTORY = Path(__file__).resolve().parents[1]
+EXCLUDED_CODE_DIRECTORIES = ('loader',)
+
+
+def hash_parts(*parts: str) -> str:
+    """Return a short hex digest of the given parts."""
+
+    digest = hashlib.blake2b()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\0')
+
+    return digest.hexdigest()[:32]
+
+
+@cache
+def code_version() -> str:
+    """Hash the source code of the modules that produce the extracted, cleaned and consolidated data."""
+
+    digest = hashlib.blake2b()
+    for module_path in sorted(PACKAGE_DIRECTORY.rglob('*.py')):
+        relative_path = module_path.relative_to(PACKAGE_DIRECTORY)
+        if relative_path.parts[0] in EXCLUDED_CODE_DIRECTORIES:
+            continue
+        digest.update(str(relative_path).encode())
+        digest.update(module_path.read_bytes())
+
+    return digest.hexdigest()[:32]
+
+
+def frame_fingerprint(data_frame: pd.DataFrame) -> str:
+    """Hash the content of a DataFrame: its columns, dtypes, index and values.
+
+    Each column is reduced to 64-bit value hashes, so the content is read once, in vectorized code.
+
+    Args:
+        data_frame (pd.DataFrame): The DataFrame to hash.
+
+    Returns:
+        str: A hex digest of the DataFrame.
+    """
+
+    digest = hashlib.blake2b()
+    digest.update(pd.util.hash_pandas_object(data_frame.index).to_numpy().tobytes())
+    for column, values in data_frame.items():
+        digest.update(f'{column}:{values.dtype}'.encode())
+        digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+
+    return digest.hexdigest()[:32]
+
+
+def _describe_schema(value: Any) -> Any:
+    """Describe the objects of a schema that `json.dumps` cannot serialize."""
+
+    if hasattr(value, 'to_json'):
+        return json.loads(value.to_json())
+
+    if hasattr(value, 'schema'):
+        # Validadores que envolvem um esquema Pandera, como o validador compilado.
+        return {'validator': type(value).__name__, 'schema': value.schema}
+
+    return str(value)
+
+
+def schema_fingerprint(schema: Any) -> str:
+    """Hash the definition of a schema (columns, dtypes, nullability, coercion and checks).
+
+    Args:
+        schema (Any): A Pandera schema, a validator wrapping one, or a cleaning schema entry holding one.
+
+    Returns:
+        str: A hex digest of the schema.
+    """
+
+    return hash_parts(json.dumps(schema, sort_keys=True, default=_describe_schema))
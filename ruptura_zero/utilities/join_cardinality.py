@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: join_cardinality.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from enum import StrEnum
+
+
+class JoinCardinality(StrEnum):
+    ALLOW = 'allow'
+    WARN = 'warn'
+    REJECT = 'reject'
+    DEDUPLICATE = 'deduplicate'
+    AGGREGATE = 'aggregate'
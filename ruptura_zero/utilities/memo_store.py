@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: memo_store.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import json
+import shutil
+from pathlib import Path
+from typing import Mapping
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from ruptura_zero.utilities.arrow_frame_io import read_arrow_frame, write_arrow_frame
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.fingerprint import code_version, hash_parts
+from ruptura_zero.utilities.memory_tracker import format_bytes
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class MemoStore:
+    """Content-addressed, on-disk store of the DataFrames produced by a pipeline stage.
+
+    Each entry is keyed by a hash of everything that determines its content (the fingerprints
+    of the inputs, the schema and the options of the stage) and of the code of the package, so
+    an entry is only reused for exactly the same computation. An entry holds one or more
+    DataFrames, as Arrow IPC files, and JSON metadata; when the store grows past
+    `max_size_bytes`, the least recently used entries are removed. The hits, misses and
+    evictions are counted for the whole life of the store.
+    """
+
+    def __init__(self,
+                 name: str,
+                 store_directory: Path = Cfg.CACHE_DATA.value / 'memo',
+                 max_size_bytes: int = Cfg.MEMO_STORE_MAX_SIZE.value) -> None:
+        """Initialize the MemoStore.
+
+        Args:
+            name (str): The name of the store, which is also the directory of its entries.
+            store_directory (Path): The directory where the stores are kept.
+            max_size_bytes (int): The maximum total size of the entries of this store.
+        """
+
+        self.name = name
+        self.directory = Path(store_directory) / name
+        self.max_size_bytes = max_size_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Return the key of an entry, hashing the given parts with the code of the package."""
+
+        return hash_parts(code_version(), *parts)
+
+    def get(self, key: str) -> tuple[dict[str, pd.DataFrame], dict] | None:
+        """Return the DataFrames and the metadata stored under a key.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            tuple[dict[str, pd.DataFrame], dict] | None: The stored DataFrames, by name, and the
+                metadata of the entry, or None on a miss.
+        """
+
+        entry_directory = self.directory / key
+        manifest_path = entry_directory / MANIFEST_FILE
+        if not manifest_path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            data_frames = {frame['name']: read_arrow_frame(entry_directory / frame['file'], frame['dtypes'])
+                           for frame in manifest['frames']}
+        except (pa.ArrowException, OSError, ValueError, KeyError) as error:
+            logger.warning(f'Entrada {key} da memoização de {self.name} inválida, ignorando: {error}')
+            self.misses += 1
+            return None
+
+        # Atualizando o horário de último uso da entrada para a política de remoção.
+        manifest_path.touch()
+        self.hits += 1
+
+        return data_frames, manifest['metadata']
+
+    def put(self, key: str, data_frames: Mapping[str, pd.DataFrame], metadata: dict | None = None) -> None:
+        """Store DataFrames under a key, removing the least recently used entries if needed.
+
+        Args:
+            key (str): The key of the entry.
+            data_frames (Mapping[str, pd.DataFrame]): The DataFrames to store, by name.
+            metadata (dict | None): JSON-serializable data stored with the DataFrames.
+        """
+
+        entry_directory = self.directory / key
+        # Escrevendo em um diretório temporário para que entradas incompletas nunca sejam lidas.
+        staging_directory = entry_directory.with_name(f'{entry_directory.name}.tmp')
+        shutil.rmtree(staging_directory, ignore_errors=True)
+        staging_directory.mkdir(parents=True)
+
+        try:
+            frames = []
+            for position, (name, data_frame) in enumerate(data_frames.items()):
+                file_name = f'frame_{position:03d}.arrow'
+                frames.append({'name': name,
+                               'file': file_name,
+                               'dtypes': write_arrow_frame(data_frame, staging_directory / file_name)})
+            manifest = {'key': key, 'frames': frames, 'metadata': metadata or {}}
+            (staging_directory / MANIFEST_FILE).write_text(json.dumps(manifest), encoding='utf-8')
+
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            staging_directory.rename(entry_directory)
+        except (pa.ArrowException, OSError) as error:
+            # Sem a entrada, o próximo uso da mesma entrada apenas refaz o processamento.
+            logger.warning(f'Não foi possível armazenar a entrada {key} da memoização de {self.name}: {error}')
+            shutil.rmtree(staging_directory, ignore_errors=True)
+            return
+
+        self._evict(keep=entry_directory)
+
+    def _evict(self, keep: Path) -> None:
+        """Remove the least recently used entries while the store exceeds its maximum size.
+
+        Args:
+            keep (Path): The entry that must never be removed (the one just stored).
+        """
+
+        entries = []
+        total_size = 0
+        for entry_directory in self.directory.iterdir():
+            manifest_path = entry_directory / MANIFEST_FILE
+            if not manifest_path.exists():
+                continue
+            size = sum(file.stat().st_size for file in entry_directory.iterdir())
+            total_size += size
+            if entry_directory != keep:
+                entries.append((manifest_path.stat().st_mtime, size, entry_directory))
+
+        # Removendo primeiro as entradas usadas há mais tempo.
+        for _, size, entry_directory in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            logger.info(f'Removendo entrada da memoização de {self.name}: {entry_directory.name}')
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            total_size -= size
+            self.evictions += 1
+
+    def log_statistics(self) -> None:
+        """Log the hits, misses and evictions of the store, and the size of its entries."""
+
+        size = (sum(file.stat().st_size for file in self.directory.rglob('*') if file.is_file())
+                if self.directory.exists() else 0)
+        logger.info(f'Memoização de {self.name}: {self.hits} acertos, {self.misses} falhas, '
+                    f'{self.evictions} entradas removidas, {format_bytes(size)} armazenados.')
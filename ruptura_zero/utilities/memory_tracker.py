@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: memory_tracker.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import tracemalloc
+from types import TracebackType
+from typing import ClassVar
+
+
+class MemoryTracker:
+    """Context manager that measures the peak memory allocated inside a block.
+
+    Uses `tracemalloc`, which also accounts for the NumPy buffers behind pandas objects.
+    Trackers may be nested: the peak reached inside an inner block also counts for the outer ones.
+    """
+
+    # Medidores abertos, do mais externo ao mais interno.
+    _active_trackers: ClassVar[list['MemoryTracker']] = []
+
+    def __init__(self) -> None:
+        """Initialize the MemoryTracker."""
+
+        self.peak_bytes = 0
+        self._started_tracing = False
+        self._baseline_bytes = 0
+        self._absolute_peak_bytes = 0
+
+    @classmethod
+    def _propagate_peak(cls) -> None:
+        """Record the current traced peak in every open tracker, before it is reset."""
+
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        for tracker in cls._active_trackers:
+            tracker._absolute_peak_bytes = max(tracker._absolute_peak_bytes, peak_bytes)
+
+    def __enter__(self) -> 'MemoryTracker':
+        """Start measuring."""
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        # O pico é reiniciado para este bloco, mas os medidores externos guardam o pico anterior.
+        self._propagate_peak()
+        tracemalloc.reset_peak()
+        self._baseline_bytes, _ = tracemalloc.get_traced_memory()
+        self._absolute_peak_bytes = self._baseline_bytes
+        self._active_trackers.append(self)
+
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        """Stop measuring and record the peak allocated since `__enter__`."""
+
+        self._propagate_peak()
+        self._active_trackers.remove(self)
+        self.peak_bytes = max(self._absolute_peak_bytes - self._baseline_bytes, 0)
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def format_bytes(size: float) -> str:
+    """Format a size in bytes using binary units (ex: "12.3 MiB")."""
+
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(size) < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+
+    return f'{size:.1f} TiB'
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: persistence_format.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from enum import StrEnum
+
+
+class PersistenceFormat(StrEnum):
+    CSV = 'csv'
+    PARQUET = 'parquet'
+    FEATHER = 'feather'
+    PARTITIONED = 'partitioned'
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: pipeline_stage.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from enum import StrEnum
+
+
+class PipelineStage(StrEnum):
+    EXTRACT = 'extract_from_source'
+    CLEAN = 'clean_and_validate_data'
+    TRANSFORM = 'transform_for_analysis'
+    LOAD = 'load_to_destination'
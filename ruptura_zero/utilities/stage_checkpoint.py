@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: stage_checkpoint.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import hashlib
+import json
+import shutil
+from functools import cached_property
+from pathlib import Path
+from typing import Mapping
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from ruptura_zero.utilities.arrow_frame_io import read_arrow_frame, write_arrow_frame
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.fingerprint import code_version, hash_parts
+from ruptura_zero.utilities.pipeline_stage import PipelineStage
+
+MANIFEST_FILE = 'manifest.json'
+
+# Etapas cujo resultado é salvo, na ordem em que são executadas.
+CHECKPOINTED_STAGES = (PipelineStage.EXTRACT, PipelineStage.CLEAN, PipelineStage.TRANSFORM)
+
+
+class StageCheckpoint:
+    """Saves the output of the extract, clean and transform stages, so a run can resume from them.
+
+    Each stage output is written as Arrow IPC files, with the pandas metadata that restores its
+    index and dtypes, next to a manifest holding the key of the checkpoint. The key of the extract
+    stage hashes the source workbook, the code of the package (except the loader) and the options
+    of the stage; the key of each later stage hashes the key of the previous one and its own
+    options. A checkpoint is only restored if its key matches the current one, so a changed
+    workbook, code or option never reuses a stale output. Only the last checkpoint of each stage
+    is kept.
+    """
+
+    def __init__(self,
+                 enabled: bool = True,
+                 source_path: Path = Cfg.RAW_DATA.value / Cfg.RAW_DATA_FILE.value,
+                 stage_options: Mapping[PipelineStage, dict] | None = None,
+                 resume_from: PipelineStage | None = None,
+                 checkpoint_directory: Path = Cfg.CACHE_DATA.value / 'checkpoints') -> None:
+        """Initialize the StageCheckpoint.
+
+        Args:
+            enabled (bool): Whether to save and restore the stage outputs.
+            source_path (Path): The source workbook, whose content is part of every checkpoint key.
+            stage_options (Mapping[PipelineStage, dict] | None): The options that change the output
+                of each stage (ex: the cleaner used), which are part of its checkpoint key.
+            resume_from (PipelineStage | None): The first stage to run; the earlier stages are restored
+                from the last valid checkpoint. Defaults to running every stage.
+            checkpoint_directory (Path): The directory where the checkpoints are stored.
+        """
+
+        self.enabled = enabled
+        self.source_path = Path(source_path)
+        self.stage_options = stage_options or {}
+        self.resume_from = PipelineStage(resume_from) if resume_from is not None else None
+        self.checkpoint_directory = Path(checkpoint_directory)
+
+    @cached_property
+    def _source_fingerprint(self) -> str:
+        """Hash the content of the source workbook."""
+
+        with open(self.source_path, 'rb') as file:
+            return hashlib.file_digest(file, 'blake2b').hexdigest()[:32]
+
+    def _key(self, stage: PipelineStage) -> str:
+        """Return the key of a stage checkpoint, chained from the keys of the previous stages.
+
+        Args:
+            stage (PipelineStage): The stage.
+
+        Returns:
+            str: The key of the checkpoint.
+        """
+
+        position = CHECKPOINTED_STAGES.index(stage)
+        previous_key = (self._key(CHECKPOINTED_STAGES[position - 1]) if position
+                        else hash_parts(code_version(), self._source_fingerprint))
+        options = json.dumps(self.stage_options.get(stage, {}), sort_keys=True, default=str)
+
+        return hash_parts(previous_key, stage, options)
+
+    def _stage_directory(self, stage: PipelineStage) -> Path:
+        """Return the directory of a stage checkpoint."""
+
+        return self.checkpoint_directory / stage
+
+    def _is_valid(self, stage: PipelineStage) -> bool:
+        """Whether the checkpoint of a stage exists and matches the current inputs, code and options."""
+
+        manifest_path = self._stage_directory(stage) / MANIFEST_FILE
+        if not manifest_path.exists():
+            logger.info(f'Nenhum ponto de controle salvo para a etapa {stage}.')
+            return False
+
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as error:
+            logger.warning(f'Ponto de controle de {stage} inválido, ignorando: {error}')
+            return False
+
+        if manifest.get('key') != self._key(stage):
+            logger.warning(f'O ponto de controle de {stage} foi gerado com outros dados, código ou opções.')
+            return False
+
+        return True
+
+    def restorable_stage(self) -> PipelineStage | None:
+        """Return the last stage before `resume_from` with a valid checkpoint.
+
+        Returns:
+            PipelineStage | None: The stage to restore, or None if every stage must run.
+        """
+
+        if not self.enabled or self.resume_from is None:
+            return None
+
+        earlier_stages = [stage for stage in CHECKPOINTED_STAGES
+                          if list(PipelineStage).index(stage) < list(PipelineStage).index(self.resume_from)]
+
+        # Sem o ponto de controle da etapa anterior, retomamos do último ponto válido antes dela.
+        for stage in reversed(earlier_stages):
+            if self._is_valid(stage):
+                return stage
+
+        if earlier_stages:
+            logger.warning(f'Nenhum ponto de controle válido antes de {self.resume_from}. Executando todas as etapas.')
+
+        return None
+
+    def save(self, stage: PipelineStage, data: Mapping[str, pd.DataFrame | None] | pd.DataFrame | None) -> None:
+        """Save the output of a stage, replacing its previous checkpoint.
+
+        Args:
+            stage (PipelineStage): The stage.
+            data (Mapping[str, pd.DataFrame | None] | pd.DataFrame | None): The output of the stage.
+        """
+
+        if not self.enabled or stage not in CHECKPOINTED_STAGES:
+            return
+
+        stage_directory = self._stage_directory(stage)
+        # Escrevendo em um diretório temporário para que pontos de controle incompletos nunca sejam lidos.
+        staging_directory = stage_directory.with_name(f'{stage_directory.name}.tmp')
+        shutil.rmtree(staging_directory, ignore_errors=True)
+        staging_directory.mkdir(parents=True)
+
+        datasets = data if isinstance(data, Mapping) else {None: data}
+        try:
+            manifest_datasets = []
+            for position, (name, data_frame) in enumerate(datasets.items()):
+                entry = {'name': name, 'file': None}
+                if data_frame is not None:
+                    entry['file'] = f'dataset_{position:03d}.arrow'
+                    entry['dtypes'] = write_arrow_frame(data_frame, staging_directory / entry['file'])
+                manifest_datasets.append(entry)
+
+            manifest = {'key': self._key(stage),
+                        'stage': stage,
+                        'mapping': isinstance(data, Mapping),
+                        'datasets': manifest_datasets}
+            (staging_directory / MANIFEST_FILE).write_text(json.dumps(manifest), encoding='utf-8')
+
+            shutil.rmtree(stage_directory, ignore_errors=True)
+            staging_directory.rename(stage_directory)
+        except (pa.ArrowException, OSError) as error:
+            # Sem o ponto de controle, a execução continua, mas não poderá ser retomada desta etapa.
+            logger.warning(f'Não foi possível salvar o ponto de controle de {stage}: {error}')
+            shutil.rmtree(staging_directory, ignore_errors=True)
+            return
+
+        logger.info(f'Ponto de controle de {stage} salvo em {stage_directory}.')
+
+    def load(self, stage: PipelineStage) -> Mapping[str, pd.DataFrame | None] | pd.DataFrame | None:
+        """Load the output of a stage from its checkpoint.
+
+        Args:
+            stage (PipelineStage): The stage, as returned by `restorable_stage`.
+
+        Returns:
+            Mapping[str, pd.DataFrame | None] | pd.DataFrame | None: The output of the stage.
+        """
+
+        stage_directory = self._stage_directory(stage)
+        manifest = json.loads((stage_directory / MANIFEST_FILE).read_text(encoding='utf-8'))
+
+        datasets = {}
+        for entry in manifest['datasets']:
+            datasets[entry['name']] = (read_arrow_frame(stage_directory / entry['file'], entry['dtypes'])
+                                       if entry['file'] is not None else None)
+
+        logger.info(f'Saída da etapa {stage} restaurada do ponto de controle.')
+
+        return datasets if manifest['mapping'] else datasets[None]
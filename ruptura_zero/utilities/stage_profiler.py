@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: stage_profiler.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import json
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import pandas as pd
+from loguru import logger
+
+from ruptura_zero.utilities.configurations import Config as Cfg
+from ruptura_zero.utilities.memory_tracker import MemoryTracker, format_bytes
+
+try:
+    import resource
+except ImportError:  # O módulo resource só existe em sistemas Unix.
+    resource = None
+
+# Métricas de cada etapa exportadas no formato de textfile do Prometheus.
+PROMETHEUS_METRICS = {'wall_seconds': 'Wall time of the stage, in seconds.',
+                      'cpu_seconds': 'CPU time of the process during the stage, in seconds.',
+                      'peak_rss_bytes': 'Peak resident set size of the process at the end of the stage.',
+                      'traced_peak_bytes': 'Peak of the memory allocated during the stage, traced by tracemalloc.',
+                      'input_rows': 'Rows received by the stage.',
+                      'input_bytes': 'Bytes received by the stage.',
+                      'output_rows': 'Rows produced by the stage.',
+                      'output_bytes': 'Bytes produced by the stage.'}
+
+
+def _peak_rss_bytes() -> int | None:
+    """Return the peak resident set size of the process, or None where it is not available."""
+
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # O Linux informa o valor em KiB, e o macOS, em bytes.
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+def _data_volume(data: Any) -> tuple[int, int]:
+    """Return the rows and the bytes of a DataFrame, or of the DataFrames of a mapping."""
+
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(index=True, deep=True).sum())
+
+    if isinstance(data, Mapping):
+        volumes = [_data_volume(data_frame) for data_frame in data.values()]
+        return sum(rows for rows, _ in volumes), sum(size for _, size in volumes)
+
+    return 0, 0
+
+
+class StageRecord:
+    """The measurements of a pipeline stage, or of a sheet within a stage.
+
+    Set `output` inside the measured block to record the rows and bytes the stage produced.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the StageRecord.
+
+        Args:
+            name (str): The name of the stage or sheet.
+        """
+
+        self.name = name
+        self.status = 'success'
+        # Sem medição própria (ex: planilhas de que só se conhece o volume), os tempos ficam nulos.
+        self.wall_seconds: float | None = None
+        self.cpu_seconds: float | None = None
+        self.peak_rss_bytes: int | None = None
+        self.traced_peak_bytes: int | None = None
+        self.input_rows = 0
+        self.input_bytes = 0
+        self.output_rows = 0
+        self.output_bytes = 0
+        self.sheets: dict[str, StageRecord] = {}
+        self.output: Any = None
+
+    def to_dict(self) -> dict:
+        """Return the measurements as a JSON-serializable dict."""
+
+        record = {'status': self.status,
+                  'wall_seconds': None if self.wall_seconds is None else round(self.wall_seconds, 6),
+                  'cpu_seconds': None if self.cpu_seconds is None else round(self.cpu_seconds, 6),
+                  'peak_rss_bytes': self.peak_rss_bytes,
+                  'traced_peak_bytes': self.traced_peak_bytes,
+                  'input_rows': self.input_rows,
+                  'input_bytes': self.input_bytes,
+                  'output_rows': self.output_rows,
+                  'output_bytes': self.output_bytes}
+
+        if self.sheets:
+            record['sheets'] = {name: sheet.to_dict() for name, sheet in self.sheets.items()}
+
+        return record
+
+
+class StageProfiler:
+    """Records the wall time, CPU time, memory and data volume of the pipeline stages.
+
+    Stages are measured with `measure`; a `measure` opened inside another one records a sheet
+    of the enclosing stage, and measuring the same sheet again adds to its times. The rows and
+    bytes of mappings of DataFrames are also recorded per sheet. `run` wraps a whole pipeline
+    run and writes the JSON run report, and optionally a Prometheus textfile, when it ends.
+    A disabled profiler measures nothing and writes no report.
+    """
+
+    def __init__(self,
+                 enabled: bool = True,
+                 trace_memory: bool = True,
+                 report_directory: Path = Cfg.RUN_REPORTS.value,
+                 prometheus_textfile: bool = False) -> None:
+        """Initialize the StageProfiler.
+
+        Args:
+            enabled (bool): Whether to measure the stages.
+            trace_memory (bool): Whether to trace the memory allocated in each stage with tracemalloc,
+                which slows down the allocations of the measured code.
+            report_directory (Path): The directory where the run reports are written.
+            prometheus_textfile (bool): Whether to also write the measurements in the Prometheus textfile format.
+        """
+
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.report_directory = Path(report_directory)
+        self.prometheus_textfile = prometheus_textfile
+
+        self.stages: dict[str, StageRecord] = {}
+        self._open_stages: list[StageRecord] = []
+
+    @staticmethod
+    def _record_volume(record: StageRecord, data: Any, direction: str) -> None:
+        """Record the rows and bytes of the data received or produced by a stage and by its sheets.
+
+        Args:
+            record (StageRecord): The record of the stage.
+            data (Any): A DataFrame, a mapping of DataFrames, or anything else (counted as empty).
+            direction (str): Either 'input' or 'output'.
+        """
+
+        rows, size = _data_volume(data)
+        setattr(record, f'{direction}_rows', rows)
+        setattr(record, f'{direction}_bytes', size)
+
+        if isinstance(data, Mapping):
+            for name, data_frame in data.items():
+                sheet = record.sheets.setdefault(name, StageRecord(name))
+                rows, size = _data_volume(data_frame)
+                setattr(sheet, f'{direction}_rows', rows)
+                setattr(sheet, f'{direction}_bytes', size)
+
+    @contextmanager
+    def measure(self, name: str, data: Any = None) -> Iterator[StageRecord]:
+        """Measure a stage, or a sheet of the enclosing stage.
+
+        Args:
+            name (str): The name of the stage or sheet.
+            data (Any): The data received by the stage, whose rows and bytes are recorded.
+
+        Yields:
+            StageRecord: The record of the stage, whose `output` may be set inside the block.
+        """
+
+        parent = self._open_stages[-1] if self._open_stages else None
+        records = parent.sheets if parent is not None else self.stages
+        record = records.get(name) or StageRecord(name)
+
+        if not self.enabled:
+            yield record
+            return
+
+        records[name] = record
+        # Os volumes são medidos fora do bloco cronometrado.
+        if data is not None and not record.input_rows:
+            self._record_volume(record, data, 'input')
+
+        self._open_stages.append(record)
+        tracker = MemoryTracker() if self.trace_memory else None
+        try:
+            with ExitStack() as stack:
+                if tracker is not None:
+                    stack.enter_context(tracker)
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                try:
+                    yield record
+                finally:
+                    record.wall_seconds = (record.wall_seconds or 0.0) + time.perf_counter() - wall_start
+                    record.cpu_seconds = (record.cpu_seconds or 0.0) + time.process_time() - cpu_start
+        except BaseException:
+            record.status = 'failed'
+            raise
+        finally:
+            self._open_stages.pop()
+            record.peak_rss_bytes = _peak_rss_bytes()
+            if tracker is not None:
+                record.traced_peak_bytes = max(record.traced_peak_bytes or 0, tracker.peak_bytes)
+
+        if record.output is not None:
+            self._record_volume(record, record.output, 'output')
+            record.output = None
+
+        if parent is None:
+            logger.info(f'Etapa {name}: {record.wall_seconds:.3f} s de parede, {record.cpu_seconds:.3f} s de CPU, '
+                        f'{record.output_rows} linhas ({format_bytes(record.output_bytes)}) produzidas.')
+
+    def report(self) -> dict:
+        """Return the measurements of every stage as a JSON-serializable dict."""
+
+        return {'stages': {name: stage.to_dict() for name, stage in self.stages.items()},
+                'wall_seconds': round(sum(stage.wall_seconds for stage in self.stages.values()), 6),
+                'cpu_seconds': round(sum(stage.cpu_seconds for stage in self.stages.values()), 6),
+                'peak_rss_bytes': _peak_rss_bytes()}
+
+    def _prometheus_lines(self, run_report: dict) -> list[str]:
+        """Format the measurements of the stages and sheets as Prometheus textfile lines."""
+
+        samples = []
+        for stage_name, stage in self.stages.items():
+            samples.append((f'stage="{stage_name}"', stage))
+            for sheet_name, sheet in stage.sheets.items():
+                samples.append((f'stage="{stage_name}",sheet="{sheet_name}"', sheet))
+
+        lines = ['# HELP ruptura_zero_run_success Whether the last pipeline run succeeded.',
+                 '# TYPE ruptura_zero_run_success gauge',
+                 f'ruptura_zero_run_success {int(run_report["status"] == "success")}',
+                 '# HELP ruptura_zero_run_finished_timestamp_seconds When the last pipeline run finished.',
+                 '# TYPE ruptura_zero_run_finished_timestamp_seconds gauge',
+                 f'ruptura_zero_run_finished_timestamp_seconds {run_report["finished_timestamp"]:.3f}']
+
+        for metric, description in PROMETHEUS_METRICS.items():
+            lines += [f'# HELP ruptura_zero_stage_{metric} {description}',
+                      f'# TYPE ruptura_zero_stage_{metric} gauge']
+            for labels, record in samples:
+                value = getattr(record, metric)
+                if value is not None:
+                    lines.append(f'ruptura_zero_stage_{metric}{{{labels}}} {value}')
+
+        return lines
+
+    @staticmethod
+    def _write_atomically(path: Path, content: str) -> None:
+        """Write a file through a temporary one, so a partial file never replaces the previous one."""
+
+        staging_path = path.with_suffix('.tmp')
+        staging_path.write_text(content, encoding='utf-8')
+        staging_path.replace(path)
+
+    def save(self, run_report: dict) -> Path:
+        """Write the run report, and the Prometheus textfile if enabled.
+
+        Args:
+            run_report (dict): The report of the run.
+
+        Returns:
+            Path: The path of the JSON run report.
+        """
+
+        self.report_directory.mkdir(parents=True, exist_ok=True)
+
+        report_path = self.report_directory / f'run_{run_report["run_id"]}.json'
+        self._write_atomically(report_path, json.dumps(run_report, indent=2, ensure_ascii=False))
+        logger.info(f'Relatório da execução salvo em {report_path}.')
+
+        if self.prometheus_textfile:
+            # O coletor de textfile do Prometheus lê sempre o mesmo arquivo, com a última execução.
+            textfile_path = self.report_directory / 'ruptura_zero.prom'
+            self._write_atomically(textfile_path, '\n'.join(self._prometheus_lines(run_report)) + '\n')
+            logger.info(f'Métricas do Prometheus salvas em {textfile_path}.')
+
+        return report_path
+
+    @contextmanager
+    def run(self) -> Iterator[None]:
+        """Measure a whole pipeline run and write its report when it ends, even if it fails."""
+
+        if not self.enabled:
+            yield
+            return
+
+        self.stages.clear()
+        started_at = datetime.now(timezone.utc)
+        status = 'success'
+        try:
+            yield
+        except BaseException:
+            status = 'failed'
+            raise
+        finally:
+            finished_at = datetime.now(timezone.utc)
+            run_report = {'run_id': started_at.strftime('%Y%m%dT%H%M%S%fZ'),
+                          'status': status,
+                          'started_at': started_at.isoformat(),
+                          'finished_at': finished_at.isoformat(),
+                          'finished_timestamp': finished_at.timestamp(),
+                          'trace_memory': self.trace_memory,
+                          **self.report()}
+            try:
+                self.save(run_report)
+            except OSError as error:
+                # Uma falha ao gravar o relatório não deve mascarar o resultado da execução.
+                logger.error(f'Falha ao gravar o relatório da execução: {error}')
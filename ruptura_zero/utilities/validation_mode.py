@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: validation_mode.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+from enum import StrEnum
+
+
+class ValidationMode(StrEnum):
+    FULL = 'full'
+    HEAD = 'head'
+    TAIL = 'tail'
+    SAMPLE = 'sample'
+    NEW_PARTITIONS = 'new_partitions'
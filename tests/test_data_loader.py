@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: test_data_loader.py
+#  Version: 0.0.1
+#
+#  Summary: Ruptura Zero: Análise de Vendas e Estoque
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import pandas as pd
+import pytest
+
+from ruptura_zero.loader.data_loader import DataLoader
+from ruptura_zero.utilities.load_mode import LoadMode
+from ruptura_zero.utilities.load_target import LoadTarget
+
+
+@pytest.fixture(autouse=True)
+def close_connections():
+    """Discard the in-memory database after each test."""
+
+    yield
+    DataLoader.close_connections()
+
+
+def _consolidated(mes: int, clientes: list[str]) -> pd.DataFrame:
+    """Build a consolidated frame of one month with categorical keys."""
+
+    return pd.DataFrame({'data_base': pd.Timestamp(2021, mes, 1),
+                         'ano': 2021,
+                         'mes': mes,
+                         'cliente_id': pd.Categorical(clientes),
+                         'categoria_material': pd.Categorical(['BEBIDAS'] * len(clientes)),
+                         'valor_ruptura': [float(position) for position in range(len(clientes))]})
+
+
+@pytest.mark.parametrize('load_mode', [LoadMode.APPEND, LoadMode.MERGE, LoadMode.PARTITIONS])
+def test_second_load_accepts_new_category(load_mode: LoadMode) -> None:
+    """A later load may bring a category value the first load did not have."""
+
+    loader = DataLoader(load_mode=load_mode, target=LoadTarget.MEMORY)
+
+    loader.load_data(_consolidated(1, ['C1', 'C2']))
+    loader.load_data(_consolidated(2, ['C2', 'C3']))
+
+    with loader._connect() as connection:
+        loaded = connection.execute(f'SELECT mes, cliente_id FROM {loader.table_name} ORDER BY ALL').fetchall()
+        column_types = dict(connection.execute(f'SELECT column_name, column_type '
+                                               f'FROM (DESCRIBE {loader.table_name})').fetchall())
+
+    assert loaded == [(1, 'C1'), (1, 'C2'), (2, 'C2'), (2, 'C3')]
+    assert column_types['cliente_id'] == 'VARCHAR'
+    assert column_types['categoria_material'] == 'VARCHAR'
+
+
+def test_merge_replaces_rows_with_the_same_key() -> None:
+    """The merge mode updates the rows whose key is loaded again."""
+
+    loader = DataLoader(load_mode=LoadMode.MERGE, target=LoadTarget.MEMORY)
+
+    loader.load_data(_consolidated(1, ['C1', 'C2']))
+    loader.load_data(_consolidated(1, ['C2', 'C1']))
+
+    with loader._connect() as connection:
+        loaded = connection.execute(f'SELECT cliente_id, valor_ruptura FROM {loader.table_name} '
+                                    'ORDER BY ALL').fetchall()
+
+    assert loaded == [('C1', 1.0), ('C2', 0.0)]
+
+
+def test_append_converts_enum_columns_of_an_existing_table() -> None:
+    """A table left with ENUM columns by an earlier load accepts new categories."""
+
+    loader = DataLoader(load_mode=LoadMode.APPEND, target=LoadTarget.MEMORY)
+
+    with loader._connect() as connection:
+        connection.execute(f"CREATE TABLE {loader.table_name} (data_base TIMESTAMP, ano BIGINT, "
+                           "mes BIGINT, cliente_id ENUM('C1', 'C2'), categoria_material VARCHAR, valor_ruptura DOUBLE)")
+
+    loader.load_data(_consolidated(2, ['C2', 'C3']))
+
+    with loader._connect() as connection:
+        loaded = connection.execute(f'SELECT cliente_id FROM {loader.table_name} ORDER BY ALL').fetchall()
+        column_types = dict(connection.execute(f'SELECT column_name, column_type '
+                                               f'FROM (DESCRIBE {loader.table_name})').fetchall())
+
+    assert loaded == [('C2',), ('C3',)]
+    assert column_types['cliente_id'] == 'VARCHAR'